@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class BlogsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.blogs'
+
+    def ready(self):
+        from core.utils.cache import invalidate_on_change
+
+        from .models import Blog
+
+        invalidate_on_change(Blog, "blogs")
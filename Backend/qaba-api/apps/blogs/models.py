@@ -1,9 +1,12 @@
 import uuid
+from functools import partial
 
 from cloudinary.models import CloudinaryField
 from django.db import models
 from django.utils.text import slugify
 
+from core.utils.slugs import save_unique, unique_slug
+
 
 class Tag(models.Model):
     """Tag model for categorizing blog posts"""
@@ -66,13 +69,19 @@ class Blog(models.Model):
         return self.title
 
     def save(self, *args, **kwargs):
+        generators = {}
         if not self.slug:
-            self.slug = slugify(self.title)
+            generators["slug"] = self._generate_unique_slug
+            self.slug = self._generate_unique_slug()
 
-            if Blog.objects.filter(slug=self.slug).exists():
-                self.slug = f"{self.slug}-{str(uuid.uuid4())[:8]}"
+        save_unique(self, partial(super().save, *args, **kwargs), generators)
 
-        super().save(*args, **kwargs)
+    def _generate_unique_slug(self):
+        return unique_slug(
+            Blog.objects.exclude(pk=self.pk),
+            slugify(self.title) or "post",
+            max_length=self._meta.get_field("slug").max_length,
+        )
 
     @property
     def reading_time(self):
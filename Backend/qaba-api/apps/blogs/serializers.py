@@ -1,5 +1,8 @@
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from core.utils.media_urls import image_variants, resource_url
+
 from .models import Blog, Tag
 
 
@@ -17,6 +20,7 @@ class BlogListSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True, read_only=True)
     reading_time = serializers.ReadOnlyField()
     cover_image_url = serializers.SerializerMethodField(read_only=True)
+    cover_image_variants = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Blog
@@ -27,6 +31,7 @@ class BlogListSerializer(serializers.ModelSerializer):
             "writers_name",
             "summary",
             "cover_image_url",
+            "cover_image_variants",
             "tags",
             "is_featured",
             "status",
@@ -37,10 +42,14 @@ class BlogListSerializer(serializers.ModelSerializer):
 
     def get_cover_image_url(self, obj):
         """Get the full URL for the cover image"""
-        request = self.context.get("request")
-        if obj.cover_image:
-            return request.build_absolute_uri(obj.cover_image.url)
-        return None
+        return resource_url(obj.cover_image)
+
+    @extend_schema_field(
+        serializers.DictField(child=serializers.CharField(), allow_null=True)
+    )
+    def get_cover_image_variants(self, obj):
+        """Sized cover image URLs for cards and responsive images"""
+        return image_variants(obj.cover_image)
 
 
 class BlogDetailSerializer(serializers.ModelSerializer):
@@ -71,13 +80,10 @@ class BlogDetailSerializer(serializers.ModelSerializer):
             "reading_time",
             "related_posts",
         ]
-    
+
     def get_cover_image_url(self, obj):
         """Get the full URL for the cover image"""
-        request = self.context.get("request")
-        if obj.cover_image:
-            return request.build_absolute_uri(obj.cover_image.url)
-        return None
+        return resource_url(obj.cover_image)
 
     def get_related_posts(self, obj):
         """Get 3 related posts based on shared tags"""
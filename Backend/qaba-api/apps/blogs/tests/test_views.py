@@ -58,3 +58,31 @@ def test_featured_blogs_only_featured(api_client, create_blog):
     assert response.status_code == status.HTTP_200_OK
     titles = [item["title"] for item in response.data]
     assert titles == ["Featured One"]
+
+
+@pytest.mark.django_db
+def test_blog_list_cache_is_invalidated_when_a_blog_changes(
+    api_client, create_blog, django_capture_on_commit_callbacks
+):
+    """Publishing a draft should drop the cached blog list."""
+    create_blog(title="Published")
+    draft = create_blog(title="Drafted", status=Blog.Status.DRAFT)
+
+    api_client.get("/api/v1/blogs/")
+    assert api_client.get("/api/v1/blogs/")["X-Cache"] == "HIT"
+
+    draft.status = Blog.Status.PUBLISHED
+    with django_capture_on_commit_callbacks(execute=True):
+        draft.save()
+    response = api_client.get("/api/v1/blogs/")
+
+    assert response["X-Cache"] == "MISS"
+    assert {item["title"] for item in response.data} == {"Published", "Drafted"}
+
+
+@pytest.mark.django_db
+def test_blog_slugs_for_repeated_titles_are_numbered(create_blog):
+    """Posts sharing a title get numbered slugs instead of random suffixes."""
+    slugs = [create_blog(title="Market Update").slug for _ in range(3)]
+
+    assert slugs == ["market-update", "market-update-1", "market-update-2"]
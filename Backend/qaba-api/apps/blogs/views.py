@@ -2,6 +2,8 @@ from drf_spectacular.utils import extend_schema
 from rest_framework import permissions
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 
+from core.utils.cache import cache_public_response
+
 from .models import Blog
 from .serializers import BlogDetailSerializer, BlogListSerializer
 
@@ -16,6 +18,10 @@ class BlogListView(ListAPIView):
     def get_queryset(self):
         return Blog.objects.filter(status=Blog.Status.PUBLISHED).order_by("-created_at")
 
+    @cache_public_response("blogs")
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
 @extend_schema(tags=["Blogs"])
 class BlogDetailView(RetrieveAPIView):
@@ -40,3 +46,7 @@ class FeaturedBlogsView(ListAPIView):
         return Blog.objects.filter(
             status=Blog.Status.PUBLISHED, is_featured=True
         ).order_by("-created_at")
+
+    @cache_public_response("blogs")
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
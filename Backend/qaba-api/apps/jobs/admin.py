@@ -1,5 +1,7 @@
 from django.contrib import admin
 
+from core.utils.csv_export import stream_csv
+
 from .models import Job, JobForm
 
 
@@ -36,3 +38,8 @@ class JobFormAdmin(admin.ModelAdmin):
         "job__title",
     )
     list_filter = ("degree", "job", "location")
+    actions = ["export_as_csv"]
+
+    @admin.action(description="Export selected applications as CSV")
+    def export_as_csv(self, request, queryset):
+        return stream_csv("job-applications", queryset)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.jobs"
+
+    def ready(self):
+        from core.utils.cache import invalidate_on_change
+
+        from .models import Job
+
+        invalidate_on_change(Job, "jobs")
@@ -1,8 +1,12 @@
+from functools import partial
+
 from cloudinary.models import CloudinaryField
 from django.conf import settings
 from django.db import models
 from django.utils.text import slugify
 
+from core.utils.slugs import save_unique, unique_slug
+
 
 class Job(models.Model):
     class Status(models.TextChoices):
@@ -33,22 +37,21 @@ class Job(models.Model):
         return self.title
 
     def save(self, *args, **kwargs):
-        if self.title:
-            needs_slug = not self.slug or Job.objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
-            if needs_slug:
-                self.slug = self._generate_unique_slug()
-        super().save(*args, **kwargs)
+        # A slug that clashes with another job's is replaced on save
+        generators = {"slug": self._generate_unique_slug} if self.title else {}
+        if self.title and not self.slug:
+            self.slug = self._generate_unique_slug()
+        save_unique(self, partial(super().save, *args, **kwargs), generators)
 
     def _generate_unique_slug(self):
         base_slug = slugify(self.title)
         if not base_slug:
             base_slug = "job"
-        slug = base_slug
-        counter = 1
-        while Job.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-        return slug
+        return unique_slug(
+            Job.objects.exclude(pk=self.pk),
+            base_slug,
+            max_length=self._meta.get_field("slug").max_length,
+        )
 
 
 class JobForm(models.Model):
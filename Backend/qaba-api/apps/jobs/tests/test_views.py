@@ -56,3 +56,17 @@ def test_job_application_not_found(api_client):
     )
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_job_slugs_are_numbered_and_clashes_replaced(create_job):
+    """Same titles get the next suffix; a clashing explicit slug is replaced."""
+    first = create_job(title="Sales Lead")
+    second = create_job(title="Sales Lead")
+    clash = create_job(title="Sales Lead", slug=first.slug)
+
+    assert [first.slug, second.slug, clash.slug] == [
+        "sales-lead",
+        "sales-lead-1",
+        "sales-lead-2",
+    ]
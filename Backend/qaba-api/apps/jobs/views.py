@@ -3,6 +3,7 @@ from drf_spectacular.utils import extend_schema
 from rest_framework import generics, permissions, status
 from rest_framework.parsers import FormParser, MultiPartParser
 
+from core.utils.cache import cache_public_response
 from core.utils.response import APIResponse
 
 from .models import Job
@@ -17,6 +18,10 @@ class JobListView(generics.ListAPIView):
     def get_queryset(self):
         return Job.objects.filter(status=Job.Status.ACTIVE)
 
+    @cache_public_response("jobs")
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
 @extend_schema(tags=["Jobs"])
 class JobApplicationCreateView(generics.CreateAPIView):
@@ -1,17 +1,23 @@
-from datetime import timezone
-
 from apps.users.models import Notification
+from core.utils.cache import bump_version_on_commit
+from core.utils.csv_export import stream_csv
+from core.utils.notifications import bulk_notify, notify
 from core.utils.send_email import send_email
+from django.conf import settings
 from django.contrib import admin
+from django.db import transaction
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 
 # Register your models here.
+from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from requests import request
 
+from . import pricing
 from .models import (
+    AgentMonthlyAnalytics,
     Amenity,
     Favorite,
     Property,
@@ -192,6 +198,8 @@ class PropertyAdmin(admin.ModelAdmin):
                     "location",
                     "state",
                     "city",
+                    "latitude",
+                    "longitude",
                     "area_sqft",
                     "bedrooms",
                     "bathrooms",
@@ -251,8 +259,15 @@ class PropertyAdmin(admin.ModelAdmin):
             Property.ListingStatus.PENDING,
         ]:
             obj.listing_status = Property.ListingStatus.PENDING
+        pricing.apply_pricing(obj)
         super().save_model(request, obj, form, change)
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # AmenitiesInline writes the through rows directly, without the
+        # m2m_changed signal that maintains amenity_mask
+        Property.refresh_amenity_masks([form.instance.pk])
+
     def get_actions(self, request):
         actions = super().get_actions(request)
         if not request.user.is_superuser:
@@ -329,72 +344,94 @@ class PropertyAdmin(admin.ModelAdmin):
         "mark_as_available",
         "mark_as_sold",
         "mark_as_rented",
+        "export_as_csv",
     ]
 
+    @admin.action(description="Export selected properties as CSV")
+    def export_as_csv(self, request, queryset):
+        return stream_csv("properties", queryset)
+
+    def _set_property_status(self, queryset, property_status):
+        # update() sends no signals, so refresh the analytics rollups and
+        # drop the cached listings here
+        buckets = (
+            set(queryset.values_list("listed_by_id", "listed_date"))
+            if settings.AGENT_ANALYTICS_ROLLUP
+            else ()
+        )
+        queryset.update(property_status=property_status)
+        AgentMonthlyAnalytics.refresh_many(buckets)
+        bump_version_on_commit("properties")
+        bump_version_on_commit("price-stats")
+
     @admin.action(description="Mark selected properties as available")
     def mark_as_available(self, request, queryset):
-        queryset.update(property_status=Property.PropertyStatus.AVAILABLE)
+        self._set_property_status(queryset, Property.PropertyStatus.AVAILABLE)
         self.message_user(
             request, f"{queryset.count()} properties were marked as available."
         )
 
     @admin.action(description="Mark selected properties as sold")
     def mark_as_sold(self, request, queryset):
-        queryset.update(property_status=Property.PropertyStatus.SOLD)
+        self._set_property_status(queryset, Property.PropertyStatus.SOLD)
         self.message_user(
             request, f"{queryset.count()} properties were marked as sold."
         )
 
     @admin.action(description="Mark selected properties as rented")
     def mark_as_rented(self, request, queryset):
-        queryset.update(property_status=Property.PropertyStatus.RENTED)
+        self._set_property_status(queryset, Property.PropertyStatus.RENTED)
         self.message_user(
             request, f"{queryset.count()} properties were marked as rented."
         )
 
     @admin.action(description="Approve selected properties")
     def approve_properties(self, request, queryset):
-        updated_count = 0
+        notifications = []
         for property_obj in queryset:
             if property_obj.listing_status != Property.ListingStatus.APPROVED:
                 property_obj.listing_status = Property.ListingStatus.APPROVED
                 property_obj.save()
 
-                # Create notification for property owner
-                Notification.objects.create(
-                    user=property_obj.owner or property_obj.listed_by,
-                    title="Property Approved",
-                    message=f"Your property '{property_obj.property_name}' has been approved and is now live on the platform.",
-                    notification_type="property_approved",
+                # Notify the property owner
+                notifications.append(
+                    Notification(
+                        user=property_obj.owner or property_obj.listed_by,
+                        title="Property Approved",
+                        message=f"Your property '{property_obj.property_name}' has been approved and is now live on the platform.",
+                        notification_type="property_approved",
+                    )
                 )
 
                 # Send email notification
                 self._send_owner_approval_notification_email(property_obj, "approved")
-                updated_count += 1
 
-        self.message_user(request, f"{updated_count} properties were approved.")
+        bulk_notify(notifications)
+        self.message_user(request, f"{len(notifications)} properties were approved.")
 
     @admin.action(description="Decline selected properties")
     def decline_properties(self, request, queryset):
-        updated_count = 0
+        notifications = []
         for property_obj in queryset:
             if property_obj.listing_status != Property.ListingStatus.DECLINED:
                 property_obj.listing_status = Property.ListingStatus.DECLINED
                 property_obj.save()
 
-                # Create notification for property owner
-                Notification.objects.create(
-                    user=property_obj.owner or property_obj.listed_by,
-                    title="Property Declined",
-                    message=f"Your property '{property_obj.property_name}' has been declined. Please review and resubmit with necessary changes.",
-                    notification_type="property_declined",
+                # Notify the property owner
+                notifications.append(
+                    Notification(
+                        user=property_obj.owner or property_obj.listed_by,
+                        title="Property Declined",
+                        message=f"Your property '{property_obj.property_name}' has been declined. Please review and resubmit with necessary changes.",
+                        notification_type="property_declined",
+                    )
                 )
 
                 # Send email notification
                 self._send_owner_approval_notification_email(property_obj, "declined")
-                updated_count += 1
 
-        self.message_user(request, f"{updated_count} properties were declined.")
+        bulk_notify(notifications)
+        self.message_user(request, f"{len(notifications)} properties were declined.")
 
     def _send_owner_approval_notification_email(self, property_instance, decision):
         """Send email notification to property owner about approval/decline decision"""
@@ -651,11 +688,9 @@ class PropertyReviewAdmin(admin.ModelAdmin):
                 review.approved_at = timezone.now()
                 review.save()
 
-                # Create notification for reviewer
-                from apps.users.models import Notification
-
-                Notification.objects.create(
-                    user=review.reviewer,
+                # Notify the reviewer
+                notify(
+                    [review.reviewer],
                     title="Review Approved",
                     message=f"Your review for '{review.reviewed_property.property_name}' has been approved and is now visible.",  # UPDATED
                     notification_type="review_approved",
@@ -670,11 +705,9 @@ class PropertyReviewAdmin(admin.ModelAdmin):
                 review.status = PropertyReview.ReviewStatus.REJECTED
                 review.save()
 
-                # Create notification for reviewer
-                from apps.users.models import Notification
-
-                Notification.objects.create(
-                    user=review.reviewer,
+                # Notify the reviewer
+                notify(
+                    [review.reviewer],
                     title="Review Rejected",
                     message=f"Your review for '{review.reviewed_property.property_name}' has been rejected and will not be displayed.",  # UPDATED
                     notification_type="review_rejected",
@@ -708,42 +741,60 @@ class PropertyReviewAdmin(admin.ModelAdmin):
 
     @admin.action(description="Approve selected reviews")
     def approve_reviews(self, request, queryset):
-        from django.utils import timezone
-
-        updated = 0
-        for review in queryset.filter(status=PropertyReview.ReviewStatus.PENDING):
-            review.status = PropertyReview.ReviewStatus.APPROVED
-            review.approved_by = request.user
-            review.approved_at = timezone.now()
-            review.save()
-
-            from apps.users.models import Notification
+        with transaction.atomic():
+            pending = list(
+                queryset.filter(status=PropertyReview.ReviewStatus.PENDING)
+                .select_related("reviewed_property", "reviewer")
+                .select_for_update(of=("self",))
+            )
+            now = timezone.now()
+            PropertyReview.objects.filter(pk__in=[r.pk for r in pending]).update(
+                status=PropertyReview.ReviewStatus.APPROVED,
+                approved_by=request.user,
+                approved_at=now,
+                updated_at=now,
+            )
+            Property.apply_rating_changes(
+                added=[(r.reviewed_property_id, r.rating) for r in pending]
+            )
+        bump_version_on_commit("properties")
 
-            Notification.objects.create(
+        bulk_notify(
+            Notification(
                 user=review.reviewer,
                 title="Review Approved",
                 message=f"Your review for '{review.reviewed_property.property_name}' has been approved and is now visible.",  # UPDATED
                 notification_type="review_approved",
             )
-            updated += 1
+            for review in pending
+        )
 
-        self.message_user(request, f"{updated} reviews were approved.")
+        self.message_user(request, f"{len(pending)} reviews were approved.")
 
     @admin.action(description="Reject selected reviews")
     def reject_reviews(self, request, queryset):
-        updated = 0
-        for review in queryset.filter(status=PropertyReview.ReviewStatus.PENDING):
-            review.status = PropertyReview.ReviewStatus.REJECTED
-            review.save()
-
-            from apps.users.models import Notification
+        # Pending reviews are not part of the rating summary, so rejecting
+        # them leaves it untouched
+        with transaction.atomic():
+            pending = list(
+                queryset.filter(status=PropertyReview.ReviewStatus.PENDING)
+                .select_related("reviewed_property", "reviewer")
+                .select_for_update(of=("self",))
+            )
+            PropertyReview.objects.filter(pk__in=[r.pk for r in pending]).update(
+                status=PropertyReview.ReviewStatus.REJECTED,
+                updated_at=timezone.now(),
+            )
+        bump_version_on_commit("properties")
 
-            Notification.objects.create(
+        bulk_notify(
+            Notification(
                 user=review.reviewer,
                 title="Review Rejected",
                 message=f"Your review for '{review.reviewed_property.property_name}' has been rejected and will not be displayed.",  # UPDATED
                 notification_type="review_rejected",
             )
-            updated += 1
+            for review in pending
+        )
 
-        self.message_user(request, f"{updated} reviews were rejected.")
+        self.message_user(request, f"{len(pending)} reviews were rejected.")
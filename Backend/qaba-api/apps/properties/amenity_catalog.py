@@ -0,0 +1,93 @@
+"""
+In-process copy of the amenity table for ``Property.amenity_mask``.
+
+The amenity table is tiny and rarely changes, so each process keeps it in
+memory: the code to bit mapping the amenity filters compile to bitwise
+operations, and the rows the listing renders from a property's mask
+instead of prefetching its amenities.
+
+The copy is tagged with the ``amenities`` response cache version, which
+every amenity save or delete bumps, so other processes reload on their
+next lookup. Saves in this process also drop it directly. A version bump
+only reaches other processes through a shared cache, so the copy is also
+reloaded once it is ``AMENITY_CATALOG_TTL`` seconds old.
+"""
+import time
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from django.conf import settings
+
+from core.utils.cache import get_version
+
+from .models import Amenity
+
+NAMESPACE = "amenities"
+
+
+class Catalog(NamedTuple):
+    version: int
+    bits: dict[str, int]  # code -> bit
+    rows: list[tuple[int | None, dict]]  # (bit, serialized amenity), by name
+    complete: bool  # every amenity has a bit
+    loaded_at: float  # time.monotonic() of the load
+
+    def mask_for(self, codes: Iterable[str]) -> tuple[int, set]:
+        """The mask of ``codes`` and the codes that have no bit"""
+        mask = 0
+        unmasked = set()
+        for code in codes:
+            bit = self.bits.get(code)
+            if bit is None:
+                unmasked.add(code)
+            else:
+                mask |= 1 << bit
+        return mask, unmasked
+
+    def amenities(self, mask: int) -> list[dict]:
+        """Serialized amenities whose bits are set in ``mask``"""
+        return [
+            amenity
+            for bit, amenity in self.rows
+            if bit is not None and mask >> bit & 1
+        ]
+
+
+_catalog: Catalog | None = None
+
+
+def load(version: int) -> Catalog:
+    rows = []
+    bits = {}
+    for amenity in Amenity.objects.order_by("name"):
+        rows.append(
+            (amenity.bit, {"id": amenity.id, "name": amenity.name, "icon": amenity.icon})
+        )
+        if amenity.bit is not None:
+            bits[amenity.code] = amenity.bit
+    return Catalog(
+        version,
+        bits,
+        rows,
+        complete=len(bits) == len(rows),
+        loaded_at=time.monotonic(),
+    )
+
+
+def get_catalog() -> Catalog:
+    global _catalog
+    version = get_version(NAMESPACE)
+    catalog = _catalog
+    if (
+        catalog is None
+        or catalog.version != version
+        or time.monotonic() - catalog.loaded_at >= settings.AMENITY_CATALOG_TTL
+    ):
+        catalog = _catalog = load(version)
+    return catalog
+
+
+def clear(**kwargs):
+    """Signal receiver dropping this process's copy"""
+    global _catalog
+    _catalog = None
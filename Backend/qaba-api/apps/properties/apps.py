@@ -4,3 +4,37 @@ from django.apps import AppConfig
 class PropertiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.properties'
+
+    def ready(self):
+        from django.db.models.signals import (
+            m2m_changed,
+            post_delete,
+            post_save,
+            pre_delete,
+        )
+
+        from core.utils.cache import invalidate_on_change
+
+        from . import amenity_catalog, recommender
+        from .models import (
+            Amenity,
+            Property,
+            PropertyImage,
+            PropertyReview,
+            PropertyVideo,
+        )
+
+        invalidate_on_change(Property, "properties", "price-stats")
+        invalidate_on_change(PropertyImage, "properties")
+        invalidate_on_change(PropertyVideo, "properties")
+        invalidate_on_change(PropertyReview, "properties")
+        invalidate_on_change(Amenity, "amenities", "properties")
+
+        post_save.connect(amenity_catalog.clear, sender=Amenity)
+        post_delete.connect(amenity_catalog.clear, sender=Amenity)
+
+        post_save.connect(recommender.property_changed, sender=Property)
+        pre_delete.connect(recommender.property_deleted, sender=Property)
+        m2m_changed.connect(
+            recommender.amenities_changed, sender=Property.amenities.through
+        )
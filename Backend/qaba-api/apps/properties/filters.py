@@ -0,0 +1,281 @@
+import csv
+from functools import cache, reduce
+from operator import or_
+
+import django_filters
+from django import forms
+from django.db import connections
+from django.db.models import Count, Exists, F, FloatField, OuterRef, Q, Value
+from django.db.models.functions import Coalesce, Greatest
+from django_filters.widgets import BaseCSVWidget
+from rest_framework import filters
+
+from apps.users.models import User
+from core.utils.response import APIResponse
+
+from . import amenity_catalog, geo
+from .models import Property
+
+SEARCH_CONFIG = "english"
+
+
+@cache
+def trigram_enabled(alias):
+    """Whether the pg_trgm extension is installed on the given database"""
+    with connections[alias].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+class QuotedCSVWidget(BaseCSVWidget, forms.TextInput):
+    """
+    Comma-separated values read as CSV, so a value containing a comma can be
+    quoted (``?city="Ikeja, GRA",Lekki``). Repeated parameters add values.
+    """
+
+    def value_from_datadict(self, data, files, name):
+        if name not in data:
+            return None
+        rows = data.getlist(name) if hasattr(data, "getlist") else [data[name]]
+        return [
+            value
+            for row in csv.reader(rows, skipinitialspace=True)
+            for value in row
+            if value
+        ]
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    pass
+
+
+class ChoiceInFilter(django_filters.BaseInFilter, django_filters.ChoiceFilter):
+    pass
+
+
+class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    pass
+
+
+class PropertyFilter(django_filters.FilterSet):
+    """
+    Listing filters. Multi-value filters take comma-separated values
+    (``?city=Lekki,Ikeja``) and match any of them, with place names that
+    contain a comma quoted (``?city="Ikeja, GRA"``). ``min_``/``max_``
+    filters are inclusive ranges. ``lister_type`` matches the user type of
+    either the lister or the owner. ``amenities_all`` and ``amenities_any`` take
+    amenity codes and keep properties with all or any of them, tested with
+    bitwise AND on ``amenity_mask`` rather than joins.
+    """
+
+    property_type = ChoiceInFilter(choices=Property.PropertyType.choices)
+    listing_type = ChoiceInFilter(choices=Property.ListingType.choices)
+    property_status = ChoiceInFilter(choices=Property.PropertyStatus.choices)
+    listing_status = ChoiceInFilter(choices=Property.ListingStatus.choices)
+    lister_type = ChoiceInFilter(
+        choices=User.UserType.choices, method="filter_lister_type"
+    )
+    state = CharInFilter(widget=QuotedCSVWidget)
+    city = CharInFilter(widget=QuotedCSVWidget)
+    bedrooms = NumberInFilter()
+    bathrooms = NumberInFilter()
+
+    min_bedrooms = django_filters.NumberFilter("bedrooms", lookup_expr="gte")
+    max_bedrooms = django_filters.NumberFilter("bedrooms", lookup_expr="lte")
+    min_bathrooms = django_filters.NumberFilter("bathrooms", lookup_expr="gte")
+    max_bathrooms = django_filters.NumberFilter("bathrooms", lookup_expr="lte")
+    min_area = django_filters.NumberFilter("area_sqft", lookup_expr="gte")
+    max_area = django_filters.NumberFilter("area_sqft", lookup_expr="lte")
+    min_total = django_filters.NumberFilter("total_price", lookup_expr="gte")
+    max_total = django_filters.NumberFilter("total_price", lookup_expr="lte")
+    min_sale = django_filters.NumberFilter("sale_price", lookup_expr="gte")
+    max_sale = django_filters.NumberFilter("sale_price", lookup_expr="lte")
+    min_rent = django_filters.NumberFilter("rent_price", lookup_expr="gte")
+    max_rent = django_filters.NumberFilter("rent_price", lookup_expr="lte")
+
+    amenities_all = CharInFilter(method="filter_amenities_all")
+    amenities_any = CharInFilter(method="filter_amenities_any")
+
+    class Meta:
+        model = Property
+        fields = []
+
+    def filter_lister_type(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.filter(Q(listed_by_type__in=value) | Q(owner_type__in=value))
+
+    @staticmethod
+    def _amenity_codes(value):
+        return {code.strip().upper() for code in value if code.strip()}
+
+    @staticmethod
+    def _amenity_links(codes):
+        """Amenity links of ``codes``, for amenities that have no mask bit"""
+        return Property.amenities.through.objects.filter(amenity__code__in=codes)
+
+    def filter_amenities_all(self, queryset, name, value):
+        codes = self._amenity_codes(value)
+        if not codes:
+            return queryset
+        mask, unmasked = amenity_catalog.get_catalog().mask_for(codes)
+        if mask:
+            queryset = queryset.alias(
+                amenities_all_bits=F("amenity_mask").bitand(mask)
+            ).filter(amenities_all_bits=mask)
+        if unmasked:
+            complete = (
+                self._amenity_links(unmasked)
+                .values("property_id")
+                .annotate(matched=Count("amenity_id", distinct=True))
+                .filter(matched=len(unmasked))
+                .values("property_id")
+            )
+            queryset = queryset.filter(pk__in=complete)
+        return queryset
+
+    def filter_amenities_any(self, queryset, name, value):
+        codes = self._amenity_codes(value)
+        if not codes:
+            return queryset
+        mask, unmasked = amenity_catalog.get_catalog().mask_for(codes)
+        matches = Q(amenities_any_bits__gt=0) if mask else Q(pk__in=[])
+        if unmasked:
+            matches |= Exists(
+                self._amenity_links(unmasked).filter(property_id=OuterRef("pk"))
+            )
+        return queryset.alias(
+            amenities_any_bits=F("amenity_mask").bitand(mask)
+        ).filter(matches)
+
+
+class PropertySearchFilter(filters.SearchFilter):
+    """
+    Full-text search over the stored ``search_vector`` column on PostgreSQL,
+    ranked name > location > description, with trigram matching on city and
+    state so misspelled place names (``Lekky``, ``Ibadn``) still hit.
+
+    Other backends fall back to the stock ``ILIKE`` search over
+    ``search_fields``.
+    """
+
+    rank_annotation = "search_rank"
+
+    def filter_queryset(self, request, queryset, view):
+        if connections[queryset.db].vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+
+        term = " ".join(self.get_search_terms(request))
+        if not term:
+            return queryset
+
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+        matches = Q(search_vector=query)
+        rank = SearchRank(F("search_vector"), query)
+
+        if trigram_enabled(queryset.db):
+            from django.contrib.postgres.search import TrigramWordSimilarity
+
+            matches |= Q(city__trigram_word_similar=term)
+            matches |= Q(state__trigram_word_similar=term)
+            rank = rank + Greatest(
+                TrigramWordSimilarity(term, "city"),
+                TrigramWordSimilarity(term, "state"),
+            )
+
+        return queryset.filter(matches).annotate(
+            **{
+                self.rank_annotation: Coalesce(
+                    rank, Value(0.0), output_field=FloatField()
+                )
+            }
+        )
+
+
+class PropertyGeoFilter(filters.BaseFilterBackend):
+    """
+    ``bbox=south,west,north,east`` keeps properties inside a map viewport and
+    ``lat``, ``lng`` with ``radius_km`` keeps those within that distance,
+    annotated as ``distance_km``.
+
+    Both first narrow on the geohash prefixes covering the area, which the
+    geohash index serves, then apply the exact box and haversine checks.
+    """
+
+    distance_annotation = "distance_km"
+    default_radius_km = 10
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if params.get("bbox"):
+            queryset = self.within(queryset, self.get_bbox(request))
+
+        if params.get("lat") or params.get("lng"):
+            latitude, longitude, radius = self.get_circle(request)
+            bbox = geo.BoundingBox.around(latitude, longitude, radius)
+            queryset = (
+                self.within(queryset, bbox)
+                .annotate(
+                    **{self.distance_annotation: geo.distance_km(latitude, longitude)}
+                )
+                .filter(**{f"{self.distance_annotation}__lte": radius})
+            )
+
+        return queryset
+
+    @staticmethod
+    def within(queryset, bbox):
+        cells = reduce(
+            or_, (Q(geohash__startswith=cell) for cell in geo.covering_cells(bbox))
+        )
+        return queryset.filter(cells, **bbox.lookups())
+
+    @staticmethod
+    def get_bbox(request):
+        try:
+            return geo.BoundingBox.from_param(request.query_params["bbox"])
+        except ValueError as exc:
+            APIResponse.bad_request(message="Invalid bbox", errors={"bbox": str(exc)})
+
+    def get_circle(self, request):
+        params = request.query_params
+        try:
+            latitude = float(params["lat"])
+            longitude = float(params["lng"])
+            radius = float(params.get("radius_km", self.default_radius_km))
+        except (KeyError, ValueError):
+            APIResponse.bad_request(
+                message="Invalid location",
+                errors={"lat": "lat and lng must both be numbers"},
+            )
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            APIResponse.bad_request(
+                message="Invalid location", errors={"lat": "Coordinates out of range"}
+            )
+        if not 0 < radius <= geo.MAX_RADIUS_KM:
+            APIResponse.bad_request(
+                message="Invalid radius",
+                errors={"radius_km": f"Must be between 0 and {geo.MAX_RADIUS_KM}"},
+            )
+        return latitude, longitude, radius
+
+
+class PropertyOrderingFilter(filters.OrderingFilter):
+    """
+    Order full-text results by relevance and radius results by distance
+    unless the client asks otherwise
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if request.query_params.get(self.ordering_param):
+            return ordering
+        annotations = queryset.query.annotations
+        if PropertySearchFilter.rank_annotation in annotations:
+            return [f"-{PropertySearchFilter.rank_annotation}", *(ordering or [])]
+        if PropertyGeoFilter.distance_annotation in annotations:
+            return [PropertyGeoFilter.distance_annotation, *(ordering or [])]
+        return ordering
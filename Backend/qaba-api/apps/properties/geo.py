@@ -0,0 +1,163 @@
+"""
+Coordinates, geohashes and distance for property search without PostGIS.
+
+Every located property stores a geohash next to its latitude/longitude.
+Nearby points share a geohash prefix, so an area can be narrowed with a
+handful of indexed ``LIKE 'prefix%'`` range scans (``covering_cells``)
+before the exact bounding box and haversine checks run on what is left.
+The same prefixes group properties into map clusters.
+"""
+import math
+from typing import NamedTuple
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Stored precision, cells are about 4.8m x 4.8m
+GEOHASH_PRECISION = 9
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# Most prefixes a single area lookup ORs together
+MAX_COVERING_CELLS = 16
+
+MAX_RADIUS_KM = 100
+
+
+class BoundingBox(NamedTuple):
+    south: float
+    west: float
+    north: float
+    east: float
+
+    @classmethod
+    def from_param(cls, value: str) -> "BoundingBox":
+        """Parse ``south,west,north,east``, raising ``ValueError`` if invalid"""
+        parts = [float(part) for part in value.split(",")]
+        if len(parts) != 4:
+            raise ValueError("Expected south,west,north,east")
+        bbox = cls(*parts)
+        if not (-90 <= bbox.south <= bbox.north <= 90):
+            raise ValueError("Latitudes must satisfy -90 <= south <= north <= 90")
+        if not (-180 <= bbox.west <= bbox.east <= 180):
+            raise ValueError("Longitudes must satisfy -180 <= west <= east <= 180")
+        return bbox
+
+    @classmethod
+    def around(cls, latitude: float, longitude: float, radius_km: float):
+        """The box enclosing a circle of ``radius_km`` around a point"""
+        lat_delta = radius_km / KM_PER_DEGREE
+        cos_lat = math.cos(math.radians(latitude))
+        lng_delta = 180.0 if cos_lat < 1e-9 else min(180.0, lat_delta / cos_lat)
+        return cls(
+            max(-90.0, latitude - lat_delta),
+            max(-180.0, longitude - lng_delta),
+            min(90.0, latitude + lat_delta),
+            min(180.0, longitude + lng_delta),
+        )
+
+    def lookups(self) -> dict:
+        return {
+            "latitude__gte": self.south,
+            "latitude__lte": self.north,
+            "longitude__gte": self.west,
+            "longitude__lte": self.east,
+        }
+
+
+def encode(
+    latitude: float, longitude: float, precision: int = GEOHASH_PRECISION
+) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int):
+    """``(height, width)`` in degrees of a geohash cell"""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lng_bits
+
+
+def _cells(bbox: BoundingBox, precision: int) -> list[str]:
+    height, width = cell_size(precision)
+    cells = []
+    latitude = bbox.south
+    while True:
+        longitude = bbox.west
+        while True:
+            cell = encode(latitude, longitude, precision)
+            if cell not in cells:
+                cells.append(cell)
+            if longitude >= bbox.east:
+                break
+            longitude = min(longitude + width, bbox.east)
+        if latitude >= bbox.north:
+            break
+        latitude = min(latitude + height, bbox.north)
+    return cells
+
+
+def cell_count(bbox: BoundingBox, precision: int) -> int:
+    """Upper bound on the cells of ``precision`` needed to cover ``bbox``"""
+    height, width = cell_size(precision)
+    rows = math.floor((bbox.north - bbox.south) / height) + 2
+    columns = math.floor((bbox.east - bbox.west) / width) + 2
+    return rows * columns
+
+
+def precision_for(bbox: BoundingBox, max_cells: int = MAX_COVERING_CELLS) -> int:
+    """The finest precision whose cells cover ``bbox`` in at most ``max_cells``"""
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        if cell_count(bbox, precision) <= max_cells:
+            return precision
+    return 1
+
+
+def covering_cells(bbox: BoundingBox, max_cells: int = MAX_COVERING_CELLS) -> list[str]:
+    """Geohash prefixes whose cells together cover ``bbox``"""
+    return _cells(bbox, precision_for(bbox, max_cells))
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+def distance_km(latitude: float, longitude: float):
+    """Haversine distance in km from a point to each row's coordinates"""
+    lat = Radians(F("latitude"))
+    lng = Radians(F("longitude"))
+    origin_lat = math.radians(latitude)
+    origin_lng = math.radians(longitude)
+    a = Power(Sin((lat - Value(origin_lat)) / 2), 2) + Value(
+        math.cos(origin_lat)
+    ) * Cos(lat) * Power(Sin((lng - Value(origin_lng)) / 2), 2)
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(a), output_field=FloatField())
@@ -0,0 +1,150 @@
+import time
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Prefetch
+from django.test import RequestFactory
+
+from apps.properties.models import Property, PropertyImage
+from apps.properties.serializers import PropertyListSerializer
+from apps.users.models import User
+from core.utils import media_urls
+
+
+class SdkPropertyListSerializer(PropertyListSerializer):
+    """The listing serializer with URLs built by the Cloudinary SDK per row"""
+
+    def get_thumbnail(self, obj):
+        image = self._thumbnail_image(obj)
+        if image is None:
+            return None
+        return self.context["request"].build_absolute_uri(image.url)
+
+    def get_thumbnail_variants(self, obj):
+        image = self._thumbnail_image(obj)
+        if image is None:
+            return None
+        variants = {
+            name: image.build_url(raw_transformation=transformation)
+            for name, transformation in media_urls.VARIANTS.items()
+        }
+        srcset = media_urls.SRCSET_TRANSFORMATION
+        variants["srcset"] = ", ".join(
+            f"{image.build_url(raw_transformation=srcset.format(width=width))} {width}w"
+            for width in media_urls.SRCSET_WIDTHS
+        )
+        return variants
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed properties with one image each inside a transaction and time "
+        "serializing them as a listing page with SDK-built image URLs versus "
+        "the memoized URL builder. All changes are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=1_000,
+            help="Number of properties to serialize (default: 1000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed runs per serializer, the best is reported (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        repeat = options["repeat"]
+
+        with transaction.atomic():
+            self._seed(count)
+            properties = list(
+                Property.objects.filter(property_id__startswith="PROP-URLBENCH-")
+                .select_related("listed_by", "owner")
+                .prefetch_related(
+                    "amenities",
+                    Prefetch(
+                        "images",
+                        queryset=PropertyImage.objects.order_by("id"),
+                        to_attr="thumbnail_images",
+                    ),
+                )
+            )
+            request = RequestFactory().get("/api/v1/properties/")
+            request.user = AnonymousUser()
+            context = {"request": request}
+
+            sdk_data, sdk_time = self._time(
+                SdkPropertyListSerializer, properties, context, repeat
+            )
+            media_urls.build_url.cache_clear()
+            media_urls._variants.cache_clear()
+            cold_data, cold_time = self._time(
+                PropertyListSerializer, properties, context, 1
+            )
+            builder_data, builder_time = self._time(
+                PropertyListSerializer, properties, context, repeat
+            )
+
+            transaction.set_rollback(True)
+
+        if sdk_data != builder_data or cold_data != builder_data:
+            self.stderr.write(self.style.ERROR("Serialized payloads differ"))
+
+        self.stdout.write(f"Serialized {count} properties, best of {repeat}:")
+        self.stdout.write(f"  SDK URLs:                 {sdk_time * 1000:8.1f} ms")
+        self.stdout.write(f"  URL builder (cold cache): {cold_time * 1000:8.1f} ms")
+        self.stdout.write(f"  URL builder (warm cache): {builder_time * 1000:8.1f} ms")
+        if builder_time:
+            self.stdout.write(f"  Speed-up (warm): {sdk_time / builder_time:.1f}x")
+        self.stdout.write(self.style.SUCCESS("Benchmark data rolled back"))
+
+    @staticmethod
+    def _time(serializer_class, properties, context, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            data = serializer_class(properties, many=True, context=context).data
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return data, best
+
+    def _seed(self, count):
+        lister, _ = User.objects.get_or_create(
+            email="benchmark-lister@qaba.local",
+            defaults={
+                "first_name": "Benchmark",
+                "last_name": "Lister",
+                "user_type": User.UserType.AGENT,
+            },
+        )
+        properties = Property.objects.bulk_create(
+            Property(
+                property_name=f"URL Benchmark {index}",
+                property_id=f"PROP-URLBENCH-{index}",
+                slug=f"url-benchmark-{index}",
+                description="Benchmark listing",
+                property_type=Property.PropertyType.HOUSE,
+                listing_type=Property.ListingType.SALE,
+                location=f"{index} Benchmark Street",
+                state="Lagos",
+                city="Lekki",
+                sale_price=50_000_000,
+                total_price=50_000_000,
+                listed_by=lister,
+            )
+            for index in range(count)
+        )
+        PropertyImage.objects.bulk_create(
+            PropertyImage(
+                property=property_obj,
+                image=f"image/upload/v1700000000/qaba/properties/bench{index}.jpg",
+            )
+            for index, property_obj in enumerate(properties)
+        )
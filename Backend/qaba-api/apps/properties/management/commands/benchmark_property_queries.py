@@ -0,0 +1,194 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.properties.filters import PropertyFilter
+from apps.properties.models import Property
+from apps.users.models import User
+
+STATES = {
+    "Lagos": ["Ikeja", "Lekki", "Yaba", "Surulere", "Ajah"],
+    "FCT": ["Abuja", "Gwarinpa", "Kubwa", "Maitama"],
+    "Rivers": ["Port Harcourt", "Obio-Akpor", "Eleme"],
+    "Oyo": ["Ibadan", "Ogbomosho", "Oyo"],
+    "Enugu": ["Enugu", "Nsukka"],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large batch of properties inside a transaction and print the "
+        "query plans of the public listing queries with and without the "
+        "Property indexes. All changes are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=100_000,
+            help="Number of properties to seed (default: 100000)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5_000,
+            help="bulk_create batch size (default: 5000)",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        batch_size = options["batch_size"]
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            self._seed(count, batch_size)
+            self.stdout.write(
+                f"Seeded {count} properties in {time.perf_counter() - started:.1f}s"
+            )
+
+            self._analyze()
+            with_indexes = self._explain_all()
+
+            self._drop_indexes()
+            self._analyze()
+            without_indexes = self._explain_all()
+
+            for label, plan in without_indexes.items():
+                self._report(label, plan, with_indexes[label])
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark data rolled back"))
+
+    def _queries(self):
+        public = Property.objects.filter(
+            listing_status=Property.ListingStatus.APPROVED,
+            property_status__in=[
+                Property.PropertyStatus.AVAILABLE,
+                Property.PropertyStatus.SOLD,
+                Property.PropertyStatus.RENTED,
+            ],
+        )
+        return {
+            "public listing": public.order_by("-listed_date")[:20],
+            "state + city": public.filter(state="Lagos", city="Lekki").order_by(
+                "-listed_date"
+            )[:20],
+            "city": Property.objects.filter(city="Ibadan").order_by("-listed_date")[
+                :20
+            ],
+            "property type": Property.objects.filter(
+                property_type=Property.PropertyType.DUPLEX
+            ).order_by("-listed_date")[:20],
+            "sale price range": Property.objects.filter(
+                listing_type=Property.ListingType.SALE,
+                sale_price__gte=50_000_000,
+                sale_price__lte=60_000_000,
+            )[:20],
+            "rent price range": Property.objects.filter(
+                listing_type=Property.ListingType.RENT,
+                rent_price__gte=1_000_000,
+                rent_price__lte=1_200_000,
+            )[:20],
+            "lister type": PropertyFilter(
+                {"lister_type": User.UserType.LANDLORD}, queryset=public
+            ).qs.order_by("-listed_date")[:20],
+            "lister type via users join": public.filter(
+                Q(listed_by__user_type=User.UserType.LANDLORD)
+                | Q(owner__user_type=User.UserType.LANDLORD)
+            ).order_by("-listed_date")[:20],
+        }
+
+    def _explain_all(self):
+        return {label: qs.explain() for label, qs in self._queries().items()}
+
+    def _seed(self, count, batch_size):
+        lister, _ = User.objects.get_or_create(
+            email="benchmark-lister@qaba.local",
+            defaults={
+                "first_name": "Benchmark",
+                "last_name": "Lister",
+                "user_type": User.UserType.AGENT,
+            },
+        )
+        # One in ten listings comes from a landlord
+        landlord, _ = User.objects.get_or_create(
+            email="benchmark-landlord@qaba.local",
+            defaults={
+                "first_name": "Benchmark",
+                "last_name": "Landlord",
+                "user_type": User.UserType.LANDLORD,
+            },
+        )
+        rng = random.Random(42)
+        property_types = [choice for choice, _ in Property.PropertyType.choices]
+        listing_statuses = [choice for choice, _ in Property.ListingStatus.choices]
+        states = list(STATES)
+
+        batch = []
+        for index in range(count):
+            state = rng.choice(states)
+            listed_by = landlord if rng.random() < 0.1 else lister
+            is_rent = rng.random() < 0.5
+            price = (
+                rng.randint(200_000, 5_000_000)
+                if is_rent
+                else rng.randint(5_000_000, 500_000_000)
+            )
+            batch.append(
+                Property(
+                    property_name=f"Benchmark Property {index}",
+                    property_id=f"PROP-BENCH-{index}",
+                    slug=f"benchmark-property-{index}",
+                    description="Benchmark listing",
+                    property_type=rng.choice(property_types),
+                    listing_type=(
+                        Property.ListingType.RENT
+                        if is_rent
+                        else Property.ListingType.SALE
+                    ),
+                    location=f"{index} Benchmark Street",
+                    state=state,
+                    city=rng.choice(STATES[state]),
+                    listing_status=rng.choice(listing_statuses),
+                    bedrooms=rng.randint(1, 6),
+                    bathrooms=rng.randint(1, 5),
+                    rent_price=price if is_rent else None,
+                    sale_price=None if is_rent else price,
+                    total_price=price,
+                    listed_by=listed_by,
+                    listed_by_type=listed_by.user_type,
+                )
+            )
+            if len(batch) >= batch_size:
+                Property.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Property.objects.bulk_create(batch)
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"ANALYZE {Property._meta.db_table}")
+            elif connection.vendor == "sqlite":
+                cursor.execute("ANALYZE")
+
+    def _drop_indexes(self):
+        with connection.cursor() as cursor:
+            for index in Property._meta.indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+
+    def _report(self, label, before, after):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label}"))
+        self.stdout.write(f"-- without indexes ({self._scan_kind(before)})")
+        self.stdout.write(before)
+        self.stdout.write(f"-- with indexes ({self._scan_kind(after)})")
+        self.stdout.write(after)
+
+    @staticmethod
+    def _scan_kind(plan):
+        return "index scan" if "index" in plan.lower() else "sequential scan"
@@ -0,0 +1,117 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils.text import slugify
+
+from apps.properties.models import Property
+from apps.users.models import User
+
+
+def legacy_unique_slug(base_slug):
+    """The previous allocation, one ``exists()`` query per taken candidate"""
+    slug = base_slug
+    counter = 1
+    while Property.objects.filter(slug=slug).exists():
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
+
+class QueryCounter:
+    """``execute_wrapper`` counting queries, without the debug log's cap"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Save a batch of properties with the same name inside a transaction "
+        "and report the time and queries spent per save, then compare slug "
+        "allocation for one more property against the old exists() loop. "
+        "All changes are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=10_000,
+            help="Number of same-named properties to save (default: 10000)",
+        )
+        parser.add_argument(
+            "--name",
+            default="3 Bedroom Flat Lekki",
+            help="Property name used for every row",
+        )
+
+    def handle(self, *args, **options):
+        count = options["count"]
+        name = options["name"]
+
+        with transaction.atomic():
+            lister, _ = User.objects.get_or_create(
+                email="benchmark-lister@qaba.local",
+                defaults={
+                    "first_name": "Benchmark",
+                    "last_name": "Lister",
+                    "user_type": User.UserType.AGENT,
+                },
+            )
+
+            queries = QueryCounter()
+            most_queries = 0
+            started = time.perf_counter()
+            with connection.execute_wrapper(queries):
+                for index in range(count):
+                    before = queries.count
+                    Property.objects.create(
+                        property_name=name,
+                        description="Benchmark listing",
+                        property_type=Property.PropertyType.APARTMENT,
+                        listing_type=Property.ListingType.RENT,
+                        location=f"{index} Benchmark Street",
+                        state="Lagos",
+                        city="Lekki",
+                        rent_price=2_500_000,
+                        listed_by=lister,
+                    )
+                    most_queries = max(most_queries, queries.count - before)
+            elapsed = time.perf_counter() - started
+
+            self.stdout.write(
+                f"Saved {count} properties named {name!r} in {elapsed:.2f}s "
+                f"({elapsed / count * 1000:.2f} ms per save)"
+            )
+            self.stdout.write(
+                f"  queries per save: {queries.count / count:.1f} average, "
+                f"{most_queries} at most"
+            )
+
+            base_slug = slugify(name)
+            probe = Property(property_name=name)
+            self._compare(
+                "prefix query",
+                lambda: probe._generate_unique_slug(base_slug),
+            )
+            self._compare("exists() loop", lambda: legacy_unique_slug(base_slug))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("Benchmark data rolled back"))
+
+    def _compare(self, label, allocate):
+        queries = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            slug = allocate()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"  next slug via {label}: {slug} "
+            f"({queries.count} queries, {elapsed * 1000:.1f} ms)"
+        )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.functions import TruncMonth
+
+from apps.properties.models import AgentMonthlyAnalytics, Property
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the AgentMonthlyAnalytics rollup from scratch with one "
+        "grouped query over all properties."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1_000,
+            help="bulk_create batch size (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        rows = (
+            Property.objects.annotate(month=TruncMonth("listed_date"))
+            .values("listed_by_id", "month")
+            .annotate(**AgentMonthlyAnalytics.property_aggregates())
+            .order_by()
+        )
+        rollups = [
+            AgentMonthlyAnalytics(
+                agent_id=row.pop("listed_by_id"), month=row.pop("month").date(), **row
+            )
+            for row in rows
+        ]
+
+        with transaction.atomic():
+            AgentMonthlyAnalytics.objects.all().delete()
+            AgentMonthlyAnalytics.objects.bulk_create(
+                rollups, batch_size=options["batch_size"]
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {len(rollups)} agent monthly rollups")
+        )
@@ -0,0 +1,69 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.properties.models import Property, PropertyReview
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored rating summary (average, count and per-star "
+        "histogram) of every property from its approved reviews."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1_000,
+            help="bulk_update batch size (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        histograms = defaultdict(dict)
+        rows = (
+            PropertyReview.objects.filter(status=PropertyReview.ReviewStatus.APPROVED)
+            .values("reviewed_property_id", "rating")
+            .annotate(n=Count("id"))
+            .order_by()
+        )
+        for row in rows:
+            histograms[row["reviewed_property_id"]][row["rating"]] = row["n"]
+
+        changed = []
+        properties = Property.objects.only("id", *Property.RATING_SUMMARY_FIELDS)
+        with transaction.atomic():
+            for property_obj in properties.select_for_update().iterator():
+                summary = self._summary(histograms.get(property_obj.id, {}))
+                if any(
+                    getattr(property_obj, field) != value
+                    for field, value in summary.items()
+                ):
+                    for field, value in summary.items():
+                        setattr(property_obj, field, value)
+                    changed.append(property_obj)
+
+            Property.objects.bulk_update(
+                changed,
+                Property.RATING_SUMMARY_FIELDS,
+                batch_size=options["batch_size"],
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt rating summary for {len(changed)} properties")
+        )
+
+    @staticmethod
+    def _summary(stars):
+        count = sum(stars.values())
+        total = sum(star * n for star, n in stars.items())
+        summary = {
+            "rating_count": count,
+            "rating_total": total,
+            "rating_average": total / count if count else 0,
+        }
+        for star in range(1, 6):
+            summary[f"rating_{star}_count"] = stars.get(star, 0)
+        return summary
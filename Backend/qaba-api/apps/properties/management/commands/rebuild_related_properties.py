@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.properties import recommender
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the related listings of every approved property from "
+        "scratch. Saves queue the affected lists for refresh_related_properties; "
+        "run this after changing RELATED_PROPERTIES_TOP_K or the recommender "
+        "weights."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=None,
+            help="Listings stored per property (default: RELATED_PROPERTIES_TOP_K)",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        links = recommender.rebuild(options["top_k"])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {links} related listings in {elapsed:.2f}s")
+        )
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from apps.properties.models import Property
+from apps.properties.pricing import recompute_queryset
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the qaba fee, agent commission and total price of every "
+        "property from the current pricing settings. Run it after changing "
+        "QABA_*_PERCENTAGE or AGENT_*_COMMISSION_PERCENTAGE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows read and written per bulk_update (default: 500)",
+        )
+        parser.add_argument(
+            "--listing-type",
+            choices=Property.ListingType.values,
+            help="Only recompute rent or sale listings",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the properties whose price would change without saving",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Property.objects.all()
+        if options["listing_type"]:
+            queryset = queryset.filter(listing_type=options["listing_type"])
+
+        changed = recompute_queryset(
+            queryset, batch_size=options["batch_size"], dry_run=options["dry_run"]
+        )
+
+        verb = "Would reprice" if options["dry_run"] else "Repriced"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {changed} properties"))
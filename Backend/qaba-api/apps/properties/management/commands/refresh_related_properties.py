@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.properties import recommender
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the related listings queued by property saves. Runs until "
+        "interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue once and exit",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1_000,
+            help="Queued listings refreshed together (default: 1000)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30.0,
+            help="Seconds to sleep when the queue is empty (default: 30)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            processed = recommender.process_pending(options["batch_size"])
+            if processed:
+                self.stdout.write(
+                    f"Refreshed related listings for {processed} properties in "
+                    f"{time.perf_counter() - started:.2f}s"
+                )
+                if processed == options["batch_size"]:
+                    continue
+
+            if options["once"]:
+                break
+            try:
+                time.sleep(options["interval"])
+            except KeyboardInterrupt:
+                break
@@ -0,0 +1,101 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:48
+
+import logging
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION properties_property_search_vector_update()
+RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.property_name, '')), 'A') ||
+        setweight(to_tsvector('english', concat_ws(' ', NEW.location, NEW.city, NEW.state)), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER properties_property_search_vector_trigger
+BEFORE INSERT OR UPDATE OF property_name, location, city, state, description, search_vector
+ON properties_property
+FOR EACH ROW EXECUTE FUNCTION properties_property_search_vector_update();
+
+CREATE INDEX property_search_vector_idx
+ON properties_property USING GIN (search_vector);
+
+UPDATE properties_property SET search_vector = NULL;
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP INDEX IF EXISTS property_search_vector_idx;
+DROP TRIGGER IF EXISTS properties_property_search_vector_trigger ON properties_property;
+DROP FUNCTION IF EXISTS properties_property_search_vector_update();
+"""
+
+TRIGRAM_SQL = """
+CREATE INDEX property_city_trgm_idx
+ON properties_property USING GIN (city gin_trgm_ops);
+CREATE INDEX property_state_trgm_idx
+ON properties_property USING GIN (state gin_trgm_ops);
+"""
+
+DROP_TRIGRAM_SQL = """
+DROP INDEX IF EXISTS property_city_trgm_idx;
+DROP INDEX IF EXISTS property_state_trgm_idx;
+"""
+
+
+def create_search_objects(apps, schema_editor):
+    """
+    Install the search trigger, the GIN index and, where pg_trgm is
+    installed, the trigram indexes. Other backends keep the ILIKE search.
+
+    The migration does not install pg_trgm itself, as ``CREATE EXTENSION``
+    needs the CREATE privilege on the database (superuser on PostgreSQL
+    before 13), which the application role usually lacks. Run
+    ``CREATE EXTENSION pg_trgm`` as the database owner before migrating.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(SEARCH_VECTOR_SQL)
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        trigram_installed = cursor.fetchone() is not None
+    if trigram_installed:
+        schema_editor.execute(TRIGRAM_SQL)
+    else:
+        logger.warning(
+            "pg_trgm is not installed, skipping the city and state trigram "
+            "indexes. Search will not match misspelled places until the "
+            "extension is installed and the indexes are created."
+        )
+
+
+def drop_search_objects(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute(DROP_TRIGRAM_SQL)
+    schema_editor.execute(DROP_SEARCH_VECTOR_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0030_property_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Weighted full-text document, maintained by a database trigger on PostgreSQL', null=True),
+        ),
+        migrations.RunPython(create_search_objects, drop_search_objects),
+    ]
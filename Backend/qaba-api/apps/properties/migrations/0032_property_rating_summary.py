@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:51
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_summary(apps, schema_editor):
+    Property = apps.get_model("properties", "Property")
+    PropertyReview = apps.get_model("properties", "PropertyReview")
+
+    histograms = defaultdict(dict)
+    rows = (
+        PropertyReview.objects.filter(status="APPROVED")
+        .values("reviewed_property_id", "rating")
+        .annotate(n=Count("id"))
+    )
+    for row in rows:
+        histograms[row["reviewed_property_id"]][row["rating"]] = row["n"]
+
+    for property_id, stars in histograms.items():
+        count = sum(stars.values())
+        total = sum(star * n for star, n in stars.items())
+        Property.objects.filter(pk=property_id).update(
+            rating_count=count,
+            rating_total=total,
+            rating_average=total / count,
+            **{f"rating_{star}_count": stars.get(star, 0) for star in range(1, 6)},
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0031_property_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='rating_1_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rating_2_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rating_3_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rating_4_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rating_5_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rating_average',
+            field=models.FloatField(default=0, editable=False, help_text='Average rating of approved reviews'),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rating_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Number of approved reviews'),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='rating_total',
+            field=models.IntegerField(default=0, editable=False, help_text='Sum of approved review ratings'),
+        ),
+        migrations.RunPython(backfill_rating_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0032_property_rating_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgentMonthlyAnalytics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('total_properties', models.PositiveIntegerField(default=0)),
+                ('sold_properties', models.PositiveIntegerField(default=0)),
+                ('rented_properties', models.PositiveIntegerField(default=0)),
+                ('pending_properties', models.PositiveIntegerField(default=0)),
+                ('published_properties', models.PositiveIntegerField(default=0)),
+                ('sold_revenue', models.FloatField(default=0)),
+                ('rented_revenue', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('agent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_analytics', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Agent Monthly Analytics',
+                'verbose_name_plural': 'Agent Monthly Analytics',
+                'ordering': ['agent', 'month'],
+                'constraints': [models.UniqueConstraint(fields=('agent', 'month'), name='unique_agent_analytics_month')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0034_property_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedProperty',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(help_text='1 is the most similar')),
+                ('score', models.FloatField(help_text='Cosine similarity of the feature vectors')),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='properties.property')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommended_in', to='properties.property')),
+            ],
+            options={
+                'verbose_name': 'Related Property',
+                'verbose_name_plural': 'Related Properties',
+                'ordering': ['property', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('property', 'rank'), name='unique_related_property_rank')],
+            },
+        ),
+    ]
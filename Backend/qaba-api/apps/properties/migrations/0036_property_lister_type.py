@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:23
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_lister_type(apps, schema_editor):
+    Property = apps.get_model("properties", "Property")
+    User = apps.get_model("users", "User")
+
+    def user_type(field):
+        return Subquery(User.objects.filter(pk=OuterRef(field)).values("user_type")[:1])
+
+    Property.objects.update(
+        lister_type=Coalesce(user_type("owner_id"), user_type("listed_by_id"), Value(""))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0035_related_property'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='lister_type',
+            field=models.CharField(blank=True, default='', editable=False, help_text='User type of the owner, or of the lister when there is no owner, maintained on save so filtering by it needs no join', max_length=10),
+        ),
+        migrations.RunPython(fill_lister_type, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['lister_type', '-listed_date'], name='property_lister_type_idx'),
+        ),
+    ]
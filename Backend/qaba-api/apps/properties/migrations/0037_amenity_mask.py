@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:31
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+AMENITY_MASK_BITS = 63
+
+
+def fill_amenity_masks(apps, schema_editor):
+    Amenity = apps.get_model("properties", "Amenity")
+    Property = apps.get_model("properties", "Property")
+
+    bits = {}
+    for bit, amenity in enumerate(Amenity.objects.order_by("id")[:AMENITY_MASK_BITS]):
+        Amenity.objects.filter(pk=amenity.pk).update(bit=bit)
+        bits[amenity.pk] = bit
+
+    masks = defaultdict(int)
+    links = Property.amenities.through.objects.values_list("property_id", "amenity_id")
+    for property_id, amenity_id in links.iterator():
+        if amenity_id in bits:
+            masks[property_id] |= 1 << bits[amenity_id]
+    for property_id, mask in masks.items():
+        Property.objects.filter(pk=property_id).update(amenity_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0036_property_lister_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='amenity',
+            name='bit',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, help_text='Position in Property.amenity_mask, unset when all are taken', null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='amenity_mask',
+            field=models.BigIntegerField(default=0, editable=False, help_text='Bit per amenity (Amenity.bit), maintained when amenities change'),
+        ),
+        migrations.RunPython(fill_amenity_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0037_amenity_mask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedPropertyRefresh',
+            fields=[
+                ('property', models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='properties.property')),
+                ('requested_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Related Property Refresh',
+                'verbose_name_plural': 'Related Property Refreshes',
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0038_related_property_refresh'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RetiredAmenityBit',
+            fields=[
+                ('bit', models.PositiveSmallIntegerField(primary_key=True, serialize=False)),
+                ('retired_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Retired Amenity Bit',
+                'verbose_name_plural': 'Retired Amenity Bits',
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:45
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_lister_types(apps, schema_editor):
+    Property = apps.get_model("properties", "Property")
+    User = apps.get_model("users", "User")
+
+    def user_type(field):
+        return Subquery(User.objects.filter(pk=OuterRef(field)).values("user_type")[:1])
+
+    Property.objects.update(
+        listed_by_type=Coalesce(user_type("listed_by_id"), Value("")),
+        owner_type=Coalesce(user_type("owner_id"), Value("")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('properties', '0039_retired_amenity_bit'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='property',
+            name='property_lister_type_idx',
+        ),
+        migrations.RemoveField(
+            model_name='property',
+            name='lister_type',
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='listed_by_type',
+            field=models.CharField(blank=True, default='', editable=False, help_text='User type of the lister, maintained on save so filtering by it needs no join', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='owner_type',
+            field=models.CharField(blank=True, default='', editable=False, help_text='User type of the owner, empty without one, maintained on save so filtering by it needs no join', max_length=10),
+        ),
+        migrations.RunPython(fill_lister_types, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['listed_by_type', '-listed_date'], name='property_listed_by_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['owner_type', '-listed_date'], name='property_owner_type_idx'),
+        ),
+    ]
@@ -1,14 +1,51 @@
+import re
 import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+from functools import partial
+
 from cloudinary.models import CloudinaryField
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
+from core.utils.slugs import save_unique, unique_slug
+
+from . import geo
+
+
+# Amenity bits that fit in Property.amenity_mask, a signed 64-bit integer
+AMENITY_MASK_BITS = 63
+
 
 class Amenity(models.Model):
     name = models.CharField(max_length=100, unique=True)
     code = models.CharField(max_length=50, unique=True)
+    bit = models.PositiveSmallIntegerField(
+        unique=True,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Position in Property.amenity_mask, unset when all are taken",
+    )
     icon = models.CharField(
         max_length=50, blank=True, null=True, help_text="CSS icon class or code"
     )
@@ -27,7 +64,41 @@ class Amenity(models.Model):
     def save(self, *args, **kwargs):
         # Ensure code is uppercase and uses underscores
         self.code = self.name.upper().replace(" ", "_")
-        super().save(*args, **kwargs)
+
+        generators = {}
+        if self._state.adding and self.bit is None:
+            generators["bit"] = self._free_bit
+            self.bit = self._free_bit()
+
+        save_unique(self, partial(super().save, *args, **kwargs), generators)
+
+    @classmethod
+    def _free_bit(cls):
+        """
+        The lowest mask position no amenity holds or has held, None when all
+        are taken. Bits of deleted amenities stay retired (see
+        RetiredAmenityBit), so a stale mask can never name a new amenity.
+        """
+        taken = set(cls.objects.exclude(bit=None).values_list("bit", flat=True))
+        taken.update(RetiredAmenityBit.objects.values_list("bit", flat=True))
+        return next((bit for bit in range(AMENITY_MASK_BITS) if bit not in taken), None)
+
+
+class RetiredAmenityBit(models.Model):
+    """
+    Mask position of a deleted amenity, never handed out again. Only a data
+    migration that has cleared the bit from every mask should delete these.
+    """
+
+    bit = models.PositiveSmallIntegerField(primary_key=True)
+    retired_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Retired Amenity Bit"
+        verbose_name_plural = "Retired Amenity Bits"
+
+    def __str__(self):
+        return f"Amenity bit {self.bit}"
 
 
 class Property(models.Model):
@@ -93,6 +164,24 @@ class Property(models.Model):
         null=True,
         blank=True,
     )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    geohash = models.CharField(
+        max_length=geo.GEOHASH_PRECISION,
+        blank=True,
+        default="",
+        db_index=True,
+        editable=False,
+        help_text="Geohash of the coordinates, maintained on save for area lookups",
+    )
     bedrooms = models.PositiveIntegerField(null=True, blank=True)
     bathrooms = models.PositiveIntegerField(null=True, blank=True)
     area_sqft = models.FloatField(null=True, blank=True)
@@ -119,6 +208,27 @@ class Property(models.Model):
         limit_choices_to={"user_type__in": ["AGENT", "LANDLORD"]},
         help_text="Actual owner of the property (if different from the lister)",
     )
+    amenity_mask = models.BigIntegerField(
+        default=0,
+        editable=False,
+        help_text="Bit per amenity (Amenity.bit), maintained when amenities change",
+    )
+    listed_by_type = models.CharField(
+        max_length=10,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="User type of the lister, maintained on save so filtering by "
+        "it needs no join",
+    )
+    owner_type = models.CharField(
+        max_length=10,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="User type of the owner, empty without one, maintained on save "
+        "so filtering by it needs no join",
+    )
 
     rent_frequency = models.CharField(
         max_length=10,
@@ -170,6 +280,52 @@ class Property(models.Model):
     is_verified = models.BooleanField(
         default=False, help_text="Indicates if the property has been verified by admin"
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Weighted full-text document, maintained by a database trigger on PostgreSQL",
+    )
+    rating_average = models.FloatField(
+        default=0, editable=False, help_text="Average rating of approved reviews"
+    )
+    rating_count = models.IntegerField(
+        default=0, editable=False, help_text="Number of approved reviews"
+    )
+    rating_total = models.IntegerField(
+        default=0, editable=False, help_text="Sum of approved review ratings"
+    )
+    rating_1_count = models.IntegerField(default=0, editable=False)
+    rating_2_count = models.IntegerField(default=0, editable=False)
+    rating_3_count = models.IntegerField(default=0, editable=False)
+    rating_4_count = models.IntegerField(default=0, editable=False)
+    rating_5_count = models.IntegerField(default=0, editable=False)
+
+    RATING_SUMMARY_FIELDS = (
+        "rating_average",
+        "rating_count",
+        "rating_total",
+        "rating_1_count",
+        "rating_2_count",
+        "rating_3_count",
+        "rating_4_count",
+        "rating_5_count",
+    )
+
+    # Fields the related-listing recommender reads, see ``recommender``
+    SIMILARITY_FIELDS = (
+        "listing_status",
+        "property_status",
+        "city",
+        "state",
+        "property_type",
+        "listing_type",
+        "total_price",
+        "sale_price",
+        "rent_price",
+        "bedrooms",
+    )
+    # Their values as last read from or written to the database
+    _loaded_similarity = {}
 
     def has_amenity(self, amenity):
         """Check if property has a specific amenity"""
@@ -182,88 +338,221 @@ class Property(models.Model):
         verbose_name = "Property"
         verbose_name_plural = "Properties"
         ordering = ["-listed_date"]
+        indexes = [
+            models.Index(
+                fields=["listing_status", "property_status", "-listed_date"],
+                name="property_public_listing_idx",
+            ),
+            models.Index(
+                fields=["state", "city", "-listed_date"],
+                name="property_state_city_idx",
+            ),
+            models.Index(fields=["city", "-listed_date"], name="property_city_idx"),
+            models.Index(
+                fields=["property_type", "-listed_date"], name="property_type_idx"
+            ),
+            models.Index(
+                fields=["listing_type", "sale_price"], name="property_sale_price_idx"
+            ),
+            models.Index(
+                fields=["listing_type", "rent_price"], name="property_rent_price_idx"
+            ),
+            models.Index(
+                fields=["listing_type", "total_price"],
+                name="property_total_price_idx",
+            ),
+            models.Index(
+                fields=["listed_by_type", "-listed_date"],
+                name="property_listed_by_type_idx",
+            ),
+            models.Index(
+                fields=["owner_type", "-listed_date"],
+                name="property_owner_type_idx",
+            ),
+        ]
 
     @property
     def average_rating(self):
-        """Calculate average rating from approved reviews"""
-        approved_reviews = self.reviews.filter(
-            status=PropertyReview.ReviewStatus.APPROVED
-        )
-        if approved_reviews.exists():
-            return approved_reviews.aggregate(avg_rating=models.Avg("rating"))[
-                "avg_rating"
-            ]
-        return 0
+        """Average rating of approved reviews"""
+        return self.rating_average if self.rating_count else 0
 
     @property
     def total_reviews(self):
         """Get total count of approved reviews"""
-        return self.reviews.filter(status=PropertyReview.ReviewStatus.APPROVED).count()
+        return self.rating_count
 
     @property
     def rating_breakdown(self):
         """Get breakdown of ratings"""
-        approved_reviews = self.reviews.filter(
-            status=PropertyReview.ReviewStatus.APPROVED
+        return {
+            f"{star}_star": getattr(self, f"rating_{star}_count")
+            for star in range(1, 6)
+        }
+
+    @classmethod
+    def refresh_amenity_masks(cls, property_ids):
+        """Recompute ``amenity_mask`` from the amenity links of ``property_ids``"""
+        masks = dict.fromkeys(property_ids, 0)
+        links = cls.amenities.through.objects.filter(
+            property_id__in=masks, amenity__bit__isnull=False
+        ).values_list("property_id", "amenity__bit")
+        for property_id, bit in links:
+            masks[property_id] |= 1 << bit
+
+        for property_id, mask in masks.items():
+            cls.objects.filter(pk=property_id).update(amenity_mask=mask)
+
+    @classmethod
+    def clear_amenity_bit(cls, bit):
+        """Drop amenity ``bit`` from every mask that has it"""
+        if bit is None:
+            return
+        flag = 1 << bit
+        cls.objects.filter(amenity_mask=F("amenity_mask").bitor(flag)).update(
+            amenity_mask=F("amenity_mask").bitand(~flag)
         )
-        breakdown = {}
-        for i in range(1, 6):
-            breakdown[f"{i}_star"] = approved_reviews.filter(rating=i).count()
-        return breakdown
 
-    @property
-    def lister_type(self):
-        """Get the type of lister"""
-        return self.listed_by.user_type
+    @classmethod
+    def apply_rating_changes(cls, added=(), removed=()):
+        """
+        Fold approved ratings in or out of the stored rating summary.
+
+        ``added`` and ``removed`` are iterables of ``(property_id, rating)``
+        pairs. Each affected property gets a single relative UPDATE, so
+        concurrent changes never overwrite each other.
+        """
+        deltas = defaultdict(Counter)
+        for property_id, rating in added:
+            deltas[property_id][rating] += 1
+        for property_id, rating in removed:
+            deltas[property_id][rating] -= 1
+
+        for property_id, stars in deltas.items():
+            stars = {star: count for star, count in stars.items() if count}
+            if not stars:
+                continue
+
+            count = F("rating_count") + sum(stars.values())
+            total = F("rating_total") + sum(star * n for star, n in stars.items())
+            cls.objects.filter(pk=property_id).update(
+                rating_count=count,
+                rating_total=total,
+                rating_average=Case(
+                    When(
+                        GreaterThan(count, 0),
+                        then=Cast(total, FloatField()) / Cast(count, FloatField()),
+                    ),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                ),
+                **{
+                    f"rating_{star}_count": F(f"rating_{star}_count") + n
+                    for star, n in stars.items()
+                },
+            )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {"listed_by_id", "owner_id"} <= set(field_names):
+            instance._lister_ids = (instance.listed_by_id, instance.owner_id)
+        if {"listed_by_id", "listed_date"} <= set(field_names):
+            instance._analytics_bucket = (instance.listed_by_id, instance.listed_date)
+        instance._loaded_similarity = {
+            field: getattr(instance, field)
+            for field in cls.SIMILARITY_FIELDS
+            if field in field_names
+        }
+        return instance
+
+    def _resolve_lister_types(self):
+        """Set ``listed_by_type`` and ``owner_type`` when the lister or owner changed"""
+        lister_ids = (self.listed_by_id, self.owner_id)
+        if self.listed_by_type and lister_ids == getattr(self, "_lister_ids", None):
+            return False
+        self.listed_by_type = self.listed_by.user_type
+        self.owner_type = self.owner.user_type if self.owner_id else ""
+        self._lister_ids = lister_ids
+        return True
 
     def save(self, *args, **kwargs):
         base_slug = slugify(self.property_name) or "property"
+        generators = {}
 
         if not self.slug or not str(self.slug).startswith(base_slug):
-            self.slug = self._generate_unique_slug(base_slug)
+            generators["slug"] = partial(self._generate_unique_slug, base_slug)
 
         # Generate unique property_id if not set
         if not self.property_id:
-            self.property_id = self._generate_property_id()
+            generators["property_id"] = self._generate_property_id
 
-        super().save(*args, **kwargs)
+        for field, generate in generators.items():
+            setattr(self, field, generate())
 
-    def _generate_unique_slug(self, base_slug):
-        """Generate a unique slug based on the property name"""
-        slug = base_slug
-        counter = 1
+        self.geohash = (
+            geo.encode(self.latitude, self.longitude)
+            if self.latitude is not None and self.longitude is not None
+            else ""
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = update_fields = {*update_fields, "geohash"}
+
+        if self._resolve_lister_types() and update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "listed_by_type", "owner_type"}
+
+        if (
+            update_fields is None
+            and not self._state.adding
+            and not kwargs.get("force_insert")
+        ):
+            # The rating summary is maintained with relative updates from the
+            # review side, so saves write it only when asked to by name, the
+            # values this instance was read with may be stale by now
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.RATING_SUMMARY_FIELDS
+            ]
 
-        while Property.objects.exclude(pk=self.pk).filter(slug=slug).exists():
-            slug = f"{base_slug}-{counter}"
-            counter += 1
+        save_unique(self, partial(super().save, *args, **kwargs), generators)
+        self._loaded_similarity = {
+            field: self.__dict__[field]
+            for field in self.SIMILARITY_FIELDS
+            if field in self.__dict__
+        }
 
-        return slug
+    def _generate_unique_slug(self, base_slug):
+        """Generate a unique slug based on the property name"""
+        return unique_slug(
+            Property.objects.exclude(pk=self.pk),
+            base_slug,
+            max_length=self._meta.get_field("slug").max_length,
+        )
 
     def _generate_property_id(self):
         """
         Generate a unique property ID with format: PROP-{NAME_PREFIX}-{UNIQUE_CODE}
         Example: PROP-LUXURY-VILLA-A1B2C3
+
+        The code is random, collisions are left to the unique constraint and
+        retried by ``save_unique``.
         """
         # Get first 2-3 words from property name, clean and uppercase
         name_parts = self.property_name.upper().split()[:3]
         name_prefix = "-".join(name_parts)
 
         # Remove special characters and limit length
-        import re
-        name_prefix = re.sub(r'[^A-Z0-9-]', '', name_prefix)
+        name_prefix = re.sub(r"[^A-Z0-9-]", "", name_prefix)
         name_prefix = name_prefix[:30]  # Limit prefix length
 
         # Generate unique code using short UUID
-        unique_code = str(uuid.uuid4()).split('-')[0].upper()
-
-        property_id = f"PROP-{name_prefix}-{unique_code}"
+        unique_code = str(uuid.uuid4()).split("-")[0].upper()
 
-        # Ensure uniqueness
-        while Property.objects.exclude(pk=self.pk).filter(property_id=property_id).exists():
-            unique_code = str(uuid.uuid4()).split('-')[0].upper()
-            property_id = f"PROP-{name_prefix}-{unique_code}"
-
-        return property_id
+        return f"PROP-{name_prefix}-{unique_code}"
 
 
 class PropertyImage(models.Model):
@@ -422,6 +711,265 @@ class PropertyReview(models.Model):
     def __str__(self):
         return f"{self.reviewer.get_full_name()} - {self.reviewed_property.property_name} ({self.rating} stars)"
 
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = self._stored_rating_contribution()
+            super().save(*args, **kwargs)
+            current = self._rating_contribution()
+            if current != previous:
+                Property.apply_rating_changes(
+                    added=[current] if current else [],
+                    removed=[previous] if previous else [],
+                )
+
+        self._counted_rating = current
+
     @property
     def is_approved(self):
         return self.status == self.ReviewStatus.APPROVED
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {"reviewed_property_id", "rating", "status"} <= set(field_names):
+            instance._counted_rating = instance._rating_contribution()
+        return instance
+
+    def _rating_contribution(self):
+        """The ``(property_id, rating)`` pair this review adds to the summary"""
+        if self.status != self.ReviewStatus.APPROVED:
+            return None
+        return (self.reviewed_property_id, self.rating)
+
+    def _stored_rating_contribution(self):
+        """
+        What the stored row adds to the summary, read under a row lock so a
+        concurrent save of the same review waits instead of counting the
+        same change twice
+        """
+        if self._state.adding:
+            return None
+        stored = (
+            PropertyReview.objects.select_for_update()
+            .filter(pk=self.pk)
+            .only("reviewed_property_id", "rating", "status")
+            .first()
+        )
+        return stored._rating_contribution() if stored else None
+
+
+@receiver(post_delete, sender=PropertyReview)
+def remove_review_rating(sender, instance, **kwargs):
+    """Take a deleted approved review out of its property's rating summary"""
+    counted = getattr(instance, "_counted_rating", instance._rating_contribution())
+    if counted:
+        Property.apply_rating_changes(removed=[counted])
+
+
+class AgentMonthlyAnalytics(models.Model):
+    """
+    Per-lister monthly rollup of the figures shown on the agent analytics
+    dashboard, bucketed by the month a property was listed
+    """
+
+    agent = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="monthly_analytics",
+    )
+    month = models.DateField(help_text="First day of the month")
+    total_properties = models.PositiveIntegerField(default=0)
+    sold_properties = models.PositiveIntegerField(default=0)
+    rented_properties = models.PositiveIntegerField(default=0)
+    pending_properties = models.PositiveIntegerField(default=0)
+    published_properties = models.PositiveIntegerField(default=0)
+    sold_revenue = models.FloatField(default=0)
+    rented_revenue = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    COUNTER_FIELDS = (
+        "total_properties",
+        "sold_properties",
+        "rented_properties",
+        "pending_properties",
+        "published_properties",
+        "sold_revenue",
+        "rented_revenue",
+    )
+
+    class Meta:
+        verbose_name = "Agent Monthly Analytics"
+        verbose_name_plural = "Agent Monthly Analytics"
+        ordering = ["agent", "month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["agent", "month"], name="unique_agent_analytics_month"
+            )
+        ]
+
+    def __str__(self):
+        return f"Analytics for {self.agent.email} - {self.month:%B %Y}"
+
+    @staticmethod
+    def property_aggregates():
+        """Conditional aggregates over Property rows, keyed by counter field"""
+        sold = Q(property_status=Property.PropertyStatus.SOLD)
+        rented = Q(property_status=Property.PropertyStatus.RENTED)
+        return {
+            "total_properties": Count("id"),
+            "sold_properties": Count("id", filter=sold),
+            "rented_properties": Count("id", filter=rented),
+            "pending_properties": Count(
+                "id", filter=Q(listing_status=Property.ListingStatus.PENDING)
+            ),
+            "published_properties": Count(
+                "id", filter=Q(listing_status=Property.ListingStatus.APPROVED)
+            ),
+            "sold_revenue": Coalesce(Sum("sale_price", filter=sold), Value(0.0)),
+            "rented_revenue": Coalesce(Sum("rent_price", filter=rented), Value(0.0)),
+        }
+
+    @classmethod
+    def refresh(cls, agent_id, listed_date):
+        """Recompute the single bucket a property listed on ``listed_date`` falls in"""
+        listed_date = timezone.localtime(listed_date)
+        month = listed_date.date().replace(day=1)
+        start = timezone.make_aware(datetime(month.year, month.month, 1))
+        end = timezone.make_aware(
+            datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+        )
+
+        totals = Property.objects.filter(
+            listed_by_id=agent_id, listed_date__gte=start, listed_date__lt=end
+        ).aggregate(**cls.property_aggregates())
+
+        if not totals["total_properties"]:
+            cls.objects.filter(agent_id=agent_id, month=month).delete()
+            return None
+
+        rollup, _ = cls.objects.update_or_create(
+            agent_id=agent_id, month=month, defaults=totals
+        )
+        return rollup
+
+    @classmethod
+    def refresh_many(cls, buckets):
+        """
+        Recompute the buckets of ``(agent_id, listed_date)`` pairs, each
+        agent and month once
+        """
+        months = {}
+        for agent_id, listed_date in buckets:
+            if agent_id and listed_date:
+                month = timezone.localtime(listed_date).date().replace(day=1)
+                months.setdefault((agent_id, month), (agent_id, listed_date))
+        for agent_id, listed_date in months.values():
+            cls.refresh(agent_id, listed_date)
+
+
+class RelatedProperty(models.Model):
+    """
+    Precomputed "similar listings" for a property, ranked by feature
+    similarity. Maintained by ``apps.properties.recommender``.
+    """
+
+    property = models.ForeignKey(
+        Property, on_delete=models.CASCADE, related_name="related_links"
+    )
+    related = models.ForeignKey(
+        Property, on_delete=models.CASCADE, related_name="recommended_in"
+    )
+    rank = models.PositiveSmallIntegerField(help_text="1 is the most similar")
+    score = models.FloatField(help_text="Cosine similarity of the feature vectors")
+
+    class Meta:
+        verbose_name = "Related Property"
+        verbose_name_plural = "Related Properties"
+        ordering = ["property", "rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["property", "rank"], name="unique_related_property_rank"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.property_id} -> {self.related_id} (#{self.rank})"
+
+
+class RelatedPropertyRefresh(models.Model):
+    """
+    A listing whose related list is due for a recompute. Saves queue these
+    and the ``refresh_related_properties`` worker drains them.
+    """
+
+    property = models.OneToOneField(
+        Property,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        db_constraint=False,
+        related_name="+",
+    )
+    requested_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Related Property Refresh"
+        verbose_name_plural = "Related Property Refreshes"
+
+    def __str__(self):
+        return f"{self.property_id} (requested {self.requested_at:%Y-%m-%d %H:%M})"
+
+
+@receiver([post_save, post_delete], sender=Property)
+def refresh_agent_monthly_analytics(sender, instance, **kwargs):
+    """
+    Keep the lister's monthly rollup in step when the rollup is enabled,
+    and the previous lister's too when the property changed hands
+    """
+    if not settings.AGENT_ANALYTICS_ROLLUP:
+        return
+    bucket = (instance.listed_by_id, instance.listed_date)
+    AgentMonthlyAnalytics.refresh_many(
+        {bucket, getattr(instance, "_analytics_bucket", bucket)}
+    )
+    instance._analytics_bucket = bucket
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def sync_lister_types(sender, instance, created, update_fields=None, **kwargs):
+    """Carry a user type change over to the properties they list or own"""
+    if created or (update_fields is not None and "user_type" not in update_fields):
+        return
+    Property.objects.filter(listed_by=instance).exclude(
+        listed_by_type=instance.user_type
+    ).update(listed_by_type=instance.user_type)
+    Property.objects.filter(owner=instance).exclude(
+        owner_type=instance.user_type
+    ).update(owner_type=instance.user_type)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def reset_owner_type(sender, instance, **kwargs):
+    """Owned properties lose their owner type along with the owner"""
+    Property.objects.filter(owner=instance).update(owner_type="")
+
+
+@receiver(m2m_changed, sender=Property.amenities.through)
+def refresh_amenity_mask(sender, instance, action, reverse, pk_set=None, **kwargs):
+    """Keep ``amenity_mask`` in step with ``amenities.set()``/``add()``/..."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        Property.refresh_amenity_masks([instance.pk])
+    elif action == "post_clear":
+        Property.clear_amenity_bit(instance.bit)
+    else:
+        Property.refresh_amenity_masks(pk_set or ())
+
+
+@receiver(pre_delete, sender=Amenity)
+def retire_amenity_bit(sender, instance, **kwargs):
+    """Clear a deleted amenity's bit from every mask and retire it"""
+    if instance.bit is None:
+        return
+    Property.clear_amenity_bit(instance.bit)
+    RetiredAmenityBit.objects.get_or_create(bit=instance.bit)
@@ -0,0 +1,145 @@
+"""
+Price ranges and percentile buckets for the listing's price sliders.
+
+The prices of every public listing are read into a NumPy snapshot once and
+kept in the response cache under the ``price-stats`` namespace. Property
+saves and deletes bump that namespace, and the snapshot also expires after
+``PRICE_STATS_SNAPSHOT_TIMEOUT`` seconds (the response cache timeout by
+default), which bounds how stale it gets when a bump is missed: a bulk
+``update()`` that sends no signals, or a bump made in another process
+while the cache is per-process. Every statistics request is then a mask
+over the cached arrays, with no table scan.
+"""
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+
+from core.utils.cache import get_cache, get_version
+
+from .models import Property
+
+NAMESPACE = "price-stats"
+SNAPSHOT_KEY = "price-stats:snapshot:v{version}"
+
+PUBLIC_STATUSES = [
+    Property.PropertyStatus.AVAILABLE,
+    Property.PropertyStatus.SOLD,
+    Property.PropertyStatus.RENTED,
+]
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# Quantiles the bucket edges are placed at, so every bucket holds about the
+# same number of listings
+BUCKET_QUANTILES = np.linspace(0, 1, 11)
+
+# Price field, and the listing type it applies to (None for every listing)
+PRICE_FIELDS = {
+    "sale_price": Property.ListingType.SALE,
+    "rent_price": Property.ListingType.RENT,
+    "total_price": None,
+}
+
+
+class Snapshot(NamedTuple):
+    listing_type: np.ndarray  # (n,) str
+    state: np.ndarray  # (n,) str, lowercased
+    city: np.ndarray  # (n,) str, lowercased
+    prices: dict  # field -> (n,) float64, NaN when unset
+
+    def mask(self, listing_type=None, state=None, city=None) -> np.ndarray:
+        selected = np.ones(len(self.listing_type), dtype=bool)
+        if listing_type:
+            selected &= self.listing_type == str(listing_type).upper()
+        if state:
+            selected &= self.state == _normalize(state)
+        if city:
+            selected &= self.city == _normalize(city)
+        return selected
+
+
+def _normalize(value: str | None) -> str:
+    return (value or "").strip().lower()
+
+
+def load_snapshot() -> Snapshot:
+    """Prices of every public listing, read with one query"""
+    rows = list(
+        Property.objects.filter(
+            listing_status=Property.ListingStatus.APPROVED,
+            property_status__in=PUBLIC_STATUSES,
+        ).values_list("listing_type", "state", "city", *PRICE_FIELDS)
+    )
+    columns = list(zip(*rows, strict=True)) or [()] * (3 + len(PRICE_FIELDS))
+    listing_type, state, city, *prices = columns
+    return Snapshot(
+        listing_type=np.array(listing_type, dtype=str),
+        state=np.array([_normalize(value) for value in state], dtype=str),
+        city=np.array([_normalize(value) for value in city], dtype=str),
+        prices={
+            field: np.array(
+                [np.nan if value is None else float(value) for value in values],
+                dtype=np.float64,
+            )
+            for field, values in zip(PRICE_FIELDS, prices, strict=True)
+        },
+    )
+
+
+def get_snapshot() -> Snapshot:
+    """The cached snapshot for the current ``price-stats`` version"""
+    cache = get_cache()
+    key = SNAPSHOT_KEY.format(version=get_version(NAMESPACE))
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = load_snapshot()
+        cache.set(key, snapshot, settings.PRICE_STATS_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def summarize(values: np.ndarray) -> dict | None:
+    """Range, percentiles and equal-count buckets of ``values``"""
+    values = values[np.isfinite(values) & (values > 0)]
+    if not len(values):
+        return None
+
+    edges = np.unique(np.quantile(values, BUCKET_QUANTILES))
+    if len(edges) == 1:
+        price = float(edges[0])
+        buckets = [{"min": price, "max": price, "count": int(len(values))}]
+    else:
+        counts, _ = np.histogram(values, bins=edges)
+        buckets = [
+            {"min": float(low), "max": float(high), "count": int(count)}
+            for low, high, count in zip(edges[:-1], edges[1:], counts, strict=True)
+        ]
+
+    return {
+        "count": int(len(values)),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "percentiles": {
+            f"p{percentile}": float(value)
+            for percentile, value in zip(
+                PERCENTILES, np.percentile(values, PERCENTILES), strict=True
+            )
+        },
+        "buckets": buckets,
+    }
+
+
+def get_price_stats(listing_type=None, state=None, city=None) -> dict:
+    """Statistics per price field for the listings matching the filters"""
+    snapshot = get_snapshot()
+    selected = snapshot.mask(listing_type, state, city)
+    stats = {}
+    for field, field_listing_type in PRICE_FIELDS.items():
+        field_selected = selected
+        if field_listing_type is not None:
+            field_selected = selected & (
+                snapshot.listing_type == field_listing_type.value
+            )
+        stats[field] = summarize(snapshot.prices[field][field_selected])
+    return stats
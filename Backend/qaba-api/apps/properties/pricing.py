@@ -0,0 +1,195 @@
+"""
+Qaba fee, agent commission and total price of a listing.
+
+All arithmetic is done in ``Decimal`` and rounded half-up to the kobo, so the
+total a client submits can be compared exactly. The model columns are still
+floats, callers convert on the way in and out.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.users.models import User
+from core.utils.cache import bump_version_on_commit
+
+from . import recommender
+from .models import Property
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0")
+
+PRICING_FIELDS = ["qaba_fee", "agent_commission", "total_price"]
+
+
+class PricingRates(NamedTuple):
+    qaba_rent: Decimal
+    agent_rent: Decimal
+    qaba_sale: Decimal
+    agent_sale: Decimal
+
+    @classmethod
+    def from_settings(cls) -> "PricingRates":
+        return cls(
+            qaba_rent=to_decimal(settings.QABA_RENT_PERCENTAGE),
+            agent_rent=to_decimal(settings.AGENT_RENT_COMMISSION_PERCENTAGE),
+            qaba_sale=to_decimal(settings.QABA_SALE_PERCENTAGE),
+            agent_sale=to_decimal(settings.AGENT_SALE_COMMISSION_PERCENTAGE),
+        )
+
+    def for_listing(self, listing_type):
+        """``(qaba_rate, agent_rate)`` for a listing type"""
+        if listing_type == Property.ListingType.RENT:
+            return self.qaba_rent, self.agent_rent
+        return self.qaba_sale, self.agent_sale
+
+
+class PriceBreakdown(NamedTuple):
+    qaba_fee: Decimal
+    agent_commission: Decimal
+    total_price: Decimal
+
+    def as_floats(self) -> dict:
+        """Field values ready to assign to a Property"""
+        return {field: float(getattr(self, field)) for field in PRICING_FIELDS}
+
+
+def to_decimal(value) -> Decimal:
+    """``None`` as zero; floats go through ``str`` so 0.1 stays 0.1"""
+    if value is None:
+        return ZERO
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def quantize(value: Decimal) -> Decimal:
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def compute(
+    listing_type,
+    base_price,
+    *,
+    agent_listed: bool,
+    service_charge=None,
+    caution_fee=None,
+    legal_fee=None,
+    rates: PricingRates | None = None,
+) -> PriceBreakdown | None:
+    """
+    Price a listing from its rent or sale price.
+
+    The agent commission only applies when an agent owns (or, without an
+    owner, listed) the property. Returns ``None`` when there is no base
+    price to work from.
+    """
+    if base_price is None or listing_type not in Property.ListingType.values:
+        return None
+
+    rates = rates or PricingRates.from_settings()
+    qaba_rate, agent_rate = rates.for_listing(listing_type)
+    base = to_decimal(base_price)
+
+    qaba_fee = quantize(base * qaba_rate)
+    agent_commission = quantize(base * agent_rate) if agent_listed else ZERO
+    total_price = quantize(
+        base
+        + qaba_fee
+        + agent_commission
+        + to_decimal(service_charge)
+        + to_decimal(caution_fee)
+        + to_decimal(legal_fee)
+    )
+    return PriceBreakdown(qaba_fee, agent_commission, total_price)
+
+
+def is_agent_listed(owner, listed_by) -> bool:
+    lister = owner or listed_by
+    return getattr(lister, "user_type", None) == User.UserType.AGENT
+
+
+def price_property(
+    property_obj: Property, rates: PricingRates | None = None
+) -> PriceBreakdown | None:
+    base_price = (
+        property_obj.rent_price
+        if property_obj.listing_type == Property.ListingType.RENT
+        else property_obj.sale_price
+    )
+    return compute(
+        property_obj.listing_type,
+        base_price,
+        agent_listed=is_agent_listed(property_obj.owner, property_obj.listed_by),
+        service_charge=property_obj.service_charge,
+        caution_fee=property_obj.caution_fee,
+        legal_fee=property_obj.legal_fee,
+        rates=rates,
+    )
+
+
+def apply_pricing(property_obj: Property, rates: PricingRates | None = None) -> bool:
+    """Set the computed fields on ``property_obj``, returning whether any changed"""
+    breakdown = price_property(property_obj, rates)
+    if breakdown is None:
+        return False
+
+    changed = False
+    for field, value in breakdown.as_floats().items():
+        if getattr(property_obj, field) != value:
+            setattr(property_obj, field, value)
+            changed = True
+    return changed
+
+
+def recompute_queryset(queryset, batch_size: int = 500, dry_run: bool = False) -> int:
+    """
+    Re-price every property in ``queryset`` with the current settings and
+    write back the changed rows with ``bulk_update``, ``batch_size`` at a
+    time. Returns the number of properties whose price changed.
+
+    ``bulk_update`` sends no signals, so the cached listings and price
+    statistics are invalidated here and the repriced listings are queued
+    for a related-listing refresh.
+    """
+    rates = PricingRates.from_settings()
+    properties = (
+        queryset.select_related("owner", "listed_by")
+        .only(
+            "id",
+            "listing_type",
+            "rent_price",
+            "sale_price",
+            "service_charge",
+            "caution_fee",
+            "legal_fee",
+            "owner__user_type",
+            "listed_by__user_type",
+            *PRICING_FIELDS,
+        )
+        .order_by("pk")
+    )
+
+    changed = 0
+    pending = []
+    for property_obj in properties.iterator(chunk_size=batch_size):
+        if apply_pricing(property_obj, rates):
+            pending.append(property_obj)
+        if len(pending) >= batch_size:
+            changed += _flush(pending, batch_size, dry_run)
+            pending = []
+    changed += _flush(pending, batch_size, dry_run)
+
+    if changed and not dry_run:
+        bump_version_on_commit("properties")
+        bump_version_on_commit("price-stats")
+    return changed
+
+
+def _flush(properties, batch_size, dry_run):
+    if properties and not dry_run:
+        with transaction.atomic():
+            Property.objects.bulk_update(properties, PRICING_FIELDS, batch_size=batch_size)
+            recommender.schedule_refresh(property_obj.pk for property_obj in properties)
+    return len(properties)
@@ -0,0 +1,376 @@
+"""
+Related-listing recommendations.
+
+Each approved listing is described by a feature vector:
+- the city, state, property type and listing type, as categorical codes
+- a log-scale price band and a bedroom count, each smoothed into the
+  neighbouring buckets
+- the listing's amenities
+
+Listings are compared by cosine similarity. The top ``RELATED_PROPERTIES_TOP_K``
+available listings per property are stored in ``RelatedProperty``, so the
+detail view reads them with one indexed query.
+
+The categorical features are kept as integer codes rather than expanded
+into one-hot columns. Their contribution to a dot product is just
+``weight ** 2`` when two codes match, which keeps the dense part of the
+matrix down to the price, bedroom and amenity columns however many cities
+there are.
+
+``refresh`` recomputes only the lists a change can affect. These are the
+changed listings' own lists, lists that currently include them, and lists
+whose weakest entry they now beat. ``rebuild`` recomputes everything.
+
+Saves never refresh in the request. Changes to approved listings queue a
+``RelatedPropertyRefresh`` row, and the ``refresh_related_properties``
+worker refreshes the queued listings in batches.
+"""
+import math
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+
+from .models import Property, RelatedProperty, RelatedPropertyRefresh
+
+CATEGORICAL_WEIGHTS = {
+    "city": 3.0,
+    "state": 1.5,
+    "property_type": 1.5,
+    "listing_type": 2.0,
+}
+PRICE_WEIGHT = 2.0
+BEDROOM_WEIGHT = 1.0
+AMENITY_WEIGHT = 1.5
+
+PRICE_BANDS = 48  # log2 bands, up to 2^47 naira
+BEDROOM_BUCKETS = 7  # 0-5 bedrooms and 6+
+NEIGHBOUR_SHARE = 0.5  # weight given to the adjacent price/bedroom bucket
+
+# Rows of the similarity matrix computed at once, bounding memory to about
+# this many float32 cells
+SIMILARITY_BLOCK_CELLS = 4_000_000
+
+SOURCE_STATUSES = [
+    Property.PropertyStatus.AVAILABLE,
+    Property.PropertyStatus.SOLD,
+    Property.PropertyStatus.RENTED,
+]
+CANDIDATE_STATUSES = [Property.PropertyStatus.AVAILABLE]
+
+
+def top_k():
+    return settings.RELATED_PROPERTIES_TOP_K
+
+
+def listings():
+    """Approved listings that get recommendations"""
+    return Property.objects.filter(
+        listing_status=Property.ListingStatus.APPROVED,
+        property_status__in=SOURCE_STATUSES,
+    )
+
+
+class Features(NamedTuple):
+    ids: np.ndarray  # (n,) property ids
+    codes: np.ndarray  # (n, len(CATEGORICAL_WEIGHTS)), -1 when missing
+    dense: np.ndarray  # (n, d) weighted price/bedroom/amenity columns
+    norms: np.ndarray  # (n,) vector lengths including the categorical part
+    candidates: np.ndarray  # (n,) bool, may be recommended
+
+    def positions(self, property_ids: Iterable[int]) -> np.ndarray:
+        index = {pk: position for position, pk in enumerate(self.ids.tolist())}
+        return np.array(
+            [index[pk] for pk in property_ids if pk in index], dtype=np.int64
+        )
+
+    def similarity(self, rows: np.ndarray) -> np.ndarray:
+        """Cosine similarity of ``rows`` against every listing, shape (rows, n)"""
+        scores = self.dense[rows] @ self.dense.T
+        for column, weight in enumerate(CATEGORICAL_WEIGHTS.values()):
+            mine = self.codes[rows, column][:, None]
+            matches = (mine == self.codes[:, column][None, :]) & (mine >= 0)
+            scores += np.float32(weight**2) * matches
+        scores /= self.norms[rows][:, None] * self.norms[None, :]
+        return scores
+
+    def neighbours(self, rows: np.ndarray, k: int):
+        """``(row, [(property_id, score), ...])`` for the top ``k`` of each row"""
+        block = max(1, SIMILARITY_BLOCK_CELLS // max(1, len(self.ids)))
+        for start in range(0, len(rows), block):
+            chunk = rows[start : start + block]
+            scores = self.similarity(chunk)
+            scores[:, ~self.candidates] = -np.inf
+            scores[np.arange(len(chunk)), chunk] = -np.inf
+
+            count = min(k, len(self.ids))
+            if count == 0:
+                for row in chunk:
+                    yield row, []
+                continue
+            best = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+            for offset, row in enumerate(chunk):
+                picked = best[offset]
+                picked = picked[np.argsort(-scores[offset, picked], kind="stable")]
+                yield row, [
+                    (int(self.ids[column]), float(scores[offset, column]))
+                    for column in picked
+                    if np.isfinite(scores[offset, column])
+                ]
+
+
+def _bucket(values: np.ndarray, buckets: int, weight: float) -> np.ndarray:
+    """One-hot ``values`` (-1 for missing) with the neighbours at half weight"""
+    matrix = np.zeros((len(values), buckets), dtype=np.float32)
+    present = np.flatnonzero(values >= 0)
+    for shift, share in ((0, 1.0), (-1, NEIGHBOUR_SHARE), (1, NEIGHBOUR_SHARE)):
+        columns = values[present] + shift
+        inside = (columns >= 0) & (columns < buckets)
+        matrix[present[inside], columns[inside]] = weight * share
+    return matrix
+
+
+def load_features() -> Features:
+    """Feature vectors of every listing, read with two queries"""
+    rows = list(
+        listings()
+        .order_by("pk")
+        .values_list(
+            "pk",
+            "city",
+            "state",
+            "property_type",
+            "listing_type",
+            "total_price",
+            "sale_price",
+            "rent_price",
+            "bedrooms",
+            "property_status",
+        )
+    )
+    count = len(rows)
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    position = {pk: index for index, pk in enumerate(ids.tolist())}
+
+    codes = np.full((count, len(CATEGORICAL_WEIGHTS)), -1, dtype=np.int32)
+    vocabularies = [{} for _ in CATEGORICAL_WEIGHTS]
+    price_bands = np.full(count, -1, dtype=np.int64)
+    bedrooms = np.full(count, -1, dtype=np.int64)
+    candidates = np.zeros(count, dtype=bool)
+
+    for index, (_, city, state, *rest) in enumerate(rows):
+        property_type, listing_type, total, sale, rent, beds, status = rest
+        for column, value in enumerate((city, state, property_type, listing_type)):
+            value = (value or "").strip().lower()
+            if value:
+                codes[index, column] = vocabularies[column].setdefault(
+                    value, len(vocabularies[column])
+                )
+        price = total or (rent if listing_type == Property.ListingType.RENT else sale)
+        if price and price > 0:
+            price_bands[index] = min(PRICE_BANDS - 1, int(math.log2(price)))
+        if beds is not None:
+            bedrooms[index] = min(beds, BEDROOM_BUCKETS - 1)
+        candidates[index] = status in CANDIDATE_STATUSES
+
+    amenity_links = Property.amenities.through.objects.filter(
+        property__in=listings()
+    ).values_list("property_id", "amenity_id")
+    amenity_columns = {}
+    amenity_cells = []
+    for property_id, amenity_id in amenity_links:
+        column = amenity_columns.setdefault(amenity_id, len(amenity_columns))
+        amenity_cells.append((position[property_id], column))
+
+    amenities = np.zeros((count, len(amenity_columns)), dtype=np.float32)
+    if amenity_cells:
+        cells = np.array(amenity_cells, dtype=np.int64)
+        amenities[cells[:, 0], cells[:, 1]] = 1.0
+        # Spread the weight so every amenity block has length AMENITY_WEIGHT
+        per_row = np.sqrt(amenities.sum(axis=1, keepdims=True))
+        np.divide(
+            amenities * AMENITY_WEIGHT, per_row, out=amenities, where=per_row > 0
+        )
+
+    dense = np.hstack(
+        [
+            _bucket(price_bands, PRICE_BANDS, PRICE_WEIGHT),
+            _bucket(bedrooms, BEDROOM_BUCKETS, BEDROOM_WEIGHT),
+            amenities,
+        ]
+    )
+    squared = np.einsum("ij,ij->i", dense, dense)
+    for column, weight in enumerate(CATEGORICAL_WEIGHTS.values()):
+        squared += (codes[:, column] >= 0) * np.float32(weight**2)
+    # Listings without any feature still get a unit length to avoid 0/0
+    norms = np.sqrt(np.where(squared > 0, squared, 1.0)).astype(np.float32)
+
+    return Features(ids, codes, dense, norms, candidates)
+
+
+def _store(features: Features, rows: np.ndarray, k: int) -> int:
+    links = [
+        RelatedProperty(
+            property_id=int(features.ids[row]),
+            related_id=related_id,
+            rank=rank,
+            score=score,
+        )
+        for row, neighbours in features.neighbours(rows, k)
+        for rank, (related_id, score) in enumerate(neighbours, start=1)
+    ]
+    with transaction.atomic():
+        RelatedProperty.objects.filter(
+            property_id__in=features.ids[rows].tolist()
+        ).delete()
+        RelatedProperty.objects.bulk_create(links, batch_size=1_000)
+    return len(links)
+
+
+def rebuild(k: int = None) -> int:
+    """Recompute every listing's related list, returning the links written"""
+    k = k or top_k()
+    features = load_features()
+    with transaction.atomic():
+        RelatedProperty.objects.exclude(
+            property_id__in=features.ids.tolist()
+        ).delete()
+        return _store(features, np.arange(len(features.ids)), k)
+
+
+def affected_rows(features: Features, property_ids: list[int], k: int) -> np.ndarray:
+    """
+    Positions of the lists a change to ``property_ids`` can alter: their own,
+    lists that contain them, and lists they now score above the weakest
+    entry of (or that are not full yet)
+    """
+    changed = features.positions(property_ids)
+    affected = set(changed.tolist())
+    affected.update(
+        features.positions(
+            RelatedProperty.objects.filter(related_id__in=property_ids)
+            .values_list("property_id", flat=True)
+            .distinct()
+        ).tolist()
+    )
+
+    changed_candidates = changed[features.candidates[changed]]
+    if len(changed_candidates):
+        best = features.similarity(changed_candidates).max(axis=0)
+        lowest = np.full(len(features.ids), -np.inf, dtype=np.float32)
+        stored = RelatedProperty.objects.values("property_id").annotate(
+            lowest=Min("score"), links=Count("id")
+        )
+        index = {pk: position for position, pk in enumerate(features.ids.tolist())}
+        for row in stored:
+            position = index.get(row["property_id"])
+            if position is not None and row["links"] >= k:
+                lowest[position] = row["lowest"]
+        affected.update(np.flatnonzero(best > lowest).tolist())
+
+    return np.array(sorted(affected), dtype=np.int64)
+
+
+def refresh(property_ids: Iterable[int], k: int = None) -> int:
+    """Bring the related lists in step after ``property_ids`` changed"""
+    k = k or top_k()
+    property_ids = list(set(property_ids))
+    features = load_features()
+
+    # Listings that are no longer approved keep no list of their own
+    RelatedProperty.objects.filter(property_id__in=property_ids).exclude(
+        property_id__in=features.ids.tolist()
+    ).delete()
+
+    rows = affected_rows(features, property_ids, k)
+    if not len(rows):
+        return 0
+    return _store(features, rows, k)
+
+
+def schedule_refresh(property_ids: Iterable[int]):
+    """
+    Queue the related lists of ``property_ids`` for the
+    ``refresh_related_properties`` worker. The queue rows are written in
+    the current transaction, so a rollback drops them with it.
+    """
+    RelatedPropertyRefresh.objects.bulk_create(
+        [RelatedPropertyRefresh(property_id=pk) for pk in set(property_ids)],
+        ignore_conflicts=True,
+    )
+
+
+def process_pending(batch_size: int = 1_000) -> int:
+    """Refresh one batch of queued listings, returning how many were taken"""
+    with transaction.atomic():
+        property_ids = list(
+            RelatedPropertyRefresh.objects.select_for_update(skip_locked=True)
+            .order_by("requested_at")
+            .values_list("property_id", flat=True)[:batch_size]
+        )
+        RelatedPropertyRefresh.objects.filter(property_id__in=property_ids).delete()
+
+    if property_ids:
+        try:
+            refresh(property_ids)
+        except Exception:
+            schedule_refresh(property_ids)
+            raise
+    return len(property_ids)
+
+
+def _similarity_changed(instance: Property, created: bool) -> bool:
+    """
+    Whether a save can change any related list: the listing is or was
+    approved, and a field the features are built from changed. Fields not
+    read with the instance count as changed.
+    """
+    approved = Property.ListingStatus.APPROVED
+    loaded = instance._loaded_similarity
+    was_approved = not created and loaded.get("listing_status", approved) == approved
+    if instance.listing_status != approved and not was_approved:
+        return False
+    return created or any(
+        field not in loaded or getattr(instance, field) != loaded[field]
+        for field in Property.SIMILARITY_FIELDS
+    )
+
+
+def property_changed(sender, instance, created=False, update_fields=None, **kwargs):
+    if kwargs.get("raw"):
+        return
+    if update_fields is not None and not set(update_fields) & set(
+        Property.SIMILARITY_FIELDS
+    ):
+        return
+    if _similarity_changed(instance, created):
+        schedule_refresh([instance.pk])
+
+
+def amenities_changed(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if not reverse:
+        if (
+            action in ("post_add", "post_remove", "post_clear")
+            and instance.listing_status == Property.ListingStatus.APPROVED
+        ):
+            schedule_refresh([instance.pk])
+    elif action == "pre_clear":
+        # ``amenity.properties.clear()`` sends no pk_set, so the listings are
+        # read before they are unlinked
+        schedule_refresh(
+            sender.objects.filter(amenity=instance).values_list("property_id", flat=True)
+        )
+    elif action in ("post_add", "post_remove"):
+        schedule_refresh(pk_set or ())
+
+
+def property_deleted(sender, instance, **kwargs):
+    """Lists that pointed at a deleted listing are refilled after the delete"""
+    schedule_refresh(
+        RelatedProperty.objects.filter(related=instance).values_list(
+            "property_id", flat=True
+        )
+    )
@@ -1,10 +1,28 @@
-from apps.users.models import Notification, User
+from apps.users.models import User
 from apps.users.serializers import UserSerializer
+from core.utils.media_upload import (
+    checked_resource,
+    destroy_resources,
+    signed_upload_params,
+    upload_pending_files,
+    verified_resource,
+)
+from core.utils.media_urls import image_variants, resource_url
+from core.utils.notifications import (
+    get_admin_emails,
+    get_admin_recipients,
+    notify,
+    notify_admins,
+)
 from core.utils.send_email import send_email
 from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.db.models import Q
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
+from . import amenity_catalog, pricing
 from .models import (
     Amenity,
     Favorite,
@@ -19,15 +37,20 @@ from .models import (
 class PropertyImageSerializer(serializers.ModelSerializer):
     image = serializers.ImageField(write_only=True)
     image_url = serializers.SerializerMethodField(read_only=True)
+    variants = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = PropertyImage
-        fields = ["id", "image", "image_url", "uploaded_at"]
+        fields = ["id", "image", "image_url", "variants", "uploaded_at"]
 
     def get_image_url(self, obj):
-        if obj.image:
-            return obj.image.url
-        return None
+        return resource_url(obj.image)
+
+    @extend_schema_field(
+        serializers.DictField(child=serializers.CharField(), allow_null=True)
+    )
+    def get_variants(self, obj):
+        return image_variants(obj.image)
 
 
 class PropertyVideoSerializer(serializers.ModelSerializer):
@@ -93,7 +116,9 @@ class PropertyListSerializer(serializers.ModelSerializer):
     listed_by = UserSerializer(read_only=True)
     owner = UserSerializer(read_only=True)
     thumbnail = serializers.SerializerMethodField()
-    amenities = AmenitySerializer(many=True, read_only=True)
+    thumbnail_variants = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
+    amenities = serializers.SerializerMethodField()
 
     class Meta:
         model = Property
@@ -116,6 +141,9 @@ class PropertyListSerializer(serializers.ModelSerializer):
             "location",
             "state",
             "city",
+            "latitude",
+            "longitude",
+            "distance_km",
             "property_status",
             "property_status_display",
             "listing_status",
@@ -127,20 +155,52 @@ class PropertyListSerializer(serializers.ModelSerializer):
             "listed_by",
             "owner",
             "thumbnail",
+            "thumbnail_variants",
             "is_favorited",
             "amenities",
             "is_verified",
         ]
 
+    def _thumbnail_image(self, obj):
+        if not hasattr(obj, "thumbnail_images"):
+            obj.thumbnail_images = list(obj.images.order_by("id")[:1])
+        return obj.thumbnail_images[0].image if obj.thumbnail_images else None
+
     @extend_schema_field(serializers.URLField(allow_null=True))
     def get_thumbnail(self, obj):
-        image = obj.images.first()
-        if image and hasattr(image.image, "url"):
-            return self.context["request"].build_absolute_uri(image.image.url)
-        return None
+        return resource_url(self._thumbnail_image(obj))
+
+    @extend_schema_field(
+        serializers.DictField(child=serializers.CharField(), allow_null=True)
+    )
+    def get_thumbnail_variants(self, obj):
+        return image_variants(self._thumbnail_image(obj))
+
+    @extend_schema_field(AmenitySerializer(many=True))
+    def get_amenities(self, obj):
+        """
+        Read from the amenity mask and the in-process amenity catalog,
+        unless the amenities were prefetched or some have no bit
+        """
+        prefetched = getattr(obj, "_prefetched_objects_cache", {})
+        if "amenities" not in prefetched:
+            # Looked up once per serialization, not per row
+            if not hasattr(self, "_amenity_catalog"):
+                self._amenity_catalog = amenity_catalog.get_catalog()
+            if self._amenity_catalog.complete:
+                return self._amenity_catalog.amenities(obj.amenity_mask)
+        return AmenitySerializer(obj.amenities.all(), many=True).data
+
+    @extend_schema_field(serializers.FloatField(allow_null=True))
+    def get_distance_km(self, obj):
+        """Distance from a ``lat``/``lng`` search, if there was one"""
+        distance = getattr(obj, "distance_km", None)
+        return round(distance, 2) if distance is not None else None
 
     @extend_schema_field(serializers.BooleanField())
     def get_is_favorited(self, obj):
+        if hasattr(obj, "is_favorited"):
+            return bool(obj.is_favorited)
         request = self.context.get("request", None)
         if request and request.user.is_authenticated and request.user.is_client:
             return obj.favorited_by.filter(user=request.user).exists()
@@ -194,6 +254,30 @@ class AmenityListField(serializers.ListField):
         return values
 
 
+def apply_price_breakdown(attrs, breakdown):
+    """
+    Store the computed fees and total in ``attrs``, rejecting a submitted
+    total that does not match to the kobo
+    """
+    submitted_total = attrs.get("total_price")
+    if submitted_total is not None and (
+        pricing.quantize(pricing.to_decimal(submitted_total)) != breakdown.total_price
+    ):
+        raise serializers.ValidationError(
+            {
+                "total_price": f"Total price is not correct. Expected {breakdown.total_price}, got {submitted_total}"
+            }
+        )
+    attrs.update(breakdown.as_floats())
+
+
+def validate_coordinates(latitude, longitude):
+    if (latitude is None) != (longitude is None):
+        raise serializers.ValidationError(
+            {"latitude": "Latitude and longitude must be set together"}
+        )
+
+
 class PropertyCreateSerializer(serializers.ModelSerializer):
     images = serializers.ListField(
         child=serializers.ImageField(),
@@ -248,6 +332,8 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
             "location",
             "state",
             "city",
+            "latitude",
+            "longitude",
             "bedrooms",
             "bathrooms",
             "amenities_ids",
@@ -309,6 +395,8 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
 
         effective_lister_type = owner.user_type if owner else lister_type
 
+        validate_coordinates(attrs.get("latitude"), attrs.get("longitude"))
+
         if service_charge is not None and service_charge < 0:
             raise serializers.ValidationError(
                 {"service_charge": "Service charge cannot be negative"}
@@ -322,12 +410,6 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
                 {"legal_fee": "Legal fee cannot be negative"}
             )
 
-        service_charge_value = (
-            float(service_charge) if service_charge is not None else 0.0
-        )
-        caution_fee_value = float(caution_fee) if caution_fee is not None else 0.0
-        legal_fee_value = float(legal_fee) if legal_fee is not None else 0.0
-
         if listing_type == Property.ListingType.RENT:
             if not all([rent_price, rent_frequency]):
                 raise serializers.ValidationError(
@@ -339,31 +421,6 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     {"rent_price": "Rent price must be positive"}
                 )
-            qaba_fee = round(float(rent_price) * settings.QABA_RENT_PERCENTAGE, 2)
-            agent_commission = 0
-            if effective_lister_type == User.UserType.AGENT:
-                agent_commission = round(
-                    float(rent_price) * settings.AGENT_RENT_COMMISSION_PERCENTAGE, 2
-                )
-            total_price = round(
-                float(rent_price)
-                + qaba_fee
-                + agent_commission
-                + service_charge_value
-                + caution_fee_value
-                + legal_fee_value,
-                2,
-            )
-            submitted_total = attrs.get("total_price")
-            if submitted_total is not None and total_price != submitted_total:
-                raise serializers.ValidationError(
-                    {
-                        "total_price": f"Total price is not correct. Expected {total_price}, got {submitted_total}"
-                    }
-                )
-            attrs["qaba_fee"] = qaba_fee
-            attrs["agent_commission"] = agent_commission
-            attrs["total_price"] = total_price
 
         if listing_type == Property.ListingType.SALE:
             if not sale_price:
@@ -374,31 +431,17 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     {"sale_price": "Sale price must be positive"}
                 )
-            qaba_fee = round(float(sale_price) * settings.QABA_SALE_PERCENTAGE, 2)
-            agent_commission = 0
-            if effective_lister_type == User.UserType.AGENT:
-                agent_commission = round(
-                    float(sale_price) * settings.AGENT_SALE_COMMISSION_PERCENTAGE, 2
-                )
-            total_price = round(
-                float(sale_price)
-                + qaba_fee
-                + agent_commission
-                + service_charge_value
-                + caution_fee_value
-                + legal_fee_value,
-                2,
-            )
-            submitted_total = attrs.get("total_price")
-            if submitted_total is not None and total_price != submitted_total:
-                raise serializers.ValidationError(
-                    {
-                        "total_price": f"Total price is not correct. Expected {total_price}, got {submitted_total}"
-                    }
-                )
-            attrs["qaba_fee"] = qaba_fee
-            attrs["agent_commission"] = agent_commission
-            attrs["total_price"] = total_price
+
+        breakdown = pricing.compute(
+            listing_type,
+            rent_price if listing_type == Property.ListingType.RENT else sale_price,
+            agent_listed=effective_lister_type == User.UserType.AGENT,
+            service_charge=service_charge,
+            caution_fee=caution_fee,
+            legal_fee=legal_fee,
+        )
+        if breakdown:
+            apply_price_breakdown(attrs, breakdown)
 
         documents = attrs.get("documents", [])
         document_types = attrs.get("document_types", [])
@@ -439,37 +482,42 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
         if submit_for_review:
             validated_data["listing_status"] = Property.ListingStatus.PENDING
 
-        property_instance = Property.objects.create(
-            listed_by=request_user,
-            owner=owner
-            or (request_user if request_user.is_agent_or_landlord else None),
-            **validated_data,
-        )
+        media = [PropertyImage(image=image_data) for image_data in images_data[:5]]
+        if video_data:
+            media.append(PropertyVideo(video=video_data))
+        for i, document in enumerate(documents_data):
+            if i < len(document_types):
+                media.append(
+                    PropertyDocument(
+                        document_type=document_types[i],
+                        file=document,
+                        uploaded_by=request_user,
+                    )
+                )
 
-        if amenities_ids:
-            property_instance.amenities.set(amenities_ids)
+        # Push every file to Cloudinary at once before touching the database,
+        # so a failed upload leaves no half-created listing behind, and drop
+        # the uploaded files again if the listing cannot be saved
+        uploaded = upload_pending_files(media)
 
-        if images_data:
-            for image_data in images_data[:5]:
-                PropertyImage.objects.create(
-                    property=property_instance, image=image_data
+        try:
+            with transaction.atomic():
+                property_instance = Property.objects.create(
+                    listed_by=request_user,
+                    owner=owner
+                    or (request_user if request_user.is_agent_or_landlord else None),
+                    **validated_data,
                 )
 
-        if video_data:
-            PropertyVideo.objects.create(property=property_instance, video=video_data)
+                if amenities_ids:
+                    property_instance.amenities.set(amenities_ids)
 
-        for i, document in enumerate(documents_data):
-            if i < len(document_types):
-                PropertyDocument.objects.create(
-                    property=property_instance,
-                    document_type=(
-                        document_types[i]
-                        if i < len(document_types)
-                        else PropertyDocument.DocumentType.OTHER
-                    ),
-                    file=document,
-                    uploaded_by=self.context["request"].user,
-                )
+                for item in media:
+                    item.property = property_instance
+                    item.save()
+        except Exception:
+            destroy_resources(uploaded)
+            raise
 
         if submit_for_review:
             self._send_admin_review_notification_email(property_instance)
@@ -479,53 +527,49 @@ class PropertyCreateSerializer(serializers.ModelSerializer):
 
     def _create_review_notification(self, property_instance):
         """Create notifications for all admin users about new property submission"""
-        admin_users = User.objects.filter(user_type=User.UserType.ADMIN)
+        admin_users = get_admin_recipients()
 
-        if not admin_users.exists():
+        if not admin_users:
             raise serializers.ValidationError({"admin_user": "No admin users found"})
 
-        for admin_user in admin_users:
-            Notification.objects.create(
-                user=admin_user,
-                title="New Property Pending Review",
-                message=f"New property '{property_instance.property_name}' by {property_instance.listed_by.get_full_name()} is pending review.",
-                notification_type="property_review_required",
-                metadata={
-                    "property_id": str(property_instance.id),
-                    "property_name": property_instance.property_name,
-                    "submitted_by": property_instance.listed_by.get_full_name(),
-                    "lister_type": property_instance.listed_by.get_user_type_display(),
-                    "location": property_instance.location,
-                },
-            )
+        notify(
+            admin_users,
+            title="New Property Pending Review",
+            message=f"New property '{property_instance.property_name}' by {property_instance.listed_by.get_full_name()} is pending review.",
+            notification_type="property_review_required",
+            metadata={
+                "property_id": str(property_instance.id),
+                "property_name": property_instance.property_name,
+                "submitted_by": property_instance.listed_by.get_full_name(),
+                "lister_type": property_instance.listed_by.get_user_type_display(),
+                "location": property_instance.location,
+            },
+        )
 
     def _send_admin_review_notification_email(self, property_instance):
-        admin_users = User.objects.filter(user_type=User.UserType.ADMIN)
+        admin_emails = get_admin_emails()
 
-        if admin_users.exists():
-            admin_emails = [user.email for user in admin_users if user.email]
+        if admin_emails:
+            subject = (
+                f"New Property Pending Review: {property_instance.property_name}"
+            )
 
-            if admin_emails:
-                subject = (
-                    f"New Property Pending Review: {property_instance.property_name}"
+            try:
+                send_email(
+                    subject=subject,
+                    recipients=admin_emails,
+                    template_name="admin_property_review_notification",
+                    context={
+                        "property_name": property_instance.property_name,
+                        "location": property_instance.location,
+                        "listed_by": property_instance.listed_by.get_full_name(),
+                    },
+                )
+            except Exception as e:
+                print(f"Error sending email: {e}")
+                raise serializers.ValidationError(
+                    {"email": "Error sending email to admin users"}
                 )
-
-                try:
-                    send_email(
-                        subject=subject,
-                        recipients=admin_emails,
-                        template_name="admin_property_review_notification",
-                        context={
-                            "property_name": property_instance.property_name,
-                            "location": property_instance.location,
-                            "listed_by": property_instance.listed_by.get_full_name(),
-                        },
-                    )
-                except Exception as e:
-                    print(f"Error sending email: {e}")
-                    raise serializers.ValidationError(
-                        {"email": "Error sending email to admin users"}
-                    )
 
 
 class PropertyUpdateSerializer(serializers.ModelSerializer):
@@ -559,6 +603,8 @@ class PropertyUpdateSerializer(serializers.ModelSerializer):
             "location",
             "state",
             "city",
+            "latitude",
+            "longitude",
             "property_status",
             "listing_status",
             "bedrooms",
@@ -599,145 +645,49 @@ class PropertyUpdateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     {"owner_id": "You can only set yourself as the property owner"}
                 )
-        lister_type = (
-            owner_candidate.user_type
-            if owner_candidate
-            else request.user.user_type
-        )
-        service_charge_value = None
-        caution_fee_value = None
-        legal_fee_value = None
-
-        if "service_charge" in attrs:
-            service_charge = attrs["service_charge"]
-            if service_charge is not None and service_charge < 0:
-                raise serializers.ValidationError(
-                    {"service_charge": "Service charge cannot be negative"}
-                )
-            service_charge_value = (
-                float(service_charge) if service_charge is not None else 0.0
-            )
-        else:
-            existing_service = getattr(self.instance, "service_charge", None)
-            service_charge_value = (
-                float(existing_service) if existing_service is not None else 0.0
-            )
-
-        if "caution_fee" in attrs:
-            caution_fee = attrs["caution_fee"]
-            if caution_fee is not None and caution_fee < 0:
+        for field, label in (
+            ("service_charge", "Service charge"),
+            ("caution_fee", "Caution fee"),
+            ("legal_fee", "Legal fee"),
+        ):
+            value = attrs.get(field)
+            if value is not None and value < 0:
                 raise serializers.ValidationError(
-                    {"caution_fee": "Caution fee cannot be negative"}
+                    {field: f"{label} cannot be negative"}
                 )
-            caution_fee_value = float(caution_fee) if caution_fee is not None else 0.0
-        else:
-            existing_caution = getattr(self.instance, "caution_fee", None)
-            caution_fee_value = (
-                float(existing_caution) if existing_caution is not None else 0.0
-            )
 
-        if "legal_fee" in attrs:
-            legal_fee = attrs["legal_fee"]
-            if legal_fee is not None and legal_fee < 0:
-                raise serializers.ValidationError(
-                    {"legal_fee": "Legal fee cannot be negative"}
-                )
-            legal_fee_value = float(legal_fee) if legal_fee is not None else 0.0
-        else:
-            existing_legal = getattr(self.instance, "legal_fee", None)
-            legal_fee_value = (
-                float(existing_legal) if existing_legal is not None else 0.0
-            )
-
-        current_rent_price = (
-            float(rent_price)
-            if rent_price is not None
-            else (
-                float(getattr(self.instance, "rent_price"))
-                if getattr(self.instance, "rent_price", None) is not None
-                else None
-            )
-        )
-        current_sale_price = (
-            float(sale_price)
-            if sale_price is not None
-            else (
-                float(getattr(self.instance, "sale_price"))
-                if getattr(self.instance, "sale_price", None) is not None
-                else None
-            )
-        )
-
-        if listing_type == Property.ListingType.RENT and current_rent_price is not None:
+        if listing_type == Property.ListingType.RENT:
+            price_field = "rent_price"
             if rent_price is not None and rent_price <= 0:
                 raise serializers.ValidationError(
                     {"rent_price": "Rent price must be positive"}
                 )
-            qaba_fee = round(
-                float(current_rent_price) * settings.QABA_RENT_PERCENTAGE, 2
-            )
-            agent_commission = 0
-            if lister_type == User.UserType.AGENT:
-                agent_commission = round(
-                    float(current_rent_price)
-                    * settings.AGENT_RENT_COMMISSION_PERCENTAGE,
-                    2,
-                )
-            total_price = round(
-                float(current_rent_price)
-                + qaba_fee
-                + agent_commission
-                + service_charge_value
-                + caution_fee_value
-                + legal_fee_value,
-                2,
-            )
-            submitted_total = attrs.get("total_price")
-            if submitted_total is not None and total_price != submitted_total:
-                raise serializers.ValidationError(
-                    {
-                        "total_price": f"Total price is not correct. Expected {total_price}, got {submitted_total}"
-                    }
-                )
-            attrs["qaba_fee"] = qaba_fee
-            attrs["agent_commission"] = agent_commission
-            attrs["total_price"] = total_price
-        elif (
-            listing_type == Property.ListingType.SALE and current_sale_price is not None
-        ):
+        else:
+            price_field = "sale_price"
             if sale_price is not None and sale_price <= 0:
                 raise serializers.ValidationError(
                     {"sale_price": "Sale price must be positive"}
                 )
-            qaba_fee = round(
-                float(current_sale_price) * settings.QABA_SALE_PERCENTAGE, 2
-            )
-            agent_commission = 0
-            if lister_type == User.UserType.AGENT:
-                agent_commission = round(
-                    float(current_sale_price)
-                    * settings.AGENT_SALE_COMMISSION_PERCENTAGE,
-                    2,
-                )
-            total_price = round(
-                float(current_sale_price)
-                + qaba_fee
-                + agent_commission
-                + service_charge_value
-                + caution_fee_value
-                + legal_fee_value,
-                2,
-            )
-            submitted_total = attrs.get("total_price")
-            if submitted_total is not None and total_price != submitted_total:
-                raise serializers.ValidationError(
-                    {
-                        "total_price": f"Total price is not correct. Expected {total_price}, got {submitted_total}"
-                    }
-                )
-            attrs["qaba_fee"] = qaba_fee
-            attrs["agent_commission"] = agent_commission
-            attrs["total_price"] = total_price
+
+        def current(field):
+            if field in attrs:
+                return attrs[field]
+            return getattr(self.instance, field, None)
+
+        validate_coordinates(current("latitude"), current("longitude"))
+
+        breakdown = pricing.compute(
+            listing_type,
+            current(price_field),
+            agent_listed=pricing.is_agent_listed(
+                owner_candidate, getattr(self.instance, "listed_by", request.user)
+            ),
+            service_charge=current("service_charge"),
+            caution_fee=current("caution_fee"),
+            legal_fee=current("legal_fee"),
+        )
+        if breakdown:
+            apply_price_breakdown(attrs, breakdown)
         return attrs
 
     def update(self, instance, validated_data):
@@ -794,6 +744,210 @@ class PropertyDocumentUploadSerializer(serializers.ModelSerializer):
         return value
 
 
+MEDIA_UPLOAD_SALT = "properties.media-upload"
+
+# Upload kind -> (model, CloudinaryField name)
+MEDIA_KINDS = {
+    "image": (PropertyImage, "image"),
+    "video": (PropertyVideo, "video"),
+    "document": (PropertyDocument, "file"),
+}
+
+# Upload kind -> (formats, largest file in bytes) a direct upload may have,
+# documents matching the multipart upload rules
+MEDIA_UPLOAD_LIMITS = {
+    "image": (["jpg", "jpeg", "png", "webp"], 10 * 1024 * 1024),
+    "video": (["mp4", "mov", "webm"], 100 * 1024 * 1024),
+    "document": (["pdf", "doc", "docx", "jpg", "jpeg", "png"], 10 * 1024 * 1024),
+}
+
+
+def is_attached(public_id: str) -> bool:
+    """Whether any property media row already stores ``public_id``"""
+    for model, field_name in MEDIA_KINDS.values():
+        stored = (
+            Q(**{field_name: public_id})
+            | Q(**{f"{field_name}__endswith": f"/{public_id}"})
+            | Q(**{f"{field_name}__contains": f"/{public_id}."})
+        )
+        if model.objects.filter(stored).exists():
+            return True
+    return False
+
+
+class MediaUploadSignSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=list(MEDIA_KINDS))
+    count = serializers.IntegerField(min_value=1, max_value=5, default=1)
+
+    def get_uploads(self, property_obj, user):
+        """
+        Signed direct-upload parameters, each with a ticket binding the
+        upload to this property, user and kind for the confirm step
+        """
+        kind = self.validated_data["kind"]
+        model, field_name = MEDIA_KINDS[kind]
+        allowed_formats, max_file_size = MEDIA_UPLOAD_LIMITS[kind]
+        uploads = []
+        for _ in range(self.validated_data["count"]):
+            upload = signed_upload_params(
+                model, field_name, allowed_formats=allowed_formats
+            )
+            upload["max_file_size"] = max_file_size
+            upload["ticket"] = signing.dumps(
+                {
+                    "property": property_obj.pk,
+                    "user": user.pk,
+                    "kind": kind,
+                    "public_id": upload["public_id"],
+                    "resource_type": upload["resource_type"],
+                },
+                salt=MEDIA_UPLOAD_SALT,
+            )
+            uploads.append(upload)
+        return uploads
+
+
+class ConfirmedUploadSerializer(serializers.Serializer):
+    """One finished upload: our ticket plus Cloudinary's upload response"""
+
+    ticket = serializers.CharField()
+    version = serializers.CharField()
+    signature = serializers.CharField()
+    format = serializers.CharField(required=False, allow_blank=True)
+    resource_type = serializers.ChoiceField(
+        choices=["image", "video", "raw"], required=False
+    )
+    document_type = serializers.ChoiceField(
+        choices=PropertyDocument.DocumentType.choices,
+        default=PropertyDocument.DocumentType.OTHER,
+    )
+
+    def validate(self, attrs):
+        try:
+            ticket = signing.loads(
+                attrs["ticket"],
+                salt=MEDIA_UPLOAD_SALT,
+                max_age=settings.MEDIA_UPLOAD_TICKET_MAX_AGE,
+            )
+        except signing.SignatureExpired:
+            raise serializers.ValidationError({"ticket": "Upload ticket has expired"})
+        except signing.BadSignature:
+            raise serializers.ValidationError({"ticket": "Invalid upload ticket"})
+
+        if (
+            ticket["property"] != self.context["property"].pk
+            or ticket["user"] != self.context["request"].user.pk
+        ):
+            raise serializers.ValidationError(
+                {"ticket": "Upload ticket was issued for another property or user"}
+            )
+
+        # "auto" uploads (documents) report their real type in the response
+        resource_type = ticket["resource_type"]
+        if resource_type == "auto":
+            resource_type = attrs.get("resource_type") or "raw"
+
+        try:
+            resource = verified_resource(
+                ticket["public_id"],
+                attrs["version"],
+                attrs["signature"],
+                resource_type,
+                attrs.get("format") or None,
+            )
+        except ValueError:
+            raise serializers.ValidationError(
+                {"signature": "Upload could not be verified with Cloudinary"}
+            )
+        if is_attached(ticket["public_id"]):
+            raise serializers.ValidationError(
+                {"ticket": "This upload has already been attached"}
+            )
+        try:
+            attrs["resource"] = checked_resource(
+                resource, *MEDIA_UPLOAD_LIMITS[ticket["kind"]]
+            )
+        except ValueError as e:
+            raise serializers.ValidationError({"file": str(e)})
+        attrs["kind"] = ticket["kind"]
+        return attrs
+
+
+class MediaUploadConfirmSerializer(serializers.Serializer):
+    uploads = ConfirmedUploadSerializer(many=True, allow_empty=False)
+
+    @staticmethod
+    def reject(uploads, detail):
+        """
+        Delete the verified assets of rejected ``uploads`` that no media row
+        stores, so they are not left orphaned on Cloudinary, then raise
+        """
+        resources = {
+            upload["resource"].public_id: upload["resource"] for upload in uploads
+        }
+        destroy_resources(
+            resource
+            for public_id, resource in resources.items()
+            if not is_attached(public_id)
+        )
+        raise serializers.ValidationError(detail)
+
+    @staticmethod
+    def image_limit_exceeded(property_obj, uploads):
+        kinds = [upload["kind"] for upload in uploads]
+        return property_obj.images.count() + kinds.count("image") > 5
+
+    def validate_uploads(self, uploads):
+        property_obj = self.context["property"]
+        public_ids = [upload["resource"].public_id for upload in uploads]
+        if len(set(public_ids)) != len(public_ids):
+            self.reject(uploads, "Each upload can only be attached once.")
+        if self.image_limit_exceeded(property_obj, uploads):
+            self.reject(uploads, "A property can have at most 5 images.")
+        if [upload["kind"] for upload in uploads].count("video") > 1:
+            self.reject(uploads, "A property can have only one video.")
+        return uploads
+
+    def create(self, validated_data):
+        """Attach the uploaded assets, replacing any existing video"""
+        property_obj = self.context["property"]
+        user = self.context["request"].user
+        created = {"images": [], "video": None, "documents": []}
+
+        uploads = validated_data["uploads"]
+        with transaction.atomic():
+            # Concurrent confirms for the property wait here, then see the
+            # rows the first one attached
+            Property.objects.select_for_update().get(pk=property_obj.pk)
+            if any(is_attached(upload["resource"].public_id) for upload in uploads):
+                self.reject(uploads, {"uploads": "An upload has already been attached"})
+            if self.image_limit_exceeded(property_obj, uploads):
+                self.reject(uploads, {"uploads": "A property can have at most 5 images."})
+            for upload in uploads:
+                resource = upload["resource"]
+                if upload["kind"] == "image":
+                    created["images"].append(
+                        PropertyImage.objects.create(
+                            property=property_obj, image=resource
+                        )
+                    )
+                elif upload["kind"] == "video":
+                    PropertyVideo.objects.filter(property=property_obj).delete()
+                    created["video"] = PropertyVideo.objects.create(
+                        property=property_obj, video=resource
+                    )
+                else:
+                    created["documents"].append(
+                        PropertyDocument.objects.create(
+                            property=property_obj,
+                            document_type=upload["document_type"],
+                            file=resource,
+                            uploaded_by=user,
+                        )
+                    )
+        return created
+
+
 class PropertyReviewSerializer(serializers.ModelSerializer):
     reviewer_name = serializers.CharField(
         source="reviewer.get_full_name", read_only=True
@@ -877,24 +1031,18 @@ class PropertyReviewCreateSerializer(serializers.ModelSerializer):
 
     def _create_review_notification(self, review):
         """Create notifications for admin users about new review submission"""
-        from apps.users.models import Notification, User
-
-        admin_users = User.objects.filter(user_type=User.UserType.ADMIN)
-
-        for admin_user in admin_users:
-            Notification.objects.create(
-                user=admin_user,
-                title="New Property Review Pending Approval",
-                message=f"New review for '{review.reviewed_property.property_name}' by {review.reviewer.get_full_name()} is pending approval.",
-                notification_type="review_approval_required",
-                metadata={
-                    "review_id": str(review.id),
-                    "property_id": str(review.reviewed_property.id),
-                    "property_name": review.reviewed_property.property_name,
-                    "reviewer_name": review.reviewer.get_full_name(),
-                    "rating": review.rating,
-                },
-            )
+        notify_admins(
+            title="New Property Review Pending Approval",
+            message=f"New review for '{review.reviewed_property.property_name}' by {review.reviewer.get_full_name()} is pending approval.",
+            notification_type="review_approval_required",
+            metadata={
+                "review_id": str(review.id),
+                "property_id": str(review.reviewed_property.id),
+                "property_name": review.reviewed_property.property_name,
+                "reviewer_name": review.reviewer.get_full_name(),
+                "rating": review.rating,
+            },
+        )
 
 
 class PropertyDetailSerializer(PropertyListSerializer):
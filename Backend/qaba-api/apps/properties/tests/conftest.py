@@ -1,3 +1,4 @@
+import cloudinary
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
 
@@ -24,7 +25,15 @@ def stub_cloudinary_upload(monkeypatch):
             return value.name
         return value or "mock-file"
 
-    monkeypatch.setattr("cloudinary.uploader.upload_resource", _fake_upload)
+    def _fake_upload_resource(*args, **kwargs):
+        return cloudinary.CloudinaryResource(
+            "mock-id",
+            version="1",
+            type=kwargs.get("type", "upload"),
+            resource_type=kwargs.get("resource_type", "image"),
+        )
+
+    monkeypatch.setattr("cloudinary.uploader.upload_resource", _fake_upload_resource)
     monkeypatch.setattr("cloudinary.uploader.upload", _fake_upload)
     monkeypatch.setattr("cloudinary.models.CloudinaryField.pre_save", _fake_pre_save, raising=False)
     monkeypatch.setattr(
@@ -35,6 +44,15 @@ def stub_cloudinary_upload(monkeypatch):
     return _fake_upload
 
 
+@pytest.fixture(autouse=True)
+def cloudinary_cloud_name(monkeypatch):
+    """Configure a cloud name so delivery URLs can be built."""
+    import cloudinary
+
+    monkeypatch.setattr(cloudinary.config(), "cloud_name", "test", raising=False)
+    return "test"
+
+
 @pytest.fixture
 def amenity(db):
     """Create a default amenity for properties."""
@@ -59,13 +77,10 @@ def create_property(db, agent_user, amenity):
             "property_status": Property.PropertyStatus.AVAILABLE,
             "listed_by": agent_user,
         }
+        amenities = kwargs.pop("amenities", [amenity])
         defaults.update(kwargs)
         property_obj = Property.objects.create(**defaults)
-
-        if "amenities" in kwargs:
-            property_obj.amenities.set(kwargs["amenities"])
-        else:
-            property_obj.amenities.add(amenity)
+        property_obj.amenities.set(amenities)
 
         return property_obj
 
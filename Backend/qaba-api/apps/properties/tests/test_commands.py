@@ -0,0 +1,197 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from apps.properties.models import (
+    AgentMonthlyAnalytics,
+    Property,
+    PropertyReview,
+    RelatedProperty,
+    RelatedPropertyRefresh,
+)
+from core.utils.cache import get_version
+
+
+@pytest.mark.django_db
+def test_benchmark_property_queries_reports_plans_and_rolls_back():
+    """The benchmark prints plans for each query and leaves no data behind."""
+    out = StringIO()
+
+    call_command("benchmark_property_queries", count=50, batch_size=20, stdout=out)
+
+    output = out.getvalue()
+    assert "Seeded 50 properties" in output
+    assert "== public listing" in output
+    assert "== lister type" in output
+    assert "-- without indexes (" in output
+    assert "-- with indexes (" in output
+    assert Property.objects.count() == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="query plans need PostgreSQL"
+)
+def test_benchmark_property_queries_uses_listing_indexes_on_seeded_table():
+    """With enough rows the planner serves the filtered listings from their indexes."""
+    out = StringIO()
+
+    call_command(
+        "benchmark_property_queries", count=20_000, batch_size=5_000, stdout=out
+    )
+
+    sections = {
+        section.split("\n", 1)[0]: section
+        for section in out.getvalue().split("== ")[1:]
+    }
+    # The unfiltered public listing matches most of the seed, so a sequential
+    # scan stays the cheaper plan there
+    expected = {
+        "state + city": "property_state_city_idx",
+        "city": "property_city_idx",
+        "property type": "property_type_idx",
+        "sale price range": "property_sale_price_idx",
+        "rent price range": "property_rent_price_idx",
+    }
+    for label, index in expected.items():
+        without_indexes, with_indexes = sections[label].split("-- with indexes")
+        assert index not in without_indexes
+        assert index in with_indexes
+    assert Property.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_benchmark_media_urls_matches_sdk_and_rolls_back():
+    """The URL builder serializes the same payload as the SDK path."""
+    out, err = StringIO(), StringIO()
+
+    call_command("benchmark_media_urls", count=20, repeat=1, stdout=out, stderr=err)
+
+    output = out.getvalue()
+    assert "Serialized 20 properties" in output
+    assert "SDK URLs:" in output and "URL builder (warm cache):" in output
+    assert err.getvalue() == ""
+    assert Property.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_benchmark_slug_generation_reports_and_rolls_back():
+    """Slug allocation stays at one query however many names are taken."""
+    out = StringIO()
+
+    call_command("benchmark_slug_generation", count=30, name="Flat", stdout=out)
+
+    output = out.getvalue()
+    assert "Saved 30 properties named 'Flat'" in output
+    assert "next slug via prefix query: flat-30 (1 queries" in output
+    assert "next slug via exists() loop: flat-30 (31 queries" in output
+    assert Property.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_rating_summary_repairs_drift(create_property, create_user):
+    property_obj = create_property()
+    for rating in (5, 4):
+        PropertyReview.objects.create(
+            reviewed_property=property_obj,
+            reviewer=create_user(f"rater{rating}@test.com"),
+            rating=rating,
+            comment="Review",
+            status=PropertyReview.ReviewStatus.APPROVED,
+        )
+    Property.objects.filter(pk=property_obj.pk).update(
+        rating_count=0, rating_average=0, rating_5_count=3
+    )
+    out = StringIO()
+
+    call_command("rebuild_rating_summary", stdout=out)
+
+    property_obj.refresh_from_db()
+    assert "Rebuilt rating summary for 1 properties" in out.getvalue()
+    assert property_obj.total_reviews == 2
+    assert property_obj.average_rating == 4.5
+    assert property_obj.rating_breakdown["5_star"] == 1
+    assert property_obj.rating_breakdown["4_star"] == 1
+
+
+@pytest.mark.django_db
+def test_rebuild_agent_analytics_creates_monthly_rollups(
+    agent_user, create_property
+):
+    create_property(property_status=Property.PropertyStatus.SOLD, sale_price=1000)
+    create_property(property_name="Second")
+
+    call_command("rebuild_agent_analytics", stdout=StringIO())
+
+    rollup = AgentMonthlyAnalytics.objects.get(agent=agent_user)
+    assert rollup.total_properties == 2
+    assert rollup.sold_properties == 1
+    assert rollup.sold_revenue == 1000
+    assert rollup.month.day == 1
+
+
+@pytest.mark.django_db
+def test_recompute_property_prices_after_rate_change(
+    settings, create_property, landlord_user, django_capture_on_commit_callbacks
+):
+    settings.AGENT_SALE_COMMISSION_PERCENTAGE = 0.05
+    settings.QABA_RENT_PERCENTAGE = 0.02
+    agent_sale = create_property(sale_price=100000, total_price=110000)
+    landlord_sale = create_property(
+        listed_by=landlord_user,
+        sale_price=100000,
+        qaba_fee=0,
+        agent_commission=0,
+        total_price=100000,
+    )
+    agent_rent = create_property(
+        listing_type=Property.ListingType.RENT,
+        rent_price=50000.5,
+        caution_fee=1000,
+        total_price=55000.55,
+    )
+
+    RelatedPropertyRefresh.objects.all().delete()
+    versions = (get_version("properties"), get_version("price-stats"))
+
+    out = StringIO()
+    call_command("recompute_property_prices", "--dry-run", stdout=out)
+    assert "Would reprice 2 properties" in out.getvalue()
+    agent_sale.refresh_from_db()
+    assert agent_sale.total_price == 110000
+    assert (get_version("properties"), get_version("price-stats")) == versions
+    assert not RelatedPropertyRefresh.objects.exists()
+
+    out = StringIO()
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("recompute_property_prices", "--batch-size", "1", stdout=out)
+
+    assert "Repriced 2 properties" in out.getvalue()
+    assert get_version("properties") > versions[0]
+    assert get_version("price-stats") > versions[1]
+    assert set(
+        RelatedPropertyRefresh.objects.values_list("property_id", flat=True)
+    ) == {agent_sale.pk, agent_rent.pk}
+    prices = {
+        p.pk: (p.qaba_fee, p.agent_commission, p.total_price)
+        for p in Property.objects.all()
+    }
+    assert prices[agent_sale.pk] == (0, 5000, 105000)
+    assert prices[landlord_sale.pk] == (0, 0, 100000)
+    # 50000.5 + 2% (1000.01) + 10% (5000.05) + 1000 caution fee
+    assert prices[agent_rent.pk] == (1000.01, 5000.05, 57000.56)
+
+
+@pytest.mark.django_db
+def test_rebuild_related_properties_stores_top_k(create_property):
+    """Each approved listing gets up to --top-k related listings."""
+    for city in ("Lekki", "Lekki", "Ikeja", "Abuja"):
+        create_property(property_name=f"{city} Home", city=city)
+    out = StringIO()
+
+    call_command("rebuild_related_properties", top_k=2, stdout=out)
+
+    assert "Stored 8 related listings" in out.getvalue()
+    assert RelatedProperty.objects.count() == 8
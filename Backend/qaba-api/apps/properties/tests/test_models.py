@@ -0,0 +1,450 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import pytest
+from django.contrib import admin
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import RequestFactory
+
+from apps.properties import recommender
+from apps.properties.admin import PropertyAdmin, PropertyReviewAdmin
+from apps.properties.models import (
+    AgentMonthlyAnalytics,
+    Property,
+    PropertyReview,
+    RelatedProperty,
+    RelatedPropertyRefresh,
+    RetiredAmenityBit,
+)
+from core.utils.cache import get_version
+
+
+@pytest.fixture
+def create_review(create_user):
+    """Factory to create a review from a fresh client on the given property."""
+    counter = {"n": 0}
+
+    def _create_review(property_obj, rating, status=PropertyReview.ReviewStatus.PENDING):
+        counter["n"] += 1
+        reviewer = create_user(f"reviewer{counter['n']}@test.com", user_type="CLIENT")
+        return PropertyReview.objects.create(
+            reviewed_property=property_obj,
+            reviewer=reviewer,
+            rating=rating,
+            comment="Review",
+            status=status,
+        )
+
+    return _create_review
+
+
+def summary(property_obj):
+    property_obj = Property.objects.get(pk=property_obj.pk)
+    return (
+        property_obj.total_reviews,
+        property_obj.average_rating,
+        property_obj.rating_breakdown,
+    )
+
+
+@pytest.mark.django_db
+def test_rating_summary_follows_review_approve_reject_and_delete(
+    create_property, create_review
+):
+    property_obj = create_property()
+    five = create_review(property_obj, 5, PropertyReview.ReviewStatus.APPROVED)
+    two = create_review(property_obj, 2)
+
+    assert summary(property_obj)[:2] == (1, 5.0)
+
+    two.status = PropertyReview.ReviewStatus.APPROVED
+    two.save()
+    count, average, breakdown = summary(property_obj)
+    assert (count, average) == (2, 3.5)
+    assert breakdown == {"1_star": 0, "2_star": 1, "3_star": 0, "4_star": 0, "5_star": 1}
+
+    five = PropertyReview.objects.get(pk=five.pk)
+    five.status = PropertyReview.ReviewStatus.REJECTED
+    five.save()
+    assert summary(property_obj)[:2] == (1, 2.0)
+
+    PropertyReview.objects.filter(pk=two.pk).delete()
+    count, average, breakdown = summary(property_obj)
+    assert (count, average) == (0, 0)
+    assert set(breakdown.values()) == {0}
+
+
+@pytest.mark.django_db
+def test_property_save_does_not_overwrite_rating_summary(
+    create_property, create_review
+):
+    property_obj = create_property()
+    stale = Property.objects.get(pk=property_obj.pk)
+    create_review(property_obj, 4, PropertyReview.ReviewStatus.APPROVED)
+
+    stale.property_name = "Renamed"
+    stale.save()
+
+    assert summary(property_obj)[:2] == (1, 4.0)
+
+
+@pytest.mark.django_db
+def test_property_save_writes_summary_only_when_named(create_property):
+    property_obj = create_property()
+    property_obj.rating_count = 3
+    property_obj.save()
+    assert Property.objects.get(pk=property_obj.pk).rating_count == 0
+
+    property_obj.save(update_fields=["rating_count"])
+    assert Property.objects.get(pk=property_obj.pk).rating_count == 3
+
+
+@pytest.mark.django_db
+def test_property_save_does_not_load_deferred_fields(create_property):
+    create_property(description="Long description")
+    property_obj = Property.objects.defer("description").get()
+
+    property_obj.property_name = "Renamed"
+    property_obj.save()
+
+    assert "description" in property_obj.get_deferred_fields()
+    assert Property.objects.get().property_name == "Renamed"
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="row locking needs PostgreSQL"
+)
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_approvals_of_one_review_count_once(create_property, create_review):
+    property_obj = create_property()
+    review = create_review(property_obj, 4)
+    barrier = threading.Barrier(4)
+
+    def approve():
+        stale = PropertyReview.objects.get(pk=review.pk)
+        barrier.wait()
+        try:
+            stale.status = PropertyReview.ReviewStatus.APPROVED
+            stale.save()
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda _: approve(), range(4)))
+
+    assert summary(property_obj)[:2] == (1, 4.0)
+
+
+@pytest.mark.django_db
+def test_bulk_approve_action_updates_rating_summary(
+    mocker, admin_user, create_property, create_review
+):
+    first = create_property(property_name="First")
+    second = create_property(property_name="Second")
+    create_review(first, 4)
+    create_review(first, 2)
+    create_review(second, 5)
+    create_review(second, 1, PropertyReview.ReviewStatus.REJECTED)
+
+    model_admin = PropertyReviewAdmin(PropertyReview, admin.site)
+    mocker.patch.object(model_admin, "message_user")
+    request = RequestFactory().post("/")
+    request.user = admin_user
+
+    model_admin.approve_reviews(request, PropertyReview.objects.all())
+
+    assert summary(first)[:2] == (2, 3.0)
+    assert summary(second)[:2] == (1, 5.0)
+    assert PropertyReview.objects.filter(
+        status=PropertyReview.ReviewStatus.APPROVED, approved_by=admin_user
+    ).count() == 3
+
+
+@pytest.mark.django_db
+def test_bulk_status_actions_invalidate_cached_listings(
+    mocker, admin_user, create_property, create_review, django_capture_on_commit_callbacks
+):
+    property_obj = create_property()
+    create_review(property_obj, 4)
+    versions = {name: get_version(name) for name in ("properties", "price-stats")}
+
+    model_admin = PropertyAdmin(Property, admin.site)
+    mocker.patch.object(model_admin, "message_user")
+    request = RequestFactory().post("/")
+    request.user = admin_user
+    with django_capture_on_commit_callbacks(execute=True):
+        model_admin.mark_as_sold(request, Property.objects.all())
+
+    assert Property.objects.get().property_status == Property.PropertyStatus.SOLD
+    for name, version in versions.items():
+        assert get_version(name) > version
+
+    review_admin = PropertyReviewAdmin(PropertyReview, admin.site)
+    mocker.patch.object(review_admin, "message_user")
+    version = get_version("properties")
+    with django_capture_on_commit_callbacks(execute=True):
+        review_admin.approve_reviews(request, PropertyReview.objects.all())
+    assert get_version("properties") > version
+
+
+@pytest.mark.django_db
+def test_analytics_rollup_follows_bulk_status_actions_and_lister_changes(
+    settings, mocker, admin_user, agent_user, create_user, create_property
+):
+    settings.AGENT_ANALYTICS_ROLLUP = True
+    property_obj = create_property(sale_price=1000)
+
+    model_admin = PropertyAdmin(Property, admin.site)
+    mocker.patch.object(model_admin, "message_user")
+    request = RequestFactory().post("/")
+    request.user = admin_user
+    model_admin.mark_as_sold(request, Property.objects.all())
+
+    rollup = AgentMonthlyAnalytics.objects.get(agent=agent_user)
+    assert (rollup.sold_properties, rollup.sold_revenue) == (1, 1000)
+
+    other_agent = create_user("other-agent@test.com", user_type="AGENT")
+    property_obj = Property.objects.get(pk=property_obj.pk)
+    property_obj.listed_by = other_agent
+    property_obj.save()
+
+    assert not AgentMonthlyAnalytics.objects.filter(agent=agent_user).exists()
+    assert AgentMonthlyAnalytics.objects.get(agent=other_agent).sold_properties == 1
+
+
+@pytest.mark.django_db
+def test_property_slug_and_id_allocation_uses_one_query(create_property):
+    """Same-named properties get the next suffix from a single prefix query."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    first = create_property(property_name="Garden Flat")
+    second = create_property(property_name="Garden Flat")
+    create_property(property_name="Garden Flat Annex")
+    Property.objects.filter(pk=second.pk).update(slug="garden-flat-7")
+
+    with CaptureQueriesContext(connection) as queries:
+        third = create_property(property_name="Garden Flat")
+
+    assert (first.slug, third.slug) == ("garden-flat", "garden-flat-8")
+    assert third.property_id.startswith("PROP-GARDEN-FLAT-")
+    selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+    assert len([sql for sql in selects if '"slug"' in sql]) == 1
+    assert not [
+        sql for sql in selects if '"properties_property"."property_id" =' in sql
+    ]
+
+
+@pytest.mark.django_db
+def test_property_save_retries_slug_taken_concurrently(create_property, mocker):
+    """A slug grabbed between allocation and INSERT is reallocated."""
+    create_property(property_name="Race Villa")
+    stale = mocker.patch(
+        "apps.properties.models.unique_slug",
+        side_effect=["race-villa", "race-villa-1"],
+    )
+
+    property_obj = create_property(property_name="Race Villa")
+
+    assert property_obj.slug == "race-villa-1"
+    assert stale.call_count == 2
+
+
+@pytest.mark.django_db
+def test_property_save_retries_property_id_collision(create_property, mocker):
+    """A random property ID that is already taken is drawn again."""
+    taken = create_property(property_name="Twin House")
+    mocker.patch.object(
+        Property,
+        "_generate_property_id",
+        side_effect=[taken.property_id, "PROP-TWIN-HOUSE-ABCDEF12"],
+    )
+
+    property_obj = create_property(property_name="Twin House")
+
+    assert property_obj.property_id == "PROP-TWIN-HOUSE-ABCDEF12"
+
+
+def related_names(property_obj):
+    return [
+        link.related.property_name
+        for link in RelatedProperty.objects.filter(property=property_obj)
+        .select_related("related")
+        .order_by("rank")
+    ]
+
+
+@pytest.mark.django_db
+def test_recommender_ranks_similar_available_listings(create_property):
+    """Same city, type and price band rank first; sold listings are skipped."""
+    main = create_property(property_name="Lekki Duplex", city="Lekki", state="Lagos")
+    create_property(
+        property_name="Lekki Twin", city="Lekki", state="Lagos", sale_price=160000
+    )
+    create_property(
+        property_name="Ikeja House", city="Ikeja", state="Lagos", sale_price=140000
+    )
+    create_property(
+        property_name="Abuja Mansion", city="Abuja", state="FCT", sale_price=9000000
+    )
+    create_property(
+        property_name="Sold Lekki",
+        city="Lekki",
+        state="Lagos",
+        property_status=Property.PropertyStatus.SOLD,
+    )
+
+    recommender.rebuild(k=3)
+
+    assert related_names(main) == ["Lekki Twin", "Ikeja House", "Abuja Mansion"]
+    sold = Property.objects.get(property_name="Sold Lekki")
+    assert related_names(sold)[0] == "Lekki Duplex"
+
+
+@pytest.mark.django_db
+def test_recommender_refreshes_affected_lists_from_the_queue(create_property, settings):
+    """Saving a listing queues its own list and the lists it now belongs in."""
+    settings.RELATED_PROPERTIES_TOP_K = 1
+    main = create_property(property_name="Yaba Flat", city="Yaba", state="Lagos")
+    create_property(property_name="Abuja Flat", city="Abuja", state="FCT")
+    recommender.rebuild()
+    RelatedPropertyRefresh.objects.all().delete()
+    assert related_names(main) == ["Abuja Flat"]
+
+    newcomer = create_property(property_name="Yaba Studio", city="Yaba", state="Lagos")
+    assert related_names(main) == ["Abuja Flat"]
+
+    assert recommender.process_pending() == 1
+    assert related_names(main) == ["Yaba Studio"]
+    assert related_names(newcomer) == ["Yaba Flat"]
+    assert not RelatedPropertyRefresh.objects.exists()
+
+    newcomer.delete()
+    call_command("refresh_related_properties", once=True, stdout=StringIO())
+
+    assert related_names(main) == ["Abuja Flat"]
+
+
+@pytest.mark.django_db
+def test_recommender_queues_only_feature_changes_of_approved_listings(
+    create_property, landlord_user
+):
+    def queued():
+        ids = set(RelatedPropertyRefresh.objects.values_list("property_id", flat=True))
+        RelatedPropertyRefresh.objects.all().delete()
+        return ids
+
+    draft = create_property(listing_status=Property.ListingStatus.PENDING)
+    listing = create_property(property_name="Listed")
+    assert queued() == {listing.pk}
+
+    draft.city = "Ikeja"
+    draft.save()
+    listing.owner = landlord_user
+    listing.save(update_fields=["owner"])
+    listing = Property.objects.get(pk=listing.pk)
+    listing.description = "New description"
+    listing.save()
+    assert queued() == set()
+
+    listing.bedrooms = 5
+    listing.save()
+    draft.listing_status = Property.ListingStatus.APPROVED
+    draft.save()
+    assert queued() == {listing.pk, draft.pk}
+
+    listing.listing_status = Property.ListingStatus.DECLINED
+    listing.save()
+    assert queued() == {listing.pk}
+
+    with pytest.raises(RuntimeError), transaction.atomic():
+        listing.listing_status = Property.ListingStatus.APPROVED
+        listing.save()
+        raise RuntimeError
+    assert queued() == set()
+
+
+@pytest.mark.django_db
+def test_recommender_queues_amenity_changes_from_either_side(create_property):
+    from apps.properties.models import Amenity
+
+    def queued():
+        ids = set(RelatedPropertyRefresh.objects.values_list("property_id", flat=True))
+        RelatedPropertyRefresh.objects.all().delete()
+        return ids
+
+    first = create_property(property_name="First")
+    second = create_property(property_name="Second")
+    gym = Amenity.objects.create(name="Gym")
+    RelatedPropertyRefresh.objects.all().delete()
+
+    first.amenities.add(gym)
+    assert queued() == {first.pk}
+
+    gym.properties.add(second)
+    assert queued() == {second.pk}
+
+    gym.properties.clear()
+    assert queued() == {first.pk, second.pk}
+
+
+@pytest.mark.django_db
+def test_property_lister_types_follow_lister_owner_and_user_type(
+    create_property, create_user, agent_user
+):
+    """listed_by_type and owner_type follow the users and their types."""
+    landlord = create_user("lister-landlord@test.com", user_type="LANDLORD")
+    property_obj = create_property()
+    assert (property_obj.listed_by_type, property_obj.owner_type) == ("AGENT", "")
+
+    def stored_types():
+        return Property.objects.values_list("listed_by_type", "owner_type").get(
+            pk=property_obj.pk
+        )
+
+    property_obj.owner = landlord
+    property_obj.save(update_fields=["owner"])
+    assert stored_types() == ("AGENT", "LANDLORD")
+
+    landlord.user_type = "AGENT"
+    landlord.save()
+    assert stored_types() == ("AGENT", "AGENT")
+
+    agent_user.user_type = "LANDLORD"
+    agent_user.save(update_fields=["user_type"])
+    assert stored_types() == ("LANDLORD", "AGENT")
+
+    landlord.delete()
+    assert stored_types() == ("LANDLORD", "")
+
+
+@pytest.mark.django_db
+def test_amenity_mask_follows_amenity_changes(create_property, amenity):
+    """Every way of changing amenities keeps the property's bitmask in step."""
+    from apps.properties.models import Amenity
+
+    gym = Amenity.objects.create(name="Gym")
+    wifi = Amenity.objects.create(name="Wifi")
+    pool_bit, gym_bit, wifi_bit = (1 << a.bit for a in (amenity, gym, wifi))
+    property_obj = create_property(amenities=[amenity, gym])
+
+    def mask():
+        return Property.objects.get(pk=property_obj.pk).amenity_mask
+
+    assert mask() == pool_bit | gym_bit
+    property_obj.amenities.remove(amenity)
+    assert mask() == gym_bit
+    wifi.properties.add(property_obj)
+    assert mask() == gym_bit | wifi_bit
+    wifi.properties.clear()
+    assert mask() == gym_bit
+
+    retired = gym.bit
+    gym.delete()
+    assert mask() == 0
+    sauna = Amenity.objects.create(name="Sauna")
+    assert sauna.bit is not None
+    assert sauna.bit not in (retired, amenity.bit, wifi.bit)
+    assert RetiredAmenityBit.objects.filter(bit=retired).exists()
@@ -1,10 +1,17 @@
 from datetime import datetime
+import io
+import threading
+import time
 import uuid
 
+import cloudinary
 import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from PIL import Image
 from rest_framework import status
 
-from apps.properties.models import Favorite, Property, PropertyReview
+from apps.properties.models import Favorite, Property, PropertyDocument, PropertyReview
 from apps.users.models import Notification
 
 
@@ -383,6 +390,12 @@ def test_property_list_filters_by_lister_and_total(
         listed_by=landlord,
         total_price=150000,
     )
+    create_property(
+        property_name="Landlord Owned",
+        listed_by=agent,
+        owner=landlord,
+        total_price=100000,
+    )
 
     response = api_client.get("/api/v1/properties/?lister_type=AGENT&min_total=200000")
 
@@ -390,6 +403,27 @@ def test_property_list_filters_by_lister_and_total(
     names = {prop["property_name"] for prop in response.data["data"]}
     assert names == {"Agent Listing"}
 
+    response = api_client.get("/api/v1/properties/?lister_type=LANDLORD")
+    names = {prop["property_name"] for prop in response.data["data"]}
+    assert names == {"Landlord Listing", "Landlord Owned"}
+
+
+@pytest.mark.django_db
+def test_property_list_city_filter_keeps_quoted_commas(api_client, create_property):
+    """Quoted place names keep their commas, unquoted values are still split."""
+    create_property(property_name="GRA", city="Ikeja, GRA")
+    create_property(property_name="Lekki", city="Lekki")
+    create_property(property_name="Ikeja", city="Ikeja")
+
+    def names(query):
+        response = api_client.get(f"/api/v1/properties/?{query}")
+        assert response.status_code == status.HTTP_200_OK
+        return {prop["property_name"] for prop in response.data["data"]}
+
+    assert names('city="Ikeja, GRA",Lekki') == {"GRA", "Lekki"}
+    assert names("city=Ikeja, GRA") == {"Ikeja"}
+    assert names("city=Lekki&city=Ikeja") == {"Lekki", "Ikeja"}
+
 
 @pytest.mark.django_db
 def test_property_detail_lookup_by_id(api_client, create_property):
@@ -568,3 +602,1096 @@ def test_agent_property_analytics_invalid_year(auth_client, agent_user):
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert response.data["success"] is False
+
+
+@pytest.mark.django_db
+def test_property_list_query_count_is_constant(
+    auth_client, client_user, create_property, create_user
+):
+    """Listing should not issue extra queries per property on the page."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from apps.properties.models import PropertyImage
+
+    landlord = create_user("owner@test.com", user_type="LANDLORD")
+
+    def _seed(count):
+        for index in range(count):
+            property_obj = create_property(
+                property_name=f"Listing {index}", owner=landlord
+            )
+            PropertyImage.objects.create(property=property_obj, image="mock-image")
+            Favorite.objects.create(user=client_user, property=property_obj)
+
+    client = auth_client(client_user)
+
+    _seed(2)
+    # Loads the in-process amenity catalog once
+    client.get("/api/v1/properties/")
+    with CaptureQueriesContext(connection) as small_page:
+        response = client.get("/api/v1/properties/")
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["data"]) == 2
+
+    _seed(8)
+    with CaptureQueriesContext(connection) as large_page:
+        response = client.get("/api/v1/properties/")
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["data"]) == 10
+    assert all(prop["is_favorited"] for prop in response.data["data"])
+    assert all(prop["thumbnail"] for prop in response.data["data"])
+
+    assert len(large_page.captured_queries) == len(small_page.captured_queries)
+
+
+@pytest.mark.django_db
+def test_property_list_is_paginated_within_envelope(api_client, create_property):
+    """Listings are always paginated and keep results under ``data``."""
+    for index in range(5):
+        create_property(property_name=f"Paged {index}")
+
+    response = api_client.get("/api/v1/properties/?page_size=2&page=2")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["success"] is True
+    assert len(response.data["data"]) == 2
+    pagination = response.data["pagination"]
+    assert pagination["count"] == 5
+    assert pagination["page"] == 2
+    assert pagination["total_pages"] == 3
+    assert pagination["next"] is not None
+    assert pagination["previous"] is not None
+
+
+@pytest.mark.django_db
+def test_property_list_cursor_pagination_walks_all_pages(
+    api_client, create_property
+):
+    """Keyset pagination should visit every listing once, newest first."""
+    created = [create_property(property_name=f"Cursor {index}") for index in range(5)]
+    # Force a tie on listed_date so the id tie-breaker is exercised
+    Property.objects.filter(id__in=[created[1].id, created[2].id]).update(
+        listed_date=created[1].listed_date
+    )
+
+    seen = []
+    url = "/api/v1/properties/?pagination=cursor&page_size=2"
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["pagination"]["mode"] == "cursor"
+        seen.extend(prop["id"] for prop in response.data["data"])
+        url = response.data["pagination"]["next"]
+
+    expected = list(
+        Property.objects.order_by("-listed_date", "id").values_list("id", flat=True)
+    )
+    assert seen == expected
+
+
+@pytest.mark.django_db
+def test_property_list_rejects_invalid_cursor(api_client, create_property):
+    create_property()
+
+    response = api_client.get("/api/v1/properties/?pagination=cursor&cursor=bogus")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_property_search_matches_name_location_and_description(
+    api_client, create_property
+):
+    lekki = create_property(property_name="Ocean View Duplex", city="Lekki")
+    garden = create_property(
+        property_name="Quiet Flat", description="Large garden with mango trees"
+    )
+    create_property(property_name="Unrelated Listing")
+
+    by_city = api_client.get("/api/v1/properties/?search=Lekki")
+    by_description = api_client.get("/api/v1/properties/?search=garden")
+
+    assert [prop["id"] for prop in by_city.data["data"]] == [lekki.id]
+    assert [prop["id"] for prop in by_description.data["data"]] == [garden.id]
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="full-text ranking needs PostgreSQL"
+)
+def test_property_search_ranks_name_above_location_and_description(
+    api_client, create_property
+):
+    """Matches in the name outrank the location, which outranks the description."""
+    in_description = create_property(
+        property_name="Quiet Flat", description="Walking distance to Yaba market"
+    )
+    in_location = create_property(property_name="Cosy Flat", location="12 Yaba Road")
+    in_name = create_property(property_name="Yaba Terrace")
+
+    response = api_client.get("/api/v1/properties/?search=yaba")
+
+    assert [prop["id"] for prop in response.data["data"]] == [
+        in_name.id,
+        in_location.id,
+        in_description.id,
+    ]
+
+
+@pytest.mark.django_db
+def test_property_search_matches_misspelled_city(api_client, create_property):
+    from apps.properties.filters import trigram_enabled
+
+    if connection.vendor != "postgresql" or not trigram_enabled(connection.alias):
+        pytest.skip("fuzzy city matching needs PostgreSQL with pg_trgm")
+
+    ibadan = create_property(city="Ibadan")
+    create_property(city="Enugu")
+
+    response = api_client.get("/api/v1/properties/?search=Ibadn")
+
+    assert [prop["id"] for prop in response.data["data"]] == [ibadan.id]
+
+
+@pytest.mark.django_db
+def test_agent_property_analytics_uses_one_aggregate_query(
+    auth_client, agent_user, create_property
+):
+    """Analytics aggregate in a single grouped query, not one per period."""
+    from django.test.utils import CaptureQueriesContext
+
+    create_property(property_status=Property.PropertyStatus.SOLD)
+    client = auth_client(agent_user)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get("/api/v1/analytics/agent/?period_type=monthly")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["data"]) == 13
+    property_queries = [
+        query
+        for query in queries.captured_queries
+        if "properties_property" in query["sql"]
+    ]
+    assert len(property_queries) == 1
+
+
+@pytest.mark.django_db
+def test_agent_property_analytics_rollup_matches_live_aggregation(
+    settings, auth_client, agent_user, create_property
+):
+    settings.AGENT_ANALYTICS_ROLLUP = True
+    sold = create_property(property_name="Sold Home", sale_price=200000)
+    create_property(
+        property_name="Rented Flat",
+        listing_type=Property.ListingType.RENT,
+        property_status=Property.PropertyStatus.RENTED,
+        rent_price=1500,
+    )
+    create_property(
+        property_name="Draft", listing_status=Property.ListingStatus.PENDING
+    )
+    sold.property_status = Property.PropertyStatus.SOLD
+    sold.save()
+    client = auth_client(agent_user)
+
+    for period_type in ("monthly", "yearly"):
+        url = f"/api/v1/analytics/agent/?period_type={period_type}"
+        from_rollup = client.get(url).data["data"]
+        settings.AGENT_ANALYTICS_ROLLUP = False
+        live = client.get(url).data["data"]
+        settings.AGENT_ANALYTICS_ROLLUP = True
+
+        assert from_rollup == live
+        assert from_rollup[-1]["sold_properties"] == 1
+        assert from_rollup[-1]["pending_properties"] == 1
+        assert float(from_rollup[-1]["total_revenue"]) == 201500
+
+
+@pytest.mark.django_db
+def test_property_list_is_cached_for_anonymous_visitors(api_client, create_property):
+    """Repeat anonymous lookups are served from cache, regardless of param order."""
+    create_property(property_name="Cached Listing")
+
+    first = api_client.get("/api/v1/properties/?page_size=5&ordering=bedrooms")
+    second = api_client.get("/api/v1/properties/?ordering=bedrooms&page_size=5")
+
+    assert first["X-Cache"] == "MISS"
+    assert second["X-Cache"] == "HIT"
+    assert second.data == first.data
+
+
+@pytest.mark.django_db
+def test_property_cache_is_invalidated_on_change(
+    api_client, create_property, amenity, django_capture_on_commit_callbacks
+):
+    property_obj = create_property(property_name="Before")
+    api_client.get("/api/v1/properties/")
+    api_client.get(f"/api/v1/properties/{property_obj.slug}/")
+    api_client.get("/api/v1/amenities/")
+
+    property_obj.property_name = "After"
+    with django_capture_on_commit_callbacks(execute=True):
+        property_obj.save()
+    listing = api_client.get("/api/v1/properties/")
+    detail = api_client.get(f"/api/v1/properties/{property_obj.slug}/")
+
+    assert listing["X-Cache"] == "MISS"
+    assert listing.data["data"][0]["property_name"] == "After"
+    assert detail["X-Cache"] == "MISS"
+    assert api_client.get("/api/v1/amenities/")["X-Cache"] == "HIT"
+
+    amenity.name = "Gym"
+    with django_capture_on_commit_callbacks(execute=True):
+        amenity.save()
+    assert api_client.get("/api/v1/amenities/")["X-Cache"] == "MISS"
+    assert api_client.get("/api/v1/properties/")["X-Cache"] == "MISS"
+
+
+@pytest.mark.django_db
+def test_cache_version_is_bumped_when_the_write_commits(
+    create_property, django_capture_on_commit_callbacks
+):
+    """A request racing the write cannot cache old rows under the new version."""
+    from django.db import transaction
+
+    from core.utils.cache import get_version
+
+    version = get_version("properties")
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with transaction.atomic():
+            create_property()
+            assert get_version("properties") == version
+
+    assert callbacks
+    assert get_version("properties") > version
+
+
+@pytest.mark.django_db
+def test_property_list_is_not_cached_for_authenticated_users(
+    auth_client, client_user, create_property
+):
+    create_property()
+    client = auth_client(client_user)
+
+    client.get("/api/v1/properties/")
+    response = client.get("/api/v1/properties/")
+
+    assert "X-Cache" not in response
+
+
+@pytest.mark.django_db
+def test_cache_stats_reports_hits_and_misses(
+    api_client, auth_client, admin_user, client_user, create_property
+):
+    create_property()
+    api_client.get("/api/v1/properties/")
+    api_client.get("/api/v1/properties/")
+
+    assert auth_client(client_user).get("/health/cache/").status_code == (
+        status.HTTP_403_FORBIDDEN
+    )
+    response = auth_client(admin_user).get("/health/cache/")
+
+    assert response.status_code == status.HTTP_200_OK
+    stats = response.data["data"]["properties"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+@pytest.mark.django_db
+def test_property_create_uploads_media_concurrently(
+    auth_client, agent_user, amenity, uploaded_file_factory, monkeypatch, settings
+):
+    """All media of a listing is uploaded in parallel, bounded by the pool size."""
+    settings.MEDIA_UPLOAD_WORKERS = 3
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_upload(file, **options):
+        with lock:
+            active.append(file.name)
+            peak.append(len(active))
+        time.sleep(0.2)
+        with lock:
+            active.remove(file.name)
+        return cloudinary.CloudinaryResource(
+            f"qaba/{file.name}", version="1", type="upload", resource_type="image"
+        )
+
+    monkeypatch.setattr("cloudinary.uploader.upload_resource", slow_upload)
+
+    def png(name):
+        buffer = io.BytesIO()
+        Image.new("RGB", (2, 2)).save(buffer, format="PNG")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+    response = auth_client(agent_user).post(
+        "/api/v1/properties/",
+        {
+            "property_name": "Media Heavy",
+            "description": "Lots of photos",
+            "property_type": Property.PropertyType.HOUSE,
+            "listing_type": Property.ListingType.SALE,
+            "location": "1 Street",
+            "state": "Lagos",
+            "city": "Lagos",
+            "sale_price": 100000,
+            "amenities_ids": [amenity.id],
+            "images": [png(f"photo{i}.png") for i in range(4)],
+            "documents": [uploaded_file_factory("deed.pdf")],
+            "document_types": [PropertyDocument.DocumentType.values[0]],
+        },
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    created = Property.objects.get(property_name="Media Heavy")
+    assert created.images.count() == 4
+    assert created.documents.count() == 1
+    assert max(peak) == 3
+    assert {str(image.image) for image in created.images.all()} == {
+        f"qaba/photo{i}" for i in range(4)
+    }
+
+
+@pytest.mark.django_db
+def test_property_create_deletes_uploads_when_it_fails(
+    auth_client, agent_user, uploaded_file_factory, monkeypatch
+):
+    """Uploaded files are removed again when another upload or the insert fails."""
+    from apps.properties.models import PropertyImage
+
+    def upload(file, **options):
+        if file.name == "broken.pdf":
+            raise cloudinary.exceptions.Error("Upload failed")
+        return cloudinary.CloudinaryResource(
+            f"qaba/{file.name}", version="1", type="upload", resource_type="raw"
+        )
+
+    destroyed = []
+    monkeypatch.setattr("cloudinary.uploader.upload_resource", upload)
+    monkeypatch.setattr(
+        "cloudinary.uploader.destroy",
+        lambda public_id, **options: destroyed.append(public_id),
+    )
+
+    def create(*names):
+        return auth_client(agent_user).post(
+            "/api/v1/properties/",
+            {
+                "property_name": "Failed Upload",
+                "description": "Missing files",
+                "property_type": Property.PropertyType.HOUSE,
+                "listing_type": Property.ListingType.SALE,
+                "location": "1 Street",
+                "state": "Lagos",
+                "city": "Lagos",
+                "sale_price": 100000,
+                "documents": [uploaded_file_factory(name) for name in names],
+                "document_types": [PropertyDocument.DocumentType.values[0]] * len(names),
+            },
+        )
+
+    with pytest.raises(cloudinary.exceptions.Error):
+        create("deed.pdf", "broken.pdf")
+    assert destroyed == ["qaba/deed.pdf"]
+
+    destroyed.clear()
+    monkeypatch.setattr(
+        PropertyDocument, "save", lambda *args, **kwargs: PropertyImage.objects.get(pk=0)
+    )
+    with pytest.raises(PropertyImage.DoesNotExist):
+        create("deed.pdf", "plan.pdf")
+    assert sorted(destroyed) == ["qaba/deed.pdf", "qaba/plan.pdf"]
+    assert not Property.objects.filter(property_name="Failed Upload").exists()
+
+
+@pytest.fixture
+def cloudinary_credentials(monkeypatch):
+    """Sign with fixed credentials and mimic Cloudinary's upload response."""
+    import cloudinary
+    import cloudinary.utils
+
+    config = cloudinary.config()
+    monkeypatch.setattr(config, "api_key", "1234", raising=False)
+    monkeypatch.setattr(config, "api_secret", "secret", raising=False)
+
+    # What the Admin API reports per public ID, jpg of 1KB unless overridden
+    stored = {}
+    destroyed = []
+    monkeypatch.setattr(
+        "cloudinary.api.resource",
+        lambda public_id, **options: {"format": "jpg", "bytes": 1024}
+        | stored.get(public_id, {}),
+    )
+    monkeypatch.setattr(
+        "cloudinary.uploader.destroy",
+        lambda public_id, **options: destroyed.append(public_id),
+    )
+
+    def _upload_response(upload, version="1700000000"):
+        signature = cloudinary.utils.api_sign_request(
+            {"public_id": upload["public_id"], "version": version},
+            "secret",
+            signature_version=1,
+        )
+        return {
+            "ticket": upload["ticket"],
+            "version": version,
+            "signature": signature,
+            "format": "jpg",
+        }
+
+    _upload_response.stored = stored
+    _upload_response.destroyed = destroyed
+    return _upload_response
+
+
+@pytest.mark.django_db
+def test_property_media_direct_upload_flow(
+    auth_client, agent_user, create_property, cloudinary_credentials
+):
+    """Signed uploads are confirmed into images without the file passing through."""
+    property_obj = create_property()
+    client = auth_client(agent_user)
+
+    response = client.post(
+        f"/api/v1/properties/{property_obj.id}/media/sign/",
+        {"kind": "image", "count": 2},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    uploads = response.data["data"]["uploads"]
+    assert len(uploads) == 2
+    assert uploads[0]["upload_url"] == "https://api.cloudinary.com/v1_1/test/image/upload"
+    assert uploads[0]["public_id"].startswith("qaba/")
+    fields = uploads[0]["fields"]
+    assert fields["api_key"] == "1234" and fields["signature"]
+    assert fields["public_id"] == uploads[0]["public_id"]
+    assert fields["allowed_formats"] == "jpg,jpeg,png,webp"
+    assert uploads[0]["max_file_size"] == 10 * 1024 * 1024
+
+    response = client.post(
+        f"/api/v1/properties/{property_obj.id}/media/confirm/",
+        {"uploads": [cloudinary_credentials(upload) for upload in uploads]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["data"]["images"]) == 2
+    stored = {str(image.image) for image in property_obj.images.all()}
+    assert stored == {upload["public_id"] for upload in uploads}
+
+
+@pytest.mark.django_db
+def test_property_media_confirm_rejects_forged_or_foreign_uploads(
+    auth_client, agent_user, create_property, create_user, cloudinary_credentials
+):
+    """Uploads must carry Cloudinary's signature and a ticket for this property."""
+    property_obj = create_property()
+    other_property = create_property(property_name="Other")
+    client = auth_client(agent_user)
+    upload = client.post(
+        f"/api/v1/properties/{property_obj.id}/media/sign/",
+        {"kind": "image"},
+        format="json",
+    ).data["data"]["uploads"][0]
+    confirmed = cloudinary_credentials(upload)
+
+    forged = dict(confirmed, signature="0" * 40)
+    response = client.post(
+        f"/api/v1/properties/{property_obj.id}/media/confirm/",
+        {"uploads": [forged]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.post(
+        f"/api/v1/properties/{other_property.id}/media/confirm/",
+        {"uploads": [confirmed]},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    stranger = create_user("stranger@test.com", user_type="AGENT")
+    response = auth_client(stranger).post(
+        f"/api/v1/properties/{property_obj.id}/media/sign/",
+        {"kind": "image"},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert not property_obj.images.exists()
+
+
+@pytest.mark.django_db
+def test_property_media_confirm_enforces_image_limit(
+    auth_client, agent_user, create_property, cloudinary_credentials
+):
+    """Direct uploads count towards the five image limit."""
+    from apps.properties.models import PropertyImage
+
+    property_obj = create_property()
+    for index in range(4):
+        PropertyImage.objects.create(property=property_obj, image=f"qaba/existing{index}")
+    client = auth_client(agent_user)
+    uploads = client.post(
+        f"/api/v1/properties/{property_obj.id}/media/sign/",
+        {"kind": "image", "count": 2},
+        format="json",
+    ).data["data"]["uploads"]
+
+    response = client.post(
+        f"/api/v1/properties/{property_obj.id}/media/confirm/",
+        {"uploads": [cloudinary_credentials(upload) for upload in uploads]},
+        format="json",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert property_obj.images.count() == 4
+    assert cloudinary_credentials.destroyed == [upload["public_id"] for upload in uploads]
+
+
+@pytest.mark.django_db
+def test_property_media_confirm_rechecks_image_limit_under_lock(
+    auth_client, agent_user, create_property, cloudinary_credentials
+):
+    """Images attached after validation still count once the property is locked."""
+    from types import SimpleNamespace
+
+    from rest_framework.exceptions import ValidationError
+
+    from apps.properties.models import PropertyImage
+    from apps.properties.serializers import MediaUploadConfirmSerializer
+
+    property_obj = create_property()
+    upload = auth_client(agent_user).post(
+        f"/api/v1/properties/{property_obj.id}/media/sign/",
+        {"kind": "image"},
+        format="json",
+    ).data["data"]["uploads"][0]
+    serializer = MediaUploadConfirmSerializer(
+        data={"uploads": [cloudinary_credentials(upload)]},
+        context={"request": SimpleNamespace(user=agent_user), "property": property_obj},
+    )
+    assert serializer.is_valid(), serializer.errors
+
+    # A concurrent confirm fills the property in the meantime
+    for index in range(5):
+        PropertyImage.objects.create(property=property_obj, image=f"qaba/existing{index}")
+
+    with pytest.raises(ValidationError):
+        serializer.save()
+    assert property_obj.images.count() == 5
+    assert cloudinary_credentials.destroyed == [upload["public_id"]]
+
+
+@pytest.mark.django_db
+def test_property_media_confirm_checks_stored_uploads(
+    auth_client, agent_user, create_property, cloudinary_credentials
+):
+    """Stored format and size are re-checked, and an upload attaches only once."""
+    property_obj = create_property()
+    client = auth_client(agent_user)
+
+    def sign(kind):
+        return client.post(
+            f"/api/v1/properties/{property_obj.id}/media/sign/",
+            {"kind": kind},
+            format="json",
+        ).data["data"]["uploads"][0]
+
+    def confirm(*uploads):
+        return client.post(
+            f"/api/v1/properties/{property_obj.id}/media/confirm/",
+            {"uploads": [cloudinary_credentials(upload) for upload in uploads]},
+            format="json",
+        )
+
+    oversized, wrong_format = sign("image"), sign("image")
+    duplicate, image = sign("image"), sign("image")
+    cloudinary_credentials.stored[oversized["public_id"]] = {"bytes": 11 * 1024 * 1024}
+    cloudinary_credentials.stored[wrong_format["public_id"]] = {"format": "gif"}
+
+    assert confirm(oversized).status_code == status.HTTP_400_BAD_REQUEST
+    assert confirm(wrong_format).status_code == status.HTTP_400_BAD_REQUEST
+    assert cloudinary_credentials.destroyed == [
+        oversized["public_id"],
+        wrong_format["public_id"],
+    ]
+
+    assert confirm(duplicate, duplicate).status_code == status.HTTP_400_BAD_REQUEST
+    assert confirm(image).status_code == status.HTTP_200_OK
+    assert confirm(image).status_code == status.HTTP_400_BAD_REQUEST
+    assert property_obj.images.count() == 1
+    # The attached image is kept, the rejected duplicate is not left behind
+    assert cloudinary_credentials.destroyed == [
+        oversized["public_id"],
+        wrong_format["public_id"],
+        duplicate["public_id"],
+    ]
+
+
+def test_delivery_urls_require_a_cloud_name(monkeypatch):
+    """Like the SDK, URLs are not built against an unconfigured cloud."""
+    import cloudinary
+
+    from core.utils.media_urls import resource_url
+
+    monkeypatch.setattr(cloudinary.config(), "cloud_name", None)
+    with pytest.raises(ValueError, match="cloud_name"):
+        resource_url("properties/photo")
+
+
+@pytest.mark.django_db
+def test_property_list_returns_sized_thumbnail_variants(api_client, create_property):
+    """Listing cards carry SDK-identical URLs for each image size."""
+    from apps.properties.models import PropertyImage
+    from core.utils.media_urls import VARIANTS
+
+    property_obj = create_property()
+    PropertyImage.objects.create(
+        property=property_obj, image="image/upload/v1700/qaba/front.jpg"
+    )
+    stored = PropertyImage.objects.get(property=property_obj).image
+
+    response = api_client.get("/api/v1/properties/")
+
+    assert response.status_code == status.HTTP_200_OK
+    listing = response.data["data"][0]
+    assert listing["thumbnail"] == stored.url
+    variants = listing["thumbnail_variants"]
+    for name, transformation in VARIANTS.items():
+        assert variants[name] == stored.build_url(raw_transformation=transformation)
+    assert variants["srcset"].count(" 320w") == 1
+    assert variants["srcset"].endswith(" 1600w")
+
+
+LEKKI = (6.4474, 3.4723)
+VICTORIA_ISLAND = (6.4281, 3.4219)
+IKEJA = (6.6018, 3.3515)
+ABUJA = (9.0765, 7.3986)
+
+
+@pytest.fixture
+def located_properties(create_property):
+    """Listings at known points around Lagos plus one in Abuja."""
+    return {
+        name: create_property(property_name=name, latitude=lat, longitude=lng)
+        for name, (lat, lng) in {
+            "Lekki": LEKKI,
+            "Victoria Island": VICTORIA_ISLAND,
+            "Ikeja": IKEJA,
+            "Abuja": ABUJA,
+        }.items()
+    }
+
+
+@pytest.mark.django_db
+def test_property_geohash_is_maintained_on_save(create_property):
+    """The geohash follows the coordinates and is cleared with them."""
+    from apps.properties import geo
+
+    property_obj = create_property(latitude=LEKKI[0], longitude=LEKKI[1])
+    assert property_obj.geohash == geo.encode(*LEKKI)
+    assert property_obj.geohash.startswith("s14k")
+
+    property_obj.latitude, property_obj.longitude = ABUJA
+    property_obj.save(update_fields=["latitude", "longitude"])
+    property_obj.refresh_from_db()
+    assert property_obj.geohash == geo.encode(*ABUJA)
+
+    property_obj.latitude = property_obj.longitude = None
+    property_obj.save()
+    property_obj.refresh_from_db()
+    assert property_obj.geohash == ""
+
+
+@pytest.mark.django_db
+def test_property_list_radius_search_orders_by_distance(
+    api_client, located_properties
+):
+    """Only properties within the radius are listed, nearest first."""
+    response = api_client.get(
+        "/api/v1/properties/", {"lat": LEKKI[0], "lng": LEKKI[1], "radius_km": 10}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    results = response.data["data"]
+    assert [item["property_name"] for item in results] == [
+        "Lekki",
+        "Victoria Island",
+    ]
+    assert results[0]["distance_km"] == 0
+    assert 5 < results[1]["distance_km"] < 7
+
+    response = api_client.get(
+        "/api/v1/properties/", {"lat": LEKKI[0], "lng": LEKKI[1], "radius_km": 30}
+    )
+    assert [item["property_name"] for item in response.data["data"]] == [
+        "Lekki",
+        "Victoria Island",
+        "Ikeja",
+    ]
+
+
+@pytest.mark.django_db
+def test_property_list_bbox_and_invalid_geo_params(api_client, located_properties):
+    """A viewport keeps what is inside it; malformed areas are rejected."""
+    response = api_client.get("/api/v1/properties/", {"bbox": "6.3,3.3,6.7,3.6"})
+
+    assert response.status_code == status.HTTP_200_OK
+    names = {item["property_name"] for item in response.data["data"]}
+    assert names == {"Lekki", "Victoria Island", "Ikeja"}
+
+    for params in (
+        {"bbox": "6.7,3.3,6.3,3.6"},
+        {"bbox": "nope"},
+        {"lat": LEKKI[0]},
+        {"lat": LEKKI[0], "lng": LEKKI[1], "radius_km": 500},
+    ):
+        response = api_client.get("/api/v1/properties/", params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST, params
+        assert response.data["success"] is False
+
+
+@pytest.mark.django_db
+def test_property_map_clusters_counts_per_cell(api_client, located_properties):
+    """Clusters aggregate the viewport's properties per geohash cell."""
+    response = api_client.get(
+        "/api/v1/properties/map-clusters/",
+        {"bbox": "4.0,2.5,10.0,8.0", "precision": 3},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data["data"]
+    assert data["total"] == 4
+    clusters = {cluster["geohash"]: cluster for cluster in data["clusters"]}
+    assert clusters["s14"]["count"] == 3
+    assert clusters["s1t"]["count"] == 1
+    assert clusters["s1t"]["latitude"] == pytest.approx(ABUJA[0])
+
+    response = api_client.get(
+        "/api/v1/properties/map-clusters/", {"bbox": "6.3,3.3,6.7,3.6"}
+    )
+    data = response.data["data"]
+    assert data["precision"] > 3
+    assert data["total"] == 3
+    assert sum(cluster["count"] for cluster in data["clusters"]) == 3
+
+    response = api_client.get("/api/v1/properties/map-clusters/")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = api_client.get(
+        "/api/v1/properties/map-clusters/",
+        {"bbox": "4.0,2.5,10.0,8.0", "precision": 5},
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "precision" in response.data["errors"]
+
+
+@pytest.mark.django_db
+def test_property_create_requires_both_coordinates(auth_client, agent_user):
+    """Latitude without longitude is rejected on create."""
+    response = auth_client(agent_user).post(
+        "/api/v1/properties/",
+        {
+            "property_name": "Half Located",
+            "description": "Missing longitude",
+            "property_type": Property.PropertyType.HOUSE,
+            "listing_type": Property.ListingType.SALE,
+            "location": "1 Test Road",
+            "state": "Lagos",
+            "city": "Lekki",
+            "sale_price": 1000000,
+            "latitude": LEKKI[0],
+        },
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "latitude" in response.data["errors"]
+
+
+@pytest.mark.django_db
+def test_property_detail_reads_precomputed_related_properties(
+    api_client, create_property
+):
+    """Related listings come from the recommender's stored ranking."""
+    from apps.properties import recommender
+
+    main_property = create_property(
+        property_name="Ikoyi Terrace", city="Ikoyi", state="Lagos"
+    )
+    create_property(property_name="Ikoyi Terrace II", city="Ikoyi", state="Lagos")
+    create_property(property_name="Kano House", city="Kano", state="Kano")
+    recommender.rebuild(k=2)
+
+    response = api_client.get(f"/api/v1/properties/{main_property.slug}/")
+
+    related = response.data["data"]["related_properties"]
+    assert [prop["property_name"] for prop in related] == [
+        "Ikoyi Terrace II",
+        "Kano House",
+    ]
+
+
+@pytest.mark.django_db
+def test_property_facets_count_filtered_listing_in_one_query(
+    api_client, create_property, django_assert_num_queries
+):
+    """Facet counts cover the same properties the list would return."""
+    create_property(
+        property_name="Lekki Flat",
+        city="Lekki",
+        state="Lagos",
+        bedrooms=2,
+        total_price=160_000,
+    )
+    create_property(
+        property_name="Lekki Villa",
+        city="Lekki",
+        state="Lagos",
+        bedrooms=4,
+        sale_price=3_000_000,
+        total_price=3_150_000,
+    )
+    create_property(
+        property_name="Ikeja Warehouse",
+        city="Ikeja",
+        state="Lagos",
+        property_type=Property.PropertyType.WAREHOUSE,
+        sale_price=700_000_000,
+        total_price=735_000_000,
+    )
+    create_property(property_name="Abuja Home", city="Abuja", state="FCT", bedrooms=2)
+    create_property(
+        property_name="Draft", city="Lekki", listing_status=Property.ListingStatus.DRAFT
+    )
+
+    with django_assert_num_queries(1) as queries:
+        response = api_client.get("/api/v1/properties/facets/")
+
+    assert response.status_code == status.HTTP_200_OK
+    if connection.vendor == "postgresql":
+        assert "GROUPING SETS" in queries.captured_queries[0]["sql"]
+    data = response.data["data"]
+    assert data["total"] == 4
+    facets = data["facets"]
+    assert facets["city"] == [
+        {"value": "Lekki", "count": 2},
+        {"value": "Abuja", "count": 1},
+        {"value": "Ikeja", "count": 1},
+    ]
+    assert facets["state"][0] == {"value": "Lagos", "count": 3}
+    assert {"value": 2, "count": 2} in facets["bedrooms"]
+    assert [band["min"] for band in facets["price_band"]] == [0, 1_000_000, 500_000_000]
+    assert facets["price_band"][-1]["max"] is None
+
+    response = api_client.get("/api/v1/properties/facets/", {"state": "Lagos"})
+    data = response.data["data"]
+    assert data["total"] == 3
+    assert {item["value"] for item in data["facets"]["city"]} == {"Lekki", "Ikeja"}
+
+
+@pytest.mark.django_db
+def test_property_facets_count_each_listing_of_a_distinct_queryset(
+    auth_client, agent_user, create_property
+):
+    """An agent's facets count listings that share every facet value apart."""
+    for index in range(2):
+        create_property(property_name=f"Twin {index}", city="Lekki", bedrooms=3)
+
+    response = auth_client(agent_user).get("/api/v1/properties/facets/")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.data["data"]
+    assert data["total"] == 2
+    assert data["facets"]["city"] == [{"value": "Lekki", "count": 2}]
+    assert data["facets"]["bedrooms"] == [{"value": 3, "count": 2}]
+
+
+@pytest.mark.django_db
+def test_property_price_stats_from_cached_snapshot(
+    api_client,
+    create_property,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    """Price statistics are served from a snapshot dropped on property saves."""
+    from apps.properties import price_stats
+
+    for price in (100_000, 200_000, 300_000, 400_000):
+        create_property(city="Lekki", sale_price=price, total_price=price * 1.05)
+    create_property(
+        city="Yaba",
+        listing_type=Property.ListingType.RENT,
+        sale_price=None,
+        rent_price=1_200_000,
+        total_price=1_260_000,
+    )
+
+    response = api_client.get("/api/v1/properties/price-stats/", {"city": "lekki"})
+
+    assert response.status_code == status.HTTP_200_OK
+    sale = response.data["data"]["sale_price"]
+    assert (sale["count"], sale["min"], sale["max"]) == (4, 100_000, 400_000)
+    assert sale["percentiles"]["p50"] == 250_000
+    assert sum(bucket["count"] for bucket in sale["buckets"]) == 4
+    assert response.data["data"]["rent_price"] is None
+
+    with django_assert_num_queries(0):
+        rent = price_stats.get_price_stats(listing_type="RENT")["rent_price"]
+    assert rent["count"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        create_property(city="Lekki", sale_price=900_000)
+    response = api_client.get("/api/v1/properties/price-stats/", {"city": "Lekki"})
+    assert response.data["data"]["sale_price"]["max"] == 900_000
+
+    response = api_client.get(
+        "/api/v1/properties/price-stats/", {"listing_type": "LEASE"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_property_list_multi_value_and_amenity_filters(api_client, create_property):
+    """Comma-separated filters match any value, amenity filters match all/any."""
+    from apps.properties.models import Amenity
+
+    pool = Amenity.objects.get(code="SWIMMING_POOL")
+    gym = Amenity.objects.create(name="Gym")
+    create_property(property_name="Lekki Both", city="Lekki", amenities=[pool, gym])
+    create_property(property_name="Ikeja Pool", city="Ikeja", amenities=[pool])
+    create_property(
+        property_name="Yaba Gym",
+        city="Yaba",
+        property_type=Property.PropertyType.DUPLEX,
+        amenities=[gym],
+    )
+
+    def names(**params):
+        response = api_client.get("/api/v1/properties/", params)
+        assert response.status_code == status.HTTP_200_OK
+        return {prop["property_name"] for prop in response.data["data"]}
+
+    assert names(city="Lekki,Ikeja") == {"Lekki Both", "Ikeja Pool"}
+    assert names(property_type="HOUSE,DUPLEX") == {
+        "Lekki Both",
+        "Ikeja Pool",
+        "Yaba Gym",
+    }
+    assert names(amenities_all="swimming_pool,GYM") == {"Lekki Both"}
+    assert names(amenities_any="SWIMMING_POOL,GYM") == {
+        "Lekki Both",
+        "Ikeja Pool",
+        "Yaba Gym",
+    }
+    assert names(amenities_all="GYM", city="Yaba,Lekki", max_sale=150000) == {
+        "Lekki Both",
+        "Yaba Gym",
+    }
+
+    response = api_client.get("/api/v1/properties/", {"min_total": "cheap"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    response = api_client.get("/api/v1/properties/", {"property_type": "CASTLE"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="query plans need PostgreSQL"
+)
+def test_property_lister_type_filter_plan_uses_indexes_without_join(create_user):
+    """On a seeded table lister_type is served by both type indexes, with no users join."""
+    from apps.properties.filters import PropertyFilter
+
+    agent = create_user("planagent@test.com", user_type="AGENT")
+    landlord = create_user("planlandlord@test.com", user_type="LANDLORD")
+    Property.objects.bulk_create(
+        Property(
+            property_name=f"Plan {index}",
+            property_id=f"PROP-PLAN-{index}",
+            slug=f"plan-{index}",
+            description="Plan listing",
+            property_type=Property.PropertyType.HOUSE,
+            listing_type=Property.ListingType.SALE,
+            location=f"{index} Plan Street",
+            state="Lagos",
+            city="Lekki",
+            sale_price=1_000_000 + index,
+            listing_status=Property.ListingStatus.APPROVED,
+            listed_by=landlord if index % 100 == 0 else agent,
+            listed_by_type="LANDLORD" if index % 100 == 0 else "AGENT",
+            owner=landlord if index % 100 == 50 else None,
+            owner_type="LANDLORD" if index % 100 == 50 else "",
+        )
+        for index in range(20_000)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE properties_property")
+
+    queryset = PropertyFilter(
+        {"lister_type": "LANDLORD"}, queryset=Property.objects.all()
+    ).qs.order_by("-listed_date")[:20]
+
+    assert "users_user" not in str(queryset.query)
+    plan = queryset.explain()
+    assert "property_listed_by_type_idx" in plan
+    assert "property_owner_type_idx" in plan
+    assert len(queryset) == 20
+
+
+@pytest.mark.django_db
+def test_property_amenity_filters_use_bitmask(
+    api_client, create_property, amenity
+):
+    """Amenity filters test amenity_mask bits; amenities without a bit still work."""
+    from django.test.utils import CaptureQueriesContext
+
+    from apps.properties import amenity_catalog
+    from apps.properties.models import Amenity
+
+    gym = Amenity.objects.create(name="Gym")
+    create_property(property_name="Both", amenities=[amenity, gym])
+    create_property(property_name="Pool Only", amenities=[amenity])
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(
+            "/api/v1/properties/", {"amenities_all": "SWIMMING_POOL,GYM"}
+        )
+    assert [prop["property_name"] for prop in response.data["data"]] == ["Both"]
+    assert {item["name"] for item in response.data["data"][0]["amenities"]} == {
+        "Swimming Pool",
+        "Gym",
+    }
+    assert not [q for q in queries if "properties_property_amenities" in q["sql"]]
+
+    Amenity.objects.filter(pk=gym.pk).update(bit=None)
+    amenity_catalog.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/api/v1/properties/", {"amenities_all": "GYM"})
+    assert [prop["property_name"] for prop in response.data["data"]] == ["Both"]
+    assert len(response.data["data"][0]["amenities"]) == 2
+    assert [q for q in queries if "properties_property_amenities" in q["sql"]]
+
+
+@pytest.mark.django_db
+def test_amenity_catalog_reloads_after_ttl(amenity, settings, monkeypatch):
+    """Changes that miss the version bump show up once the copy expires."""
+    from apps.properties import amenity_catalog
+    from apps.properties.models import Amenity
+
+    settings.AMENITY_CATALOG_TTL = 60
+    amenity_catalog.clear()
+    catalog = amenity_catalog.get_catalog()
+    Amenity.objects.filter(pk=amenity.pk).update(bit=None)
+
+    assert amenity_catalog.get_catalog() is catalog
+    monkeypatch.setattr(
+        amenity_catalog.time, "monotonic", lambda: catalog.loaded_at + 60
+    )
+    assert not amenity_catalog.get_catalog().complete
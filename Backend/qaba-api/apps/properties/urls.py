@@ -10,6 +10,8 @@ from .views import (
     ListPropertyReviewsView,
     PropertyDocumentDetailView,
     PropertyDocumentView,
+    PropertyMediaUploadConfirmView,
+    PropertyMediaUploadSignView,
     PropertyViewSet,
     AllPropertyReviewsListView,
 )
@@ -53,6 +55,16 @@ urlpatterns = [
         PropertyDocumentDetailView.as_view(),
         name="property-document-detail",
     ),
+    path(
+        "properties/<int:property_id>/media/sign/",
+        PropertyMediaUploadSignView.as_view(),
+        name="property-media-sign",
+    ),
+    path(
+        "properties/<int:property_id>/media/confirm/",
+        PropertyMediaUploadConfirmView.as_view(),
+        name="property-media-confirm",
+    ),
     path("reviews/create/", CreatePropertyReviewView.as_view(), name="create-review"),
     path(
         "reviews/property/<int:property_id>/",
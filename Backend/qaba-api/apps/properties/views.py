@@ -1,52 +1,112 @@
+from collections import Counter
 from datetime import datetime
 
+from core.utils.cache import cache_public_response
+from core.utils.pagination import KeysetPagination, StandardResultsPagination
 from core.utils.response import APIResponse
-from django.db.models import Q, Sum
+from django.conf import settings
+from django.db import connections
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    Exists,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Substr, TruncMonth, TruncYear
 from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import OpenApiParameter, extend_schema
-from rest_framework import filters, generics, permissions, viewsets
+from rest_framework import generics, permissions, viewsets
+from rest_framework.decorators import action
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.views import APIView
 
 from ..users.permissions import IsAgentLandlordOrAdmin, IsOwnerOrReadOnly
-from .models import Amenity, Favorite, Property, PropertyDocument, PropertyReview
+from . import amenity_catalog, geo, price_stats
+from .filters import (
+    PropertyFilter,
+    PropertyGeoFilter,
+    PropertyOrderingFilter,
+    PropertySearchFilter,
+)
+from .models import (
+    AgentMonthlyAnalytics,
+    Amenity,
+    Favorite,
+    Property,
+    PropertyDocument,
+    PropertyImage,
+    PropertyReview,
+)
 from .serializers import (
     AgentPropertyAnalyticsSerializer,
     AmenitySerializer,
     FavoriteSerializer,
+    MediaUploadConfirmSerializer,
+    MediaUploadSignSerializer,
     PropertyCreateSerializer,
     PropertyDetailSerializer,
     PropertyDocumentSerializer,
     PropertyDocumentUploadSerializer,
     PropertyFavoriteToggleSerializer,
+    PropertyImageSerializer,
     PropertyListSerializer,
     PropertyReviewCreateSerializer,
     PropertyReviewSerializer,
     PropertyUpdateSerializer,
+    PropertyVideoSerializer,
 )
 
 
+# Geo query parameters, the PropertyFilter ones are documented from the FilterSet
+PROPERTY_GEO_PARAMETERS = [
+    OpenApiParameter(
+        name="bbox",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Only properties inside south,west,north,east",
+    ),
+    OpenApiParameter(
+        name="lat",
+        type=float,
+        location=OpenApiParameter.QUERY,
+        description="Latitude to search around, ordered nearest first",
+    ),
+    OpenApiParameter(
+        name="lng",
+        type=float,
+        location=OpenApiParameter.QUERY,
+        description="Longitude to search around",
+    ),
+    OpenApiParameter(
+        name="radius_km",
+        type=float,
+        location=OpenApiParameter.QUERY,
+        description="Radius around lat/lng in km (default 10, max 100)",
+    ),
+]
+
+
 @extend_schema(tags=["Properties"])
 class PropertyViewSet(viewsets.ModelViewSet):
     queryset = Property.objects.all()
     parser_classes = (MultiPartParser, FormParser)
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
-    ]
-    filterset_fields = [
-        "property_type",
-        "listing_type",
-        "property_status",
-        "listing_status",
-        "bedrooms",
-        "bathrooms",
-        "state",
-        "city",
+        PropertySearchFilter,
+        PropertyGeoFilter,
+        PropertyOrderingFilter,
     ]
+    filterset_class = PropertyFilter
     search_fields = ["property_name", "description", "location", "state", "city"]
     ordering_fields = [
         "sale_price",
@@ -56,8 +116,37 @@ class PropertyViewSet(viewsets.ModelViewSet):
         "rent_price",
     ]
     ordering = ["-listed_date"]
+    pagination_class = StandardResultsPagination
+
+    # Cells a map viewport is split into when no precision is given, and a
+    # quarter of the most an explicit precision may split it into
+    MAP_CLUSTER_CELLS = 64
+
+    # Upper bounds of the total price bands counted by ``facets``, in naira
+    FACET_PRICE_BANDS = [
+        1_000_000,
+        5_000_000,
+        20_000_000,
+        50_000_000,
+        100_000_000,
+        500_000_000,
+    ]
+    FACET_FIELDS = ["property_type", "listing_type", "state", "city", "bedrooms"]
     http_method_names = ["get", "post", "patch", "delete"]
 
+    @property
+    def paginator(self):
+        """
+        Use keyset pagination when the client asks for ``pagination=cursor``,
+        page numbers otherwise
+        """
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def get_object(self):
         queryset = self.filter_queryset(self.get_queryset())
         lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
@@ -118,107 +207,74 @@ class PropertyViewSet(viewsets.ModelViewSet):
                 listing_status=Property.ListingStatus.APPROVED,
             )
 
+        if self.action in ["list", "retrieve"]:
+            queryset = self._with_serializer_relations(queryset)
+            if self.action == "retrieve":
+                queryset = queryset.select_related("video").prefetch_related(
+                    "images", "documents"
+                )
+
         return queryset
 
+    def _with_serializer_relations(self, queryset):
+        """
+        Load everything PropertyListSerializer reads up front so serializing a
+        page costs a fixed number of queries regardless of its size
+        """
+        user = self.request.user
+
+        if user.is_authenticated and user.is_client:
+            is_favorited = Exists(
+                Favorite.objects.filter(property=OuterRef("pk"), user=user)
+            )
+        else:
+            is_favorited = Value(False)
+
+        # Listing rows render amenities from amenity_mask when every amenity
+        # has a bit
+        amenities = [] if amenity_catalog.get_catalog().complete else ["amenities"]
+
+        return (
+            queryset.select_related(
+                "listed_by__agentprofile",
+                "listed_by__clientprofile",
+                "listed_by__landlordprofile",
+                "owner__agentprofile",
+                "owner__clientprofile",
+                "owner__landlordprofile",
+            )
+            .prefetch_related(
+                *amenities,
+                Prefetch(
+                    "images",
+                    queryset=PropertyImage.objects.order_by("id")[:1],
+                    to_attr="thumbnail_images",
+                ),
+            )
+            .annotate(is_favorited=is_favorited)
+        )
+
     @extend_schema(
         parameters=[
+            *PROPERTY_GEO_PARAMETERS,
             OpenApiParameter(
-                name="lister_type",
-                type=str,
-                location=OpenApiParameter.QUERY,
-                description="Filter by lister type (LANDLOARD, AGENT)",
-            ),
-            OpenApiParameter(
-                name="min_total",
-                type=float,
-                location=OpenApiParameter.QUERY,
-                description="Minimum total price filter",
-            ),
-            OpenApiParameter(
-                name="max_total",
-                type=float,
-                location=OpenApiParameter.QUERY,
-                description="Maximum total price filter",
-            ),
-            OpenApiParameter(
-                name="min_sale",
-                type=float,
-                location=OpenApiParameter.QUERY,
-                description="Minimum price filter",
-            ),
-            OpenApiParameter(
-                name="max_sale",
-                type=float,
-                location=OpenApiParameter.QUERY,
-                description="Maximum price filter",
-            ),
-            OpenApiParameter(
-                name="min_rent",
-                type=float,
-                location=OpenApiParameter.QUERY,
-                description="Minimum rent price filter (for rental listings)",
-            ),
-            OpenApiParameter(
-                name="max_rent",
-                type=float,
-                location=OpenApiParameter.QUERY,
-                description="Maximum rent price filter (for rental listings)",
-            ),
-            OpenApiParameter(
-                name="state",
+                name="pagination",
                 type=str,
                 location=OpenApiParameter.QUERY,
-                description="Filter by state",
+                description="Set to 'cursor' for keyset pagination ordered by newest first",
             ),
             OpenApiParameter(
-                name="city",
+                name="cursor",
                 type=str,
                 location=OpenApiParameter.QUERY,
-                description="Filter by city",
+                description="Opaque cursor from the previous page's 'next' link",
             ),
         ]
     )
+    @cache_public_response("properties")
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
-        # Price range filtering
-        lister_type = request.query_params.get("lister_type")
-        min_total = request.query_params.get("min_total")
-        max_total = request.query_params.get("max_total")
-        min_price = request.query_params.get("min_sale")
-        max_price = request.query_params.get("max_sale")
-        min_rent = request.query_params.get("min_rent")
-        max_rent = request.query_params.get("max_rent")
-
-        if lister_type:
-            queryset = queryset.filter(
-                Q(listed_by__user_type=lister_type)
-                | Q(owner__user_type=lister_type)
-            )
-
-        if min_total:
-            try:
-                min_total = float(min_total)
-                queryset = queryset.filter(total_price__gte=min_total)
-            except ValueError:
-                pass
-
-        if max_total:
-            try:
-                max_total = float(max_total)
-                queryset = queryset.filter(total_price__lte=max_total)
-            except ValueError:
-                pass
-
-        if min_price:
-            queryset = queryset.filter(sale_price__gte=min_price)
-        if max_price:
-            queryset = queryset.filter(sale_price__lte=max_price)
-        if min_rent:
-            queryset = queryset.filter(rent_price__gte=min_rent)
-        if max_rent:
-            queryset = queryset.filter(rent_price__lte=max_rent)
-
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -227,6 +283,7 @@ class PropertyViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return APIResponse.success(data=serializer.data)
 
+    @cache_public_response("properties")
     def retrieve(self, request, *args, **kwargs):
         """
         Retrieve a specific property with related properties based on city and state
@@ -244,7 +301,244 @@ class PropertyViewSet(viewsets.ModelViewSet):
 
         return APIResponse.success(data=data)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="bbox",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                required=True,
+                description="Map viewport as south,west,north,east",
+            ),
+            OpenApiParameter(
+                name="precision",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="Geohash length of the cells (1-8), from the viewport by default",
+            ),
+        ]
+    )
+    @action(detail=False, methods=["get"], url_path="map-clusters")
+    @cache_public_response("properties")
+    def map_clusters(self, request):
+        """
+        Property counts per geohash cell inside a map viewport, with the mean
+        position of each cell's properties for placing the cluster marker
+        """
+        if not request.query_params.get("bbox"):
+            return APIResponse.bad_request(
+                message="Invalid bbox", errors={"bbox": "This parameter is required"}
+            )
+        bbox = PropertyGeoFilter.get_bbox(request)
+
+        precision = request.query_params.get("precision")
+        if precision is None:
+            precision = geo.precision_for(bbox, self.MAP_CLUSTER_CELLS)
+        else:
+            try:
+                precision = int(precision)
+            except ValueError:
+                precision = 0
+            if not 1 <= precision < geo.GEOHASH_PRECISION:
+                return APIResponse.bad_request(
+                    message="Invalid precision",
+                    errors={"precision": "Must be between 1 and 8"},
+                )
+            max_cells = self.MAP_CLUSTER_CELLS * 4
+            if geo.cell_count(bbox, precision) > max_cells:
+                return APIResponse.bad_request(
+                    message="Invalid precision",
+                    errors={
+                        "precision": f"Splits the bbox into more than {max_cells} "
+                        "cells, use a coarser precision or a smaller bbox"
+                    },
+                )
+
+        # PropertyGeoFilter limits the queryset to the bbox
+        cells = (
+            self.filter_queryset(self.get_queryset())
+            .annotate(cell=Substr("geohash", 1, precision))
+            .values("cell")
+            .annotate(
+                count=Count("id"),
+                latitude=Avg("latitude"),
+                longitude=Avg("longitude"),
+            )
+            .order_by("-count", "cell")
+        )
+
+        return APIResponse.success(
+            data={
+                "precision": precision,
+                "total": sum(cell["count"] for cell in cells),
+                "clusters": [
+                    {
+                        "geohash": cell["cell"],
+                        "count": cell["count"],
+                        "latitude": cell["latitude"],
+                        "longitude": cell["longitude"],
+                    }
+                    for cell in cells
+                ],
+            }
+        )
+
+    @extend_schema(filters=True, parameters=PROPERTY_GEO_PARAMETERS)
+    @action(detail=False, methods=["get"])
+    @cache_public_response("properties")
+    def facets(self, request):
+        """
+        Counts per property type, listing type, state, city, bedrooms and
+        total price band for the properties the same query would list
+        """
+        bands = self.FACET_PRICE_BANDS
+        price_band = Case(
+            *[
+                When(total_price__lt=upper, then=Value(index))
+                for index, upper in enumerate(bands)
+            ],
+            When(total_price__isnull=False, then=Value(len(bands))),
+            default=None,
+            output_field=IntegerField(),
+        )
+        total, counts = self._count_facets(
+            self.filter_queryset(self.get_queryset()).annotate(price_band=price_band),
+            [*self.FACET_FIELDS, "price_band"],
+        )
+
+        lower_bounds = [0, *bands]
+        upper_bounds = [*bands, None]
+        facets = {
+            field: [
+                {"value": value, "count": count}
+                for value, count in sorted(
+                    counts[field].items(), key=lambda item: (-item[1], item[0])
+                )
+            ]
+            for field in self.FACET_FIELDS
+        }
+        facets["price_band"] = [
+            {
+                "min": lower_bounds[index],
+                "max": upper_bounds[index],
+                "count": counts["price_band"][index],
+            }
+            for index in sorted(counts["price_band"])
+        ]
+
+        return APIResponse.success(data={"total": total, "facets": facets})
+
+    @staticmethod
+    def _count_facets(queryset, fields):
+        """
+        ``(total, {field: Counter})`` of the rows of ``queryset`` per value of
+        each of ``fields``, leaving out empty values. PostgreSQL counts every
+        facet in one scan with GROUPING SETS; elsewhere one query groups by
+        every combination of facet values and the counts are folded here.
+        """
+        counts = {field: Counter() for field in fields}
+        queryset = queryset.values(*fields).order_by()
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql":
+            # With the pk selected too, a DISTINCT queryset (agents and
+            # landlords get one) still yields a row per listing
+            sql, params = queryset.values("pk", *fields).query.sql_with_params()
+            columns = [connection.ops.quote_name(field) for field in fields]
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {', '.join(f'GROUPING({column})' for column in columns)}, "
+                    f"{', '.join(columns)}, COUNT(*) FROM ({sql}) AS facet_rows "
+                    f"GROUP BY GROUPING SETS "
+                    f"({', '.join(f'({column})' for column in columns)}, ())",
+                    params,
+                )
+                rows = cursor.fetchall()
+            groups = []
+            total = 0
+            for row in rows:
+                grouped = row[: len(fields)]
+                if all(grouped):
+                    total = row[-1]
+                else:
+                    index = grouped.index(0)
+                    groups.append(({fields[index]: row[len(fields) + index]}, row[-1]))
+        else:
+            groups = [
+                (group, group.pop("count"))
+                for group in queryset.annotate(count=Count("pk"))
+            ]
+            total = sum(count for _, count in groups)
+
+        for group, count in groups:
+            for field, value in group.items():
+                if value is not None and value != "":
+                    counts[field][value] += count
+        return total, counts
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="listing_type",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Only listings of this type (SALE, RENT)",
+            ),
+            OpenApiParameter(
+                name="state",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Only listings in this state",
+            ),
+            OpenApiParameter(
+                name="city",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Only listings in this city",
+            ),
+        ]
+    )
+    @action(detail=False, methods=["get"], url_path="price-stats")
+    @cache_public_response(price_stats.NAMESPACE)
+    def price_statistics(self, request):
+        """
+        Range, percentiles and equal-count buckets of the sale, rent and
+        total prices of public listings, for the price filter sliders
+        """
+        listing_type = request.query_params.get("listing_type")
+        if listing_type and listing_type.upper() not in Property.ListingType.values:
+            return APIResponse.bad_request(
+                message="Invalid listing_type",
+                errors={"listing_type": "Must be one of SALE, RENT"},
+            )
+
+        return APIResponse.success(
+            data=price_stats.get_price_stats(
+                listing_type=listing_type,
+                state=request.query_params.get("state"),
+                city=request.query_params.get("city"),
+            )
+        )
+
     def _get_related_properties(self, instance):
+        """
+        Get 3 related properties from the lists precomputed by
+        ``apps.properties.recommender``, falling back to the same city, then
+        the same state for listings that have none yet
+        """
+        related = list(
+            self._with_serializer_relations(
+                Property.objects.filter(
+                    recommended_in__property=instance,
+                    listing_status=Property.ListingStatus.APPROVED,
+                    property_status=Property.PropertyStatus.AVAILABLE,
+                )
+            ).order_by("recommended_in__rank")[:3]
+        )
+        if related:
+            return related
+        return self._get_nearby_properties(instance)
+
+    def _get_nearby_properties(self, instance):
         """
         Get 3 related properties, prioritizing properties in the same city,
         then properties in the same state
@@ -277,7 +571,9 @@ class PropertyViewSet(viewsets.ModelViewSet):
             related_list.extend(recent_properties)
 
         related_ids = [prop.id for prop in related_list][:3]
-        return Property.objects.filter(id__in=related_ids).order_by("-listed_date")
+        return self._with_serializer_relations(
+            Property.objects.filter(id__in=related_ids)
+        ).order_by("-listed_date")
 
 
 @extend_schema(tags=["Amenities"])
@@ -288,6 +584,7 @@ class AmenityView(APIView):
         responses=AmenitySerializer(many=True),
         description="Retrieve a list of all amenities",
     )
+    @cache_public_response("amenities")
     def get(self, request):
         amenities = Amenity.objects.filter(is_active=True)
         serializer = AmenitySerializer(amenities, many=True)
@@ -449,6 +746,79 @@ class PropertyDocumentDetailView(APIView):
         return APIResponse.success(message="Document deleted successfully")
 
 
+class PropertyMediaUploadMixin:
+    """Direct uploads are open to the lister and staff"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_property(self, request, property_id):
+        property_obj = get_object_or_404(Property, id=property_id)
+        if not (request.user.is_staff or property_obj.listed_by == request.user):
+            return APIResponse.forbidden(
+                message="You don't have permission to add media to this property"
+            )
+        return property_obj
+
+
+@extend_schema(tags=["Property Media"])
+class PropertyMediaUploadSignView(PropertyMediaUploadMixin, APIView):
+    """
+    Issue signed parameters so the client uploads media straight to
+    Cloudinary instead of through the API
+    """
+
+    @extend_schema(request=MediaUploadSignSerializer)
+    def post(self, request, property_id):
+        property_obj = self.get_property(request, property_id)
+        serializer = MediaUploadSignSerializer(data=request.data)
+        if not serializer.is_valid():
+            return APIResponse.bad_request(
+                message="Invalid upload request", errors=serializer.errors
+            )
+
+        return APIResponse.success(
+            data={
+                "uploads": serializer.get_uploads(property_obj, request.user),
+                "expires_in": settings.MEDIA_UPLOAD_TICKET_MAX_AGE,
+            },
+            message="Upload parameters issued successfully",
+        )
+
+
+@extend_schema(tags=["Property Media"])
+class PropertyMediaUploadConfirmView(PropertyMediaUploadMixin, APIView):
+    """Attach directly uploaded media to the property"""
+
+    @extend_schema(request=MediaUploadConfirmSerializer)
+    def post(self, request, property_id):
+        property_obj = self.get_property(request, property_id)
+        serializer = MediaUploadConfirmSerializer(
+            data=request.data,
+            context={"request": request, "property": property_obj},
+        )
+        if not serializer.is_valid():
+            return APIResponse.bad_request(
+                message="Invalid uploads", errors=serializer.errors
+            )
+
+        created = serializer.save()
+        context = {"request": request}
+        return APIResponse.success(
+            data={
+                "images": PropertyImageSerializer(
+                    created["images"], many=True, context=context
+                ).data,
+                "video": PropertyVideoSerializer(created["video"], context=context).data
+                if created["video"]
+                else None,
+                "documents": PropertyDocumentSerializer(
+                    created["documents"], many=True, context=context
+                ).data,
+            },
+            message="Media attached successfully",
+        )
+
+
 @extend_schema(tags=["Property Reviews"])
 class CreatePropertyReviewView(generics.CreateAPIView):
     """Create a new property review"""
@@ -495,13 +865,12 @@ class ListPropertyReviewsView(generics.ListAPIView):
         queryset = self.get_queryset()
         serializer = self.get_serializer(queryset, many=True)
 
-        total_reviews = queryset.count()
         average_rating = property_obj.average_rating
 
         return APIResponse.success(
             data={
                 "reviews": serializer.data,
-                "total_reviews": total_reviews,
+                "total_reviews": property_obj.total_reviews,
                 "average_rating": round(average_rating, 1) if average_rating else 0,
                 "property_name": property_obj.property_name,
                 "rating_breakdown": property_obj.rating_breakdown,
@@ -584,133 +953,72 @@ class AgentPropertyAnalyticsView(APIView):
 
     def _get_monthly_analytics(self, user, year):
         """Get monthly analytics for the specified year"""
-        agent_properties = Property.objects.filter(listed_by=user)
-
-        start_date = datetime(year, 1, 1)
-        end_date = datetime(year + 1, 1, 1)
-        year_properties = agent_properties.filter(
-            listed_date__gte=start_date, listed_date__lt=end_date
+        totals = self._period_totals(
+            user, TruncMonth, datetime(year, 1, 1), datetime(year + 1, 1, 1)
         )
 
         months = []
         for month in range(1, 13):
-            month_start = datetime(year, month, 1)
-            month_name = month_start.strftime("%B")
-
-            if month == 12:
-                month_end = datetime(year + 1, 1, 1)
-            else:
-                month_end = datetime(year, month + 1, 1)
-
-            month_properties = year_properties.filter(
-                listed_date__gte=month_start, listed_date__lt=month_end
-            )
-
-            total_properties = month_properties.count()
-            sold_properties = month_properties.filter(
-                property_status=Property.PropertyStatus.SOLD
-            ).count()
-            rented_properties = month_properties.filter(
-                property_status=Property.PropertyStatus.RENTED
-            ).count()
-            pending_properties = month_properties.filter(
-                listing_status=Property.ListingStatus.PENDING
-            ).count()
-            published_properties = month_properties.filter(
-                listing_status=Property.ListingStatus.APPROVED
-            ).count()
-
-            sold_revenue = (
-                month_properties.filter(
-                    property_status=Property.PropertyStatus.SOLD
-                ).aggregate(revenue=Sum("sale_price"))["revenue"]
-                or 0
-            )
-
-            rented_revenue = (
-                month_properties.filter(
-                    property_status=Property.PropertyStatus.RENTED
-                ).aggregate(revenue=Sum("rent_price"))["revenue"]
-                or 0
-            )
-
-            total_revenue = sold_revenue + rented_revenue
-
-            months.append(
-                {
-                    "period": month_name,
-                    "total_properties": total_properties,
-                    "sold_properties": sold_properties,
-                    "rented_properties": rented_properties,
-                    "pending_properties": pending_properties,
-                    "published_properties": published_properties,
-                    "total_revenue": total_revenue,
-                }
-            )
+            month_name = datetime(year, month, 1).strftime("%B")
+            months.append(self._period_row(month_name, totals.get((year, month))))
 
         return months
 
     def _get_yearly_analytics(self, user, start_year=None, num_years=5):
         """Get yearly analytics for the last num_years"""
-        agent_properties = Property.objects.filter(listed_by=user)
-
         current_year = datetime.now().year
         if start_year is None:
             start_year = current_year - num_years + 1
 
-        years = []
-        for year in range(start_year, current_year + 1):
-            start_date = datetime(year, 1, 1)
-            end_date = datetime(year + 1, 1, 1)
-
-            year_properties = agent_properties.filter(
-                listed_date__gte=start_date, listed_date__lt=end_date
-            )
-
-            total_properties = year_properties.count()
-            sold_properties = year_properties.filter(
-                property_status=Property.PropertyStatus.SOLD
-            ).count()
-            rented_properties = year_properties.filter(
-                property_status=Property.PropertyStatus.RENTED
-            ).count()
-            pending_properties = year_properties.filter(
-                listing_status=Property.ListingStatus.PENDING
-            ).count()
-            published_properties = year_properties.filter(
-                listing_status=Property.ListingStatus.APPROVED
-            ).count()
-
-            # Calculate revenue
-            sold_revenue = (
-                year_properties.filter(
-                    property_status=Property.PropertyStatus.SOLD
-                ).aggregate(revenue=Sum("sale_price"))["revenue"]
-                or 0
-            )
-
-            rented_revenue = (
-                year_properties.filter(
-                    property_status=Property.PropertyStatus.RENTED
-                ).aggregate(revenue=Sum("rent_price"))["revenue"]
-                or 0
-            )
+        totals = self._period_totals(
+            user,
+            TruncYear,
+            datetime(start_year, 1, 1),
+            datetime(current_year + 1, 1, 1),
+        )
 
-            total_revenue = sold_revenue + rented_revenue
-
-            years.append(
-                {
-                    "period": str(year),
-                    "total_properties": total_properties,
-                    "sold_properties": sold_properties,
-                    "rented_properties": rented_properties,
-                    "pending_properties": pending_properties,
-                    "published_properties": published_properties,
-                    "total_revenue": total_revenue,
-                }
-            )
+        return [
+            self._period_row(str(year), totals.get((year, 1)))
+            for year in range(start_year, current_year + 1)
+        ]
 
-        return years
+    def _period_totals(self, user, trunc, start, end):
+        """
+        Aggregate the user's listings between ``start`` and ``end`` in a
+        single grouped query, keyed by the ``(year, month)`` each period
+        starts on
+        """
+        if settings.AGENT_ANALYTICS_ROLLUP:
+            queryset = AgentMonthlyAnalytics.objects.filter(
+                agent=user, month__gte=start.date(), month__lt=end.date()
+            ).annotate(period=trunc("month"))
+            aggregates = {
+                field: Sum(field) for field in AgentMonthlyAnalytics.COUNTER_FIELDS
+            }
+        else:
+            queryset = Property.objects.filter(
+                listed_by=user,
+                listed_date__gte=timezone.make_aware(start),
+                listed_date__lt=timezone.make_aware(end),
+            ).annotate(period=trunc("listed_date"))
+            aggregates = AgentMonthlyAnalytics.property_aggregates()
+
+        rows = queryset.values("period").annotate(**aggregates).order_by()
+        return {(row["period"].year, row["period"].month): row for row in rows}
+
+    @staticmethod
+    def _period_row(period, totals):
+        totals = totals or {}
+        return {
+            "period": period,
+            "total_properties": totals.get("total_properties", 0),
+            "sold_properties": totals.get("sold_properties", 0),
+            "rented_properties": totals.get("rented_properties", 0),
+            "pending_properties": totals.get("pending_properties", 0),
+            "published_properties": totals.get("published_properties", 0),
+            "total_revenue": totals.get("sold_revenue", 0)
+            + totals.get("rented_revenue", 0),
+        }
 
 
 @extend_schema(tags=["Property Reviews"])
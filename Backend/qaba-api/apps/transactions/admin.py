@@ -1,11 +1,9 @@
-import csv
-
 from django.contrib import admin
-from django.http import HttpResponse
-
 from django.utils.html import format_html
 
-from .models import Transaction
+from core.utils.csv_export import stream_csv
+
+from .models import Transaction, WebhookEvent
 
 
 class AmountFilter(admin.SimpleListFilter):
@@ -137,18 +135,7 @@ class TransactionAdmin(admin.ModelAdmin):
     payment_receipt_display.short_description = "Payment Receipt"
 
     def export_as_csv(self, request, queryset):
-        meta = self.model._meta
-        field_names = [field.name for field in meta.fields]
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=transactions.csv"
-        writer = csv.writer(response)
-
-        writer.writerow(field_names)
-        for obj in queryset:
-            writer.writerow([getattr(obj, field) for field in field_names])
-
-        return response
+        return stream_csv("transactions", queryset)
 
     export_as_csv.short_description = "Export Selected Transactions"
 
@@ -173,3 +160,14 @@ class TransactionAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ["event_id", "event", "tx_ref", "received_at"]
+    list_filter = ["event", "received_at"]
+    search_fields = ["event_id", "tx_ref"]
+    readonly_fields = ["event_id", "event", "tx_ref", "payload", "received_at"]
+
+    def has_add_permission(self, request):
+        return False
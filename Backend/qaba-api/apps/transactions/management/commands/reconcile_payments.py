@@ -0,0 +1,159 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.transactions.models import Transaction
+from core.utils.flutterwave import verify_payment
+
+GATEWAY_STATUSES = {
+    "successful": Transaction.Status.SUCCESSFUL,
+    "failed": Transaction.Status.FAILED,
+    "cancelled": Transaction.Status.FAILED,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify pending online transactions against Flutterwave and settle the "
+        "ones whose webhook never arrived. Runs until interrupted unless --once "
+        "is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Make a single pass over pending transactions and exit",
+        )
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=15,
+            help="Only check transactions pending for this many minutes (default: 15)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Transactions read from the database per batch (default: 200)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="Concurrent Flutterwave verifications (default: 8)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=300.0,
+            help="Seconds to sleep between passes (default: 300)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the transitions that would be applied without saving them",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            metrics = self.reconcile(**options)
+            if metrics["scanned"] or options["once"]:
+                self.report(metrics, options["dry_run"])
+
+            if options["once"]:
+                break
+            try:
+                time.sleep(options["interval"])
+            except KeyboardInterrupt:
+                break
+
+    def reconcile(self, older_than, batch_size, workers, dry_run, **options):
+        """One pass over every stale pending transaction, oldest first"""
+        metrics = {
+            "scanned": 0,
+            "successful": 0,
+            "failed": 0,
+            "pending": 0,
+            "errors": 0,
+            "verify_seconds": 0.0,
+        }
+        cutoff = timezone.now() - timedelta(minutes=older_than)
+        stale = Transaction.objects.filter(
+            payment_method=Transaction.PaymentMethod.ONLINE,
+            status=Transaction.Status.PENDING,
+            created_at__lt=cutoff,
+        ).order_by("created_at", "id")
+
+        started = time.perf_counter()
+        last = None
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                page = stale
+                if last:
+                    page = page.filter(
+                        Q(created_at__gt=last[1])
+                        | Q(created_at=last[1], id__gt=last[0])
+                    )
+                batch = list(page.values_list("id", "created_at", "tx_ref")[:batch_size])
+                if not batch:
+                    break
+                last = batch[-1]
+
+                for (pk, _, tx_ref), (result, elapsed) in zip(
+                    batch,
+                    pool.map(self.verify, [row[2] for row in batch]),
+                    strict=True,
+                ):
+                    metrics["scanned"] += 1
+                    metrics["verify_seconds"] += elapsed
+                    self.apply(pk, tx_ref, result, metrics, dry_run)
+
+        metrics["elapsed"] = time.perf_counter() - started
+        return metrics
+
+    @staticmethod
+    def verify(tx_ref):
+        started = time.perf_counter()
+        result = verify_payment(tx_ref)
+        return result, time.perf_counter() - started
+
+    def apply(self, pk, tx_ref, result, metrics, dry_run):
+        if not result["success"]:
+            metrics["errors"] += 1
+            self.stderr.write(f"{tx_ref}: verification failed: {result.get('error')}")
+            return
+
+        status = GATEWAY_STATUSES.get(result.get("status", "").lower())
+        if status is None:
+            metrics["pending"] += 1
+            return
+
+        if dry_run:
+            changed = True
+        else:
+            _, changed = Transaction.settle(pk, status)
+
+        if changed:
+            metrics[status] += 1
+            prefix = "Would mark" if dry_run else "Marked"
+            self.stdout.write(f"{prefix} {tx_ref} {status}")
+
+    def report(self, metrics, dry_run):
+        scanned = metrics["scanned"]
+        elapsed = metrics["elapsed"]
+        rate = scanned / elapsed if elapsed else 0
+        average_ms = metrics["verify_seconds"] / scanned * 1000 if scanned else 0
+        prefix = "[dry run] " if dry_run else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}Checked {scanned} pending transactions in {elapsed:.2f}s "
+                f"({rate:.1f}/s, {average_ms:.0f}ms average verify): "
+                f"{metrics['successful']} successful, {metrics['failed']} failed, "
+                f"{metrics['pending']} still pending, {metrics['errors']} errors"
+            )
+        )
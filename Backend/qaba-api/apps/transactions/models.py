@@ -1,9 +1,11 @@
+import hashlib
+import json
 import uuid
 
 from apps.properties.models import Property
 from apps.users.models import User
 from cloudinary.models import CloudinaryField
-from django.db import models
+from django.db import models, transaction as db_transaction
 
 
 class Transaction(models.Model):
@@ -78,6 +80,40 @@ class Transaction(models.Model):
             f"{self.reference}{property_info}{method} - {self.amount} {self.currency}"
         )
 
+    @classmethod
+    def settle(cls, pk, status):
+        """
+        Move a transaction to ``status`` under a row lock and mark its
+        property sold or rented when the payment succeeded.
+
+        A successful transaction is never changed again, so concurrent
+        verifications of the same payment apply it once. Returns the
+        locked transaction and whether anything changed.
+        """
+        with db_transaction.atomic():
+            transaction = (
+                cls.objects.select_for_update(of=("self",))
+                .select_related("property_obj")
+                .get(pk=pk)
+            )
+            if transaction.status in (cls.Status.SUCCESSFUL, status):
+                return transaction, False
+
+            transaction.status = status
+            transaction.save(update_fields=["status", "updated_at"])
+
+            property_obj = transaction.property_obj
+            if status == cls.Status.SUCCESSFUL and property_obj:
+                property_status = {
+                    Property.ListingType.SALE: Property.PropertyStatus.SOLD,
+                    Property.ListingType.RENT: Property.PropertyStatus.RENTED,
+                }.get(property_obj.listing_type)
+                if property_status:
+                    property_obj.property_status = property_status
+                    property_obj.save()
+
+        return transaction, True
+
     @property
     def is_offline_payment(self):
         return self.payment_method == self.PaymentMethod.OFFLINE
@@ -92,3 +128,32 @@ class Transaction(models.Model):
         if self.property_obj:
             return self.property_obj.property_type
         return None
+
+
+class WebhookEvent(models.Model):
+    """Flutterwave webhook deliveries already handled, so replays are ignored"""
+
+    event_id = models.CharField(max_length=128, unique=True)
+    event = models.CharField(max_length=64)
+    tx_ref = models.CharField(max_length=100, blank=True)
+    payload = models.JSONField(default=dict)
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-received_at"]
+
+    def __str__(self):
+        return f"{self.event} {self.event_id}"
+
+    @staticmethod
+    def event_id_for(payload):
+        """
+        Flutterwave's charge id when present, otherwise a digest of the
+        payload, prefixed with the event type
+        """
+        event = payload.get("event") or ""
+        data = payload.get("data") or {}
+        if data.get("id"):
+            return f"{event}:{data['id']}"
+        body = json.dumps(payload, sort_keys=True, default=str)
+        return f"{event}:sha256:{hashlib.sha256(body.encode()).hexdigest()}"
@@ -0,0 +1,99 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.properties.models import Property
+from apps.transactions.models import Transaction
+
+
+@pytest.fixture
+def stale_transaction(create_transaction):
+    """Pending online transaction created an hour ago."""
+
+    def _stale_transaction(**kwargs):
+        transaction = create_transaction(
+            payment_method=Transaction.PaymentMethod.ONLINE,
+            status=Transaction.Status.PENDING,
+            **kwargs,
+        )
+        Transaction.objects.filter(pk=transaction.pk).update(
+            created_at=timezone.now() - timedelta(hours=1)
+        )
+        return transaction
+
+    return _stale_transaction
+
+
+@pytest.fixture
+def gateway(mocker):
+    """Map tx_ref to the Flutterwave verification result."""
+    results = {}
+    mocker.patch(
+        "apps.transactions.management.commands.reconcile_payments.verify_payment",
+        side_effect=lambda tx_ref: results.get(
+            tx_ref, {"success": False, "error": "No transaction was found"}
+        ),
+    )
+    return results
+
+
+def reconcile(*args):
+    out = StringIO()
+    call_command(
+        "reconcile_payments",
+        "--once",
+        "--batch-size",
+        "2",
+        *args,
+        stdout=out,
+        stderr=StringIO(),
+    )
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_reconcile_settles_stale_pending_transactions(
+    stale_transaction, create_transaction, gateway
+):
+    paid = stale_transaction(property_kwargs={"listing_type": Property.ListingType.SALE})
+    declined = stale_transaction()
+    waiting = stale_transaction()
+    lost = stale_transaction()
+    recent = create_transaction(status=Transaction.Status.PENDING)
+    gateway[paid.tx_ref] = {"success": True, "status": "successful"}
+    gateway[declined.tx_ref] = {"success": True, "status": "failed"}
+    gateway[waiting.tx_ref] = {"success": True, "status": "pending"}
+    gateway[recent.tx_ref] = {"success": True, "status": "successful"}
+
+    output = reconcile()
+
+    statuses = dict(Transaction.objects.values_list("tx_ref", "status"))
+    assert statuses == {
+        paid.tx_ref: Transaction.Status.SUCCESSFUL,
+        declined.tx_ref: Transaction.Status.FAILED,
+        waiting.tx_ref: Transaction.Status.PENDING,
+        lost.tx_ref: Transaction.Status.PENDING,
+        recent.tx_ref: Transaction.Status.PENDING,
+    }
+    paid.property_obj.refresh_from_db()
+    assert paid.property_obj.property_status == Property.PropertyStatus.SOLD
+    assert (
+        "Checked 4 pending transactions" in output
+        and "1 successful, 1 failed, 1 still pending, 1 errors" in output
+    )
+
+
+@pytest.mark.django_db
+def test_reconcile_dry_run_changes_nothing(stale_transaction, gateway):
+    paid = stale_transaction()
+    gateway[paid.tx_ref] = {"success": True, "status": "successful"}
+
+    output = reconcile("--dry-run")
+
+    paid.refresh_from_db()
+    assert paid.status == Transaction.Status.PENDING
+    assert f"Would mark {paid.tx_ref} successful" in output
+    assert "[dry run]" in output
@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from core.utils.flutterwave import GATEWAY_UNAVAILABLE, FlutterwaveClient
+
+
+class FakeGatewayHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the Flutterwave v3 payments and verify endpoints"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self._handle("payments", body)
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        self._handle("verify", query)
+
+    def _handle(self, endpoint, payload):
+        gateway = self.server
+        gateway.calls.append((endpoint, payload, self.headers.get("Authorization")))
+        status = gateway.statuses.pop(0) if gateway.statuses else 200
+        if gateway.delay:
+            time.sleep(gateway.delay)
+
+        if endpoint == "payments":
+            data = {"link": "https://checkout.test/pay", "flw_ref": "FLW-1"}
+        else:
+            data = {"status": "successful", "tx_ref": payload["tx_ref"][0]}
+        body = {"status": "success" if status == 200 else "error", "data": data}
+        self._reply(status, body)
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def gateway():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGatewayHandler)
+    server.daemon_threads = True
+    server.calls = []
+    server.statuses = []
+    server.delay = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(gateway):
+    return FlutterwaveClient(
+        secret_key="sk_test",
+        base_url=f"http://127.0.0.1:{gateway.server_port}/v3",
+        read_timeout=0.5,
+        verify_retries=2,
+        retry_backoff=0,
+        failure_threshold=2,
+        reset_timeout=60,
+    )
+
+
+@pytest.fixture
+def user():
+    return SimpleNamespace(
+        email="payer@test.com", first_name="Pay", last_name="Er", phone_number=""
+    )
+
+
+class TestFlutterwaveClient:
+    def test_initialize_payment(self, gateway, client, user):
+        result = client.initialize_payment(user, 5000, tx_ref="QABA-1")
+
+        assert result == {
+            "success": True,
+            "payment_link": "https://checkout.test/pay",
+            "flw_ref": "FLW-1",
+            "tx_ref": "QABA-1",
+        }
+        endpoint, payload, auth = gateway.calls[0]
+        assert endpoint == "payments"
+        assert payload["amount"] == "5000"
+        assert auth == "Bearer sk_test"
+
+    def test_verify_retries_gateway_errors(self, gateway, client):
+        gateway.statuses = [503, 502]
+
+        result = client.verify_payment("QABA-1")
+
+        assert result["success"] is True
+        assert result["status"] == "successful"
+        assert len(gateway.calls) == 3
+        assert client.breaker.state == client.breaker.CLOSED
+
+    def test_initialize_is_not_retried(self, gateway, client, user):
+        gateway.statuses = [503]
+
+        result = client.initialize_payment(user, 5000)
+
+        assert result["success"] is False
+        assert len(gateway.calls) == 1
+
+    def test_slow_gateway_times_out_and_opens_circuit(self, gateway, client, user):
+        gateway.delay = 1
+
+        started = time.monotonic()
+        for _ in range(2):
+            assert client.initialize_payment(user, 5000)["success"] is False
+        assert time.monotonic() - started < 2
+        assert client.breaker.state == client.breaker.OPEN
+
+        calls = len(gateway.calls)
+        result = client.verify_payment("QABA-1")
+
+        assert result == {"success": False, "error": GATEWAY_UNAVAILABLE}
+        assert len(gateway.calls) == calls
+        assert client.metrics()["endpoints"]["verify"]["rejected"] == 1
+
+    def test_half_open_trial_closes_circuit(self, gateway, client):
+        gateway.statuses = [500] * 6
+        for _ in range(2):
+            client.verify_payment("QABA-1")
+        assert client.breaker.state == client.breaker.OPEN
+
+        client.breaker.opened_at -= client.breaker.reset_timeout
+        assert client.verify_payment("QABA-1")["success"] is True
+        assert client.breaker.state == client.breaker.CLOSED
+
+    def test_metrics_per_endpoint(self, gateway, client, user):
+        client.initialize_payment(user, 5000)
+        for _ in range(3):
+            client.verify_payment("QABA-1")
+
+        metrics = client.metrics()
+
+        assert metrics["circuit"] == "closed"
+        assert metrics["endpoints"]["payments"]["calls"] == 1
+        assert metrics["endpoints"]["verify"]["calls"] == 3
+        assert metrics["endpoints"]["verify"]["errors"] == 0
+        assert metrics["endpoints"]["verify"]["p95_ms"] > 0
+
+
+@pytest.mark.django_db
+def test_payment_gateway_stats_is_staff_only(api_client, auth_client, client_user, admin_user):
+    assert api_client.get("/health/payments/").status_code in (401, 403)
+    assert auth_client(client_user).get("/health/payments/").status_code == 403
+
+    response = auth_client(admin_user).get("/health/payments/")
+
+    assert response.status_code == 200
+    assert response.data["data"]["circuit"] == "closed"
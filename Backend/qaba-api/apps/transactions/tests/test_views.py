@@ -1,10 +1,15 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
-from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from rest_framework import status
+from rest_framework.test import APIClient
 
 from apps.properties.models import Property
-from apps.transactions.models import Transaction
+from apps.transactions.models import Transaction, WebhookEvent
+from apps.users.models import Notification
 
 
 @pytest.mark.django_db
@@ -258,3 +263,122 @@ def test_flutterwave_webhook_invalid_signature(api_client):
         HTTP_VERIF_HASH="invalid",
     )
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+def test_flutterwave_webhook_replay_is_ignored(
+    api_client, settings, create_transaction, django_capture_on_commit_callbacks
+):
+    settings.FLUTTERWAVE_SECRET_HASH = "test-secret"
+    transaction = create_transaction(tx_ref="tx-replay", status=Transaction.Status.PENDING)
+    payload = {
+        "event": "charge.completed",
+        "data": {"id": 9001, "tx_ref": "tx-replay", "status": "successful"},
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        responses = [
+            api_client.post(
+                "/api/v1/webhooks/flutterwave/",
+                data=payload,
+                format="json",
+                HTTP_VERIF_HASH="test-secret",
+            )
+            for _ in range(2)
+        ]
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert responses[1].data["message"] == "Webhook already processed"
+    assert WebhookEvent.objects.filter(event_id="charge.completed:9001").count() == 1
+    transaction.refresh_from_db()
+    assert transaction.status == Transaction.Status.SUCCESSFUL
+    assert (
+        Notification.objects.filter(
+            user=transaction.user, notification_type="payment_successful"
+        ).count()
+        == 1
+    )
+
+
+@pytest.mark.skipif(
+    connection.vendor != "postgresql", reason="row locking needs PostgreSQL"
+)
+@pytest.mark.django_db(transaction=True)
+def test_parallel_duplicate_webhooks_process_once(settings, create_transaction):
+    settings.FLUTTERWAVE_SECRET_HASH = "test-secret"
+    transaction = create_transaction(
+        tx_ref="tx-parallel",
+        status=Transaction.Status.PENDING,
+        property_kwargs={"listing_type": Property.ListingType.SALE},
+    )
+    payload = {
+        "event": "charge.completed",
+        "data": {"id": 9002, "tx_ref": "tx-parallel", "status": "successful"},
+    }
+    barrier = threading.Barrier(6)
+
+    def deliver():
+        barrier.wait()
+        try:
+            return APIClient().post(
+                "/api/v1/webhooks/flutterwave/",
+                data=payload,
+                format="json",
+                HTTP_VERIF_HASH="test-secret",
+            )
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        responses = list(pool.map(lambda _: deliver(), range(6)))
+
+    messages = sorted(r.data["message"] for r in responses)
+    assert [r.status_code for r in responses] == [200] * 6
+    assert messages == ["Webhook already processed"] * 5 + ["Webhook received successfully"]
+    assert WebhookEvent.objects.count() == 1
+    transaction.refresh_from_db()
+    assert transaction.status == Transaction.Status.SUCCESSFUL
+    assert transaction.property_obj.property_status == Property.PropertyStatus.SOLD
+    assert (
+        Notification.objects.filter(notification_type="payment_successful").count() == 1
+    )
+
+
+@pytest.mark.django_db
+def test_transaction_csv_export_streams_rows(
+    auth_client, admin_user, client_user, create_transaction, mocker
+):
+    mocker.patch("core.utils.csv_export.ROWS_PER_BLOCK", 2)
+    transactions = [create_transaction(amount=1000 + i) for i in range(5)]
+
+    assert (
+        auth_client(client_user).get("/api/v1/exports/transactions/").status_code
+        == status.HTTP_403_FORBIDDEN
+    )
+    response = auth_client(admin_user).get("/api/v1/exports/transactions/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv"
+    chunks = list(response.streaming_content)
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert lines[0].startswith("id,reference,tx_ref,flw_ref,user__email")
+    assert len(lines) == 6
+    assert {line.split(",")[2] for line in lines[1:]} == {t.tx_ref for t in transactions}
+
+
+@pytest.mark.django_db
+def test_csv_export_date_filter_and_unknown_export(auth_client, admin_user):
+    client = auth_client(admin_user)
+
+    response = client.get("/api/v1/exports/users/", {"from": "2999-01-01"})
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines == [
+        "id,email,first_name,last_name,phone_number,user_type,is_active,"
+        "is_email_verified,date_joined,last_login"
+    ]
+
+    assert client.get("/api/v1/exports/users/", {"from": "soon"}).status_code == 400
+    assert client.get("/api/v1/exports/users/", {"from": "2024-02-30"}).status_code == 400
+    assert client.get("/api/v1/exports/unknown/").status_code == 404
@@ -1,16 +1,20 @@
 import uuid
+from functools import partial
 
-from apps.properties.models import Property
-from core.utils.flutterwave import initialize_payment, verify_payment
-from core.utils.response import APIResponse
 from django.conf import settings
+from django.db import transaction as db_transaction
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
-from rest_framework import permissions, status
+from rest_framework import permissions
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.views import APIView
 
-from .models import Transaction
+from apps.properties.models import Property
+from core.utils.flutterwave import initialize_payment, verify_payment
+from core.utils.notifications import notify
+from core.utils.response import APIResponse
+
+from .models import Transaction, WebhookEvent
 from .serializers import (
     OfflinePaymentSerializer,
     PropertyPaymentSerializer,
@@ -36,44 +40,61 @@ class FlutterwaveWebhookView(APIView):
         try:
             payload = request.data
             event = payload.get("event")
-            data = payload.get("data")
+            data = payload.get("data") or {}
+            tx_ref = data.get("tx_ref") or ""
 
+            transaction_id = None
             if event == "charge.completed":
-                tx_ref = data.get("tx_ref")
-                status = data.get("status")
-
-                try:
-                    transaction = Transaction.objects.get(tx_ref=tx_ref)
-                    if status == "successful":
-                        transaction.status = Transaction.Status.SUCCESSFUL
-
-                        property_obj = transaction.property_obj
-
-                        if property_obj.listing_type == Property.ListingType.SALE:
-                            property_obj.property_status = Property.PropertyStatus.SOLD
-                            property_obj.save()
-
-                        elif property_obj.listing_type == Property.ListingType.RENT:
-                            property_obj.property_status = (
-                                Property.PropertyStatus.RENTED
-                            )
-                            property_obj.save()
-
-                        transaction.save()
-
-                    elif status == "failed":
-                        transaction.status = Transaction.Status.FAILED
-                        transaction.save()
-
-                except Transaction.DoesNotExist:
+                transaction_id = (
+                    Transaction.objects.filter(tx_ref=tx_ref)
+                    .values_list("pk", flat=True)
+                    .first()
+                )
+                if transaction_id is None:
                     return APIResponse.not_found(message="Transaction not found")
 
+            with db_transaction.atomic():
+                # Concurrent deliveries of one event block on the unique
+                # event_id, so only the first is processed
+                _, created = WebhookEvent.objects.get_or_create(
+                    event_id=WebhookEvent.event_id_for(payload),
+                    defaults={"event": event or "", "tx_ref": tx_ref, "payload": payload},
+                )
+                if not created:
+                    return APIResponse.success(message="Webhook already processed")
+
+                new_status = {
+                    "successful": Transaction.Status.SUCCESSFUL,
+                    "failed": Transaction.Status.FAILED,
+                }.get(data.get("status"))
+                if transaction_id and new_status:
+                    transaction, changed = Transaction.settle(transaction_id, new_status)
+                    if changed and transaction.status == Transaction.Status.SUCCESSFUL:
+                        db_transaction.on_commit(
+                            partial(notify_payment_successful, transaction)
+                        )
+
             return APIResponse.success(message="Webhook received successfully")
 
         except Exception as e:
             return APIResponse.bad_request(message=str(e))
 
 
+def notify_payment_successful(transaction):
+    """Tell the payer their payment went through, after the webhook commits"""
+    property_name = (
+        transaction.property_obj.property_name if transaction.property_obj else ""
+    )
+    notify(
+        [transaction.user_id],
+        title="Payment successful",
+        message=f"Your payment of {transaction.amount} {transaction.currency} "
+        f"for {property_name or 'your purchase'} was successful.",
+        notification_type="payment_successful",
+        metadata={"transaction_id": str(transaction.id), "tx_ref": transaction.tx_ref},
+    )
+
+
 @extend_schema(tags=["Transactions"])
 class InitiatePropertyPaymentView(APIView):
     """View to initiate a property payment with Flutterwave"""
@@ -210,30 +231,19 @@ class VerifyPaymentView(APIView):
 
         if verification["success"]:
             flw_status = verification.get("status", "").lower()
+            transaction, _ = Transaction.settle(
+                transaction.pk,
+                Transaction.Status.SUCCESSFUL
+                if flw_status == "successful"
+                else Transaction.Status.FAILED,
+            )
 
-            if flw_status == "successful":
-                transaction.status = Transaction.Status.SUCCESSFUL
-
-                property_obj = transaction.property_obj
-
-                if property_obj.listing_type == Property.ListingType.SALE:
-                    property_obj.property_status = Property.PropertyStatus.SOLD
-                    property_obj.save()
-
-                elif property_obj.listing_type == Property.ListingType.RENT:
-                    property_obj.property_status = Property.PropertyStatus.RENTED
-                    property_obj.save()
-
-                transaction.save()
-
+            if transaction.status == Transaction.Status.SUCCESSFUL:
                 return APIResponse.success(
                     data=TransactionSerializer(transaction).data,
                     message="Payment successful",
                 )
 
-            transaction.status = Transaction.Status.FAILED
-            transaction.save()
-
             return APIResponse.bad_request(
                 data=TransactionSerializer(transaction).data,
                 message="Payment failed",
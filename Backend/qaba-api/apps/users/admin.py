@@ -3,10 +3,13 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.http import HttpResponseRedirect
 from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 
+from core.utils.csv_export import stream_csv
+from core.utils.notifications import notify
 from core.utils.send_email import send_email
 
 from .models import (
@@ -15,6 +18,7 @@ from .models import (
     ClientProfile,
     LandlordProfile,
     Notification,
+    OutboundEmail,
     PropertySurveyMeeting,
     Referral,
     User,
@@ -229,7 +233,7 @@ class UserAdmin(BaseUserAdmin):
         formset.save_m2m()
 
     # Admin actions
-    actions = ["verify_email", "activate_users", "deactivate_users"]
+    actions = ["verify_email", "activate_users", "deactivate_users", "export_as_csv"]
 
     @admin.action(description="Verify selected users email")
     def verify_email(self, request, queryset):
@@ -248,6 +252,10 @@ class UserAdmin(BaseUserAdmin):
         queryset.update(is_active=False)
         self.message_user(request, f"{queryset.count()} users were deactivated.")
 
+    @admin.action(description="Export selected users as CSV")
+    def export_as_csv(self, request, queryset):
+        return stream_csv("users", queryset)
+
 
 @admin.register(ClientProfile)
 class ClientProfileAdmin(admin.ModelAdmin):
@@ -561,8 +569,8 @@ class NotificationAdmin(admin.ModelAdmin):
                     property_obj.save()
 
                     # Create approval notification for property owner
-                    Notification.objects.create(
-                        user=property_obj.listed_by,
+                    notify(
+                        [property_obj.listed_by],
                         title="Property Approved",
                         message=f"Your property '{property_obj.property_name}' has been approved and is now live on the platform.",
                         notification_type="property_approved",
@@ -585,8 +593,8 @@ class NotificationAdmin(admin.ModelAdmin):
                     property_obj.save()
 
                     # Create decline notification for property owner
-                    Notification.objects.create(
-                        user=property_obj.listed_by,
+                    notify(
+                        [property_obj.listed_by],
                         title="Property Declined",
                         message=f"Your property '{property_obj.property_name}' has been declined. Please review and resubmit with necessary changes.",
                         notification_type="property_declined",
@@ -968,7 +976,11 @@ class PropertySurveyMeetingAdmin(admin.ModelAdmin):
                 logger = logging.getLogger(__name__)
                 logger.error(f"Failed to send meeting status update email: {str(e)}")
 
-    actions = ["mark_completed"]
+    actions = ["mark_completed", "export_as_csv"]
+
+    @admin.action(description="Export selected meetings as CSV")
+    def export_as_csv(self, request, queryset):
+        return stream_csv("survey-meetings", queryset)
 
     @admin.action(description="Mark selected meetings as completed")
     def mark_completed(self, request, queryset):
@@ -994,3 +1006,40 @@ class PropertySurveyMeetingAdmin(admin.ModelAdmin):
         self.message_user(
             request, f"{completed_count} meetings were marked as completed."
         )
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        "subject",
+        "recipient_list",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "created_at",
+        "sent_at",
+    )
+    list_filter = ("status", "created_at")
+    search_fields = ("subject", "to", "idempotency_key")
+    readonly_fields = [field.name for field in OutboundEmail._meta.fields]
+    date_hierarchy = "created_at"
+    list_per_page = 50
+    actions = ["retry_emails"]
+
+    def recipient_list(self, obj):
+        return ", ".join(obj.to)
+
+    recipient_list.short_description = "To"
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Retry selected emails")
+    def retry_emails(self, request, queryset):
+        updated = queryset.exclude(status=OutboundEmail.Status.SENT).update(
+            status=OutboundEmail.Status.PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now(),
+            locked_at=None,
+        )
+        self.message_user(request, f"{updated} emails were queued for retry.")
@@ -4,3 +4,21 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.users"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from core.utils.notifications import invalidate_admin_recipients
+
+        from .models import User
+
+        post_save.connect(
+            invalidate_admin_recipients,
+            sender=User,
+            dispatch_uid="invalidate_admin_recipients_on_save",
+        )
+        post_delete.connect(
+            invalidate_admin_recipients,
+            sender=User,
+            dispatch_uid="invalidate_admin_recipients_on_delete",
+        )
@@ -0,0 +1,66 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.utils.email_queue import process_queue, prune_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver queued outbound emails. Runs until interrupted unless "
+        "--once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process a single batch and exit",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Emails claimed per batch (default: 50)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when the queue is empty (default: 5)",
+        )
+        parser.add_argument(
+            "--prune-interval",
+            type=float,
+            default=3600.0,
+            help="Seconds between deletions of expired sent and dead emails "
+            "(default: 3600)",
+        )
+
+    def handle(self, *args, **options):
+        pruned_at = None
+        while True:
+            if (
+                pruned_at is None
+                or time.monotonic() - pruned_at >= options["prune_interval"]
+            ):
+                pruned = prune_queue()
+                pruned_at = time.monotonic()
+                if pruned:
+                    self.stdout.write(f"Pruned {pruned} expired emails")
+
+            outcomes = process_queue(batch_size=options["batch_size"])
+            processed = sum(outcomes.values())
+            if processed:
+                self.stdout.write(
+                    f"Sent {outcomes['sent']}, retrying {outcomes['retried']}, "
+                    f"dead-lettered {outcomes['dead']}"
+                )
+
+            if options["once"]:
+                break
+            if processed < options["batch_size"]:
+                try:
+                    time.sleep(options["interval"])
+                except KeyboardInterrupt:
+                    break
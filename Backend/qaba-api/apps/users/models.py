@@ -306,6 +306,62 @@ class PropertySurveyMeeting(models.Model):
         super().save(*args, **kwargs)
 
 
+class OutboundEmail(models.Model):
+    """
+    Rendered email waiting to be delivered by the ``process_email_queue``
+    worker. Failed sends are retried with exponential backoff until
+    ``max_attempts`` is reached, after which the row is dead-lettered.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        SENDING = "SENDING", "Sending"
+        SENT = "SENT", "Sent"
+        DEAD = "DEAD", "Dead letter"
+
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        help_text="Enqueuing the same key twice only stores the first email",
+    )
+    subject = models.CharField(max_length=998)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    html_body = models.TextField()
+    text_body = models.TextField(blank=True)
+    attachments = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="List of [filename, base64 content, mimetype]",
+    )
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=8)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"], name="outbound_email_due_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.get_status_display()})"
+
+
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     """Create appropriate profile when a user is created"""
@@ -5,6 +5,8 @@ from django.contrib.auth import authenticate
 from django.utils import timezone
 from rest_framework import serializers
 
+from core.utils.media_urls import resource_url
+
 from .models import (
     OTP,
     AgentProfile,
@@ -68,9 +70,7 @@ class ClientProfileSerializer(serializers.ModelSerializer):
         ]
 
     def get_profile_photo_url(self, obj):
-        if obj.profile_photo:
-            return obj.profile_photo.url
-        return None
+        return resource_url(obj.profile_photo)
 
 
 class AgentProfileSerializer(serializers.ModelSerializer):
@@ -88,9 +88,7 @@ class AgentProfileSerializer(serializers.ModelSerializer):
         ]
 
     def get_profile_photo_url(self, obj):
-        if obj.profile_photo:
-            return obj.profile_photo.url
-        return None
+        return resource_url(obj.profile_photo)
 
 
 class LandlordProfileSerializer(serializers.ModelSerializer):
@@ -108,9 +106,7 @@ class LandlordProfileSerializer(serializers.ModelSerializer):
         ]
 
     def get_profile_photo_url(self, obj):
-        if obj.profile_photo:
-            return obj.profile_photo.url
-        return None
+        return resource_url(obj.profile_photo)
 
 
 class BaseUserRegistrationSerializer(serializers.ModelSerializer):
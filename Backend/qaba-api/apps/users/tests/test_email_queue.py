@@ -0,0 +1,190 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.users.models import OutboundEmail
+from core.utils.send_email import send_email
+
+
+@pytest.fixture(autouse=True)
+def email_queue_enabled(settings):
+    settings.EMAIL_QUEUE_ENABLED = True
+
+
+@pytest.fixture
+def mock_graph_send(mocker):
+    """Mock the Microsoft Graph call made by the queue worker."""
+    return mocker.patch("core.utils.microsoft_graph_email.send_mail_via_graph")
+
+
+def run_worker():
+    call_command("process_email_queue", "--once")
+
+
+@pytest.mark.django_db
+class TestEmailQueue:
+    def test_send_email_enqueues_without_calling_graph(self, mock_graph_send):
+        result = send_email(
+            subject="Hello",
+            recipients="someone@test.com",
+            template_name="contact_confirmation",
+            context={"name": "Someone"},
+        )
+
+        assert result["success"] is True
+        assert result["queued"] is True
+        email = OutboundEmail.objects.get(pk=result["email_id"])
+        assert email.to == ["someone@test.com"]
+        assert email.status == OutboundEmail.Status.PENDING
+        assert "Someone" in email.html_body
+        mock_graph_send.assert_not_called()
+
+    def test_idempotency_key_queues_email_once(self):
+        for _ in range(2):
+            send_email(
+                subject="Hello",
+                recipients=["someone@test.com"],
+                template_name="contact_confirmation",
+                context={"name": "Someone"},
+                idempotency_key="contact:1",
+            )
+
+        assert OutboundEmail.objects.filter(idempotency_key="contact:1").count() == 1
+
+    def test_worker_sends_due_emails(self, mock_graph_send):
+        send_email(
+            subject="Hello",
+            recipients=["someone@test.com"],
+            template_name="contact_confirmation",
+            context={"name": "Someone"},
+        )
+
+        run_worker()
+
+        email = OutboundEmail.objects.get()
+        assert email.status == OutboundEmail.Status.SENT
+        assert email.attempts == 1
+        assert email.sent_at is not None
+        assert mock_graph_send.call_args.kwargs["to"] == ["someone@test.com"]
+        assert "Someone" in mock_graph_send.call_args.kwargs["body_html"]
+        assert (email.html_body, email.text_body) == ("", "")
+
+    def test_worker_backs_off_then_dead_letters(self, settings, mock_graph_send):
+        settings.EMAIL_QUEUE_MAX_ATTEMPTS = 3
+        mock_graph_send.side_effect = RuntimeError("Graph is down")
+        send_email(
+            subject="Hello",
+            recipients=["someone@test.com"],
+            template_name="contact_confirmation",
+            context={"name": "Someone"},
+        )
+        email = OutboundEmail.objects.get()
+
+        delays = []
+        for _ in range(3):
+            before = timezone.now()
+            run_worker()
+            email.refresh_from_db()
+            delays.append(email.next_attempt_at - before)
+            OutboundEmail.objects.filter(pk=email.pk).update(
+                next_attempt_at=timezone.now() - timedelta(seconds=1)
+            )
+
+        assert email.status == OutboundEmail.Status.DEAD
+        assert email.attempts == 3
+        assert email.last_error == "Graph is down"
+        assert delays[1] > delays[0]
+
+        # Dead letters are never picked up again
+        run_worker()
+        assert mock_graph_send.call_count == 3
+
+    def test_worker_reclaims_emails_from_a_crashed_worker(self, mock_graph_send):
+        send_email(
+            subject="Hello",
+            recipients=["someone@test.com"],
+            template_name="contact_confirmation",
+            context={"name": "Someone"},
+        )
+        OutboundEmail.objects.update(
+            status=OutboundEmail.Status.SENDING,
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+
+        before = timezone.now()
+        run_worker()
+
+        email = OutboundEmail.objects.get()
+        assert email.status == OutboundEmail.Status.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt_at > before
+        mock_graph_send.assert_not_called()
+
+        OutboundEmail.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        run_worker()
+
+        email.refresh_from_db()
+        assert email.status == OutboundEmail.Status.SENT
+        assert email.attempts == 2
+
+    def test_worker_dead_letters_emails_that_keep_crashing_workers(
+        self, settings, mock_graph_send
+    ):
+        settings.EMAIL_QUEUE_MAX_ATTEMPTS = 3
+        send_email(
+            subject="Hello",
+            recipients=["someone@test.com"],
+            template_name="contact_confirmation",
+            context={"name": "Someone"},
+        )
+
+        for _ in range(3):
+            # Every worker that claims the email dies before recording it
+            OutboundEmail.objects.update(
+                status=OutboundEmail.Status.SENDING,
+                locked_at=timezone.now() - timedelta(hours=1),
+                next_attempt_at=timezone.now() - timedelta(seconds=1),
+            )
+            run_worker()
+
+        email = OutboundEmail.objects.get()
+        assert email.status == OutboundEmail.Status.DEAD
+        assert email.attempts == 3
+        assert "lock timed out" in email.last_error
+        mock_graph_send.assert_not_called()
+
+    def test_worker_prunes_expired_sent_and_dead_emails(self, settings, mock_graph_send):
+        settings.EMAIL_QUEUE_RETENTION_DAYS = 7
+        for key, status in [
+            ("old-sent", OutboundEmail.Status.SENT),
+            ("old-dead", OutboundEmail.Status.DEAD),
+            ("old-pending", OutboundEmail.Status.PENDING),
+        ]:
+            send_email(
+                subject="Hello",
+                recipients=["someone@test.com"],
+                template_name="contact_confirmation",
+                context={"name": "Someone"},
+                idempotency_key=key,
+            )
+            OutboundEmail.objects.filter(idempotency_key=key).update(
+                status=status,
+                next_attempt_at=timezone.now() + timedelta(days=1),
+                updated_at=timezone.now() - timedelta(days=8),
+            )
+        send_email(
+            subject="Hello",
+            recipients=["someone@test.com"],
+            template_name="contact_confirmation",
+            context={"name": "Someone"},
+            idempotency_key="recent",
+        )
+
+        run_worker()
+
+        assert set(OutboundEmail.objects.values_list("idempotency_key", flat=True)) == {
+            "old-pending",
+            "recent",
+        }
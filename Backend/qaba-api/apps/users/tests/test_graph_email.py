@@ -0,0 +1,119 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from django.core.management import call_command
+
+from apps.users.models import OutboundEmail
+from core.utils import microsoft_graph_email
+from core.utils.email_queue import enqueue_email
+
+
+class StubGraphHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the Graph sendMail and $batch endpoints"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        server.calls.append((self.path, body))
+        server.ports.add(self.client_address[1])
+
+        if self.path.endswith("/$batch"):
+            responses = []
+            for request in body["requests"]:
+                recipient = request["body"]["message"]["toRecipients"][0]
+                address = recipient["emailAddress"]["address"]
+                status = 400 if address in server.rejected else 202
+                responses.append({"id": request["id"], "status": status, "body": {}})
+            self._reply(200, {"responses": responses})
+        else:
+            self._reply(202, None)
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def graph_server(settings, mocker):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGraphHandler)
+    server.calls = []
+    server.ports = set()
+    server.rejected = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    settings.MICROSOFT_GRAPH_API_ROOT = f"http://127.0.0.1:{server.server_port}/v1.0"
+    settings.MICROSOFT_TENANT_ID = "tenant"
+    settings.MICROSOFT_CLIENT_ID = "client"
+    settings.MICROSOFT_CLIENT_SECRET = "secret"
+    settings.MICROSOFT_SENDER_EMAIL = "noreply@test.com"
+    mocker.patch.object(microsoft_graph_email, "_acquire_token", return_value="token")
+    mocker.patch.object(microsoft_graph_email, "_SESSION", None)
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def message(address):
+    return {
+        "subject": "Hello",
+        "body_html": "<p>Hello</p>",
+        "body_text": "Hello",
+        "to": [address],
+    }
+
+
+class TestGraphEmail:
+    def test_sends_reuse_one_pooled_connection(self, graph_server):
+        for i in range(3):
+            microsoft_graph_email.send_mail_via_graph(**message(f"user{i}@test.com"))
+
+        assert [path for path, _ in graph_server.calls] == [
+            "/v1.0/users/noreply@test.com/sendMail"
+        ] * 3
+        assert len(graph_server.ports) == 1
+
+    def test_batch_sends_twenty_messages_per_request(self, graph_server):
+        graph_server.rejected.add("user21@test.com")
+        messages = [message(f"user{i}@test.com") for i in range(25)]
+
+        errors = microsoft_graph_email.send_batch_via_graph(messages)
+
+        assert [path for path, _ in graph_server.calls] == ["/v1.0/$batch"] * 2
+        assert [len(body["requests"]) for _, body in graph_server.calls] == [20, 5]
+        first = graph_server.calls[0][1]["requests"][0]
+        assert first["method"] == "POST"
+        assert first["url"] == "/users/noreply@test.com/sendMail"
+        assert [i for i, error in enumerate(errors) if error] == [21]
+        assert "400" in errors[21]
+
+    @pytest.mark.django_db
+    def test_worker_delivers_queued_emails_in_batches(self, graph_server):
+        graph_server.rejected.add("bounce@test.com")
+        for address in ["a@test.com", "b@test.com", "bounce@test.com"]:
+            enqueue_email(subject="Hello", to=[address], html_body="<p>Hello</p>")
+
+        call_command("process_email_queue", "--once")
+
+        assert len(graph_server.calls) == 1
+        outcomes = sorted(
+            (email.to[0], email.status) for email in OutboundEmail.objects.all()
+        )
+        assert outcomes == [
+            ("a@test.com", OutboundEmail.Status.SENT),
+            ("b@test.com", OutboundEmail.Status.SENT),
+            ("bounce@test.com", OutboundEmail.Status.PENDING),
+        ]
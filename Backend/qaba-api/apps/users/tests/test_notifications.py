@@ -93,3 +93,58 @@ class TestNotificationMarkReadView:
         url = f"/api/v1/notifications/{notification.id}/read/"
         response = api_client.put(url)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestNotificationService:
+    """Tests for core.utils.notifications"""
+
+    def test_notify_admins_fans_out_with_one_insert(
+        self, admin_user, create_user, django_assert_num_queries
+    ):
+        from apps.users.models import Notification
+        from core.utils.notifications import get_admin_recipients, notify_admins
+
+        second_admin = create_user("admin2@test.com", user_type="ADMIN")
+        get_admin_recipients()
+
+        with django_assert_num_queries(1):
+            notify_admins(title="Heads up", message="Something happened")
+
+        assert set(
+            Notification.objects.filter(title="Heads up").values_list(
+                "user_id", flat=True
+            )
+        ) == {admin_user.id, second_admin.id}
+
+    def test_admin_recipients_cache_is_invalidated_on_user_change(
+        self, admin_user, create_user, django_assert_num_queries
+    ):
+        from core.utils.notifications import get_admin_emails
+
+        assert get_admin_emails() == ["admin@test.com"]
+        with django_assert_num_queries(0):
+            get_admin_emails()
+
+        new_admin = create_user("admin2@test.com", user_type="ADMIN")
+        assert get_admin_emails() == ["admin@test.com", "admin2@test.com"]
+
+        new_admin.user_type = "CLIENT"
+        new_admin.save()
+        assert get_admin_emails() == ["admin@test.com"]
+
+    def test_login_does_not_invalidate_admin_recipients(
+        self, admin_user, django_assert_num_queries
+    ):
+        from django.contrib.auth.models import update_last_login
+
+        from core.utils.notifications import get_admin_emails
+
+        get_admin_emails()
+        update_last_login(None, admin_user)
+        with django_assert_num_queries(0):
+            get_admin_emails()
+
+        admin_user.user_type = "CLIENT"
+        admin_user.save(update_fields=["user_type"])
+        assert get_admin_emails() == []
@@ -16,6 +16,7 @@ from rest_framework_simplejwt.views import TokenRefreshView
 
 from apps.users.models import Notification
 from apps.users.permissions import IsAgentOrLandlord, IsClient
+from core.utils.notifications import notify
 from core.utils.response import APIResponse
 from core.utils.send_email import (
     send_password_reset_email,
@@ -248,8 +249,8 @@ class ClientProfileView(APIView):
 
         if not hasattr(request.user, "clientprofile"):
             profile = ClientProfile.objects.create(user=request.user)
-            Notification.objects.create(
-                user=request.user,
+            notify(
+                [request.user],
                 message="Your profile has been created. Please update your details in the profile section.",
             )
         else:
@@ -268,8 +269,8 @@ class ClientProfileView(APIView):
 
         if not hasattr(request.user, "clientprofile"):
             profile = ClientProfile.objects.create(user=request.user)
-            Notification.objects.create(
-                user=request.user,
+            notify(
+                [request.user],
                 message="Your profile has been created. Please update your details in the profile section.",
             )
         else:
@@ -478,8 +479,8 @@ class OTPVerificationView(APIView):
                 profile_created = True
 
             if profile_created:
-                Notification.objects.create(
-                    user=user,
+                notify(
+                    [user],
                     message="Your profile has been created. Please update your details in the profile section.",
                 )
 
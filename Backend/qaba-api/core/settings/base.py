@@ -61,6 +61,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third-party apps
     "corsheaders",  # Add this line
     "django_otp",
@@ -115,6 +116,34 @@ WSGI_APPLICATION = "core.wsgi.application"
 
 PASSWORD_RESET_TIMEOUT = int(getenv("PASSWORD_RESET_TIMEOUT", 3600))
 
+# Caching: Redis when REDIS_URL is set (needs the `redis` extra installed),
+# local memory per process otherwise
+REDIS_URL = getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "qaba",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "qaba-default",
+        }
+    }
+
+# Cache versions are bumped in whichever process handled the write, so a
+# per-process cache would keep serving stale responses from every other
+# worker: response caching is off unless the cache is shared
+RESPONSE_CACHE_ENABLED = (
+    getenv("RESPONSE_CACHE_ENABLED", str(bool(REDIS_URL))) == "True"
+)
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(getenv("RESPONSE_CACHE_TIMEOUT", 300))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -200,8 +229,21 @@ MICROSOFT_SENDER_EMAIL = getenv("MICROSOFT_SENDER_EMAIL", getenv("DEFAULT_FROM_E
 MICROSOFT_GRAPH_SCOPE = getenv(
     "MICROSOFT_GRAPH_SCOPE", "https://graph.microsoft.com/.default"
 )
+MICROSOFT_GRAPH_API_ROOT = getenv(
+    "MICROSOFT_GRAPH_API_ROOT", "https://graph.microsoft.com/v1.0"
+)
 DEFAULT_FROM_EMAIL = getenv("DEFAULT_FROM_EMAIL", "contact@qarba.com")
 
+# Outbound email queue, drained by `manage.py process_email_queue`. Off by
+# default: without a running worker queued emails would never be delivered
+EMAIL_QUEUE_ENABLED = getenv("EMAIL_QUEUE_ENABLED", "False") == "True"
+EMAIL_QUEUE_MAX_ATTEMPTS = int(getenv("EMAIL_QUEUE_MAX_ATTEMPTS", 8))
+EMAIL_QUEUE_BACKOFF_BASE = int(getenv("EMAIL_QUEUE_BACKOFF_BASE", 30))
+EMAIL_QUEUE_BACKOFF_MAX = int(getenv("EMAIL_QUEUE_BACKOFF_MAX", 3600))
+EMAIL_QUEUE_LOCK_TIMEOUT = int(getenv("EMAIL_QUEUE_LOCK_TIMEOUT", 600))
+# Days sent and dead-lettered emails are kept before the worker deletes them
+EMAIL_QUEUE_RETENTION_DAYS = int(getenv("EMAIL_QUEUE_RETENTION_DAYS", 7))
+
 GOOGLE_CLIENT_ID = getenv("GOOGLE_CLIENT_ID", "").strip()
 
 CORS_ALLOW_CREDENTIALS = True
@@ -249,7 +291,41 @@ CLOUDINARY_FOLDERS = {
     "property_videos": "qaba/properties/videos",
     "job_applications": "qaba/jobs/applications",
 }
+# Property media in one request is uploaded to Cloudinary on this many threads
+MEDIA_UPLOAD_WORKERS = int(getenv("MEDIA_UPLOAD_WORKERS", 4))
+# Seconds a signed direct-upload ticket stays valid for the confirm step
+MEDIA_UPLOAD_TICKET_MAX_AGE = int(getenv("MEDIA_UPLOAD_TICKET_MAX_AGE", 900))
+
+# Serve the agent analytics dashboard from the AgentMonthlyAnalytics rollup
+# instead of aggregating Property rows on every request. Run
+# `manage.py rebuild_agent_analytics` once after turning it on.
+AGENT_ANALYTICS_ROLLUP = getenv("AGENT_ANALYTICS_ROLLUP", "False") == "True"
+
+# Longest each process keeps its copy of the amenity table, in seconds.
+# Amenity changes reach other processes sooner through the shared cache.
+AMENITY_CATALOG_TTL = int(getenv("AMENITY_CATALOG_TTL", 60))
+
+# Similar listings stored per property by apps.properties.recommender. Run
+# `manage.py rebuild_related_properties` after changing it.
+RELATED_PROPERTIES_TOP_K = int(getenv("RELATED_PROPERTIES_TOP_K", 12))
+
+# Longest a cached price statistics snapshot is served before it is reread,
+# in seconds. Property saves and deletes drop it sooner, but only in the
+# process that made them when the cache is not shared, so it defaults to
+# the response cache timeout
+PRICE_STATS_SNAPSHOT_TIMEOUT = int(
+    getenv("PRICE_STATS_SNAPSHOT_TIMEOUT", RESPONSE_CACHE_TIMEOUT)
+)
 
 FLW_SECRET_KEY = getenv("FLW_SECRET_KEY", "your-default-secret-key")
 PAYMENT_REDIRECT_URL = getenv("PAYMENT_REDIRECT_URL", "http://localhost:3000")
 FLUTTERWAVE_SECRET_HASH = getenv("FLUTTERWAVE_SECRET_HASH", "your-default-secret-hash")
+FLW_API_ROOT = getenv("FLW_API_ROOT", "https://api.flutterwave.com/v3")
+# (connect, read) timeouts in seconds for every Flutterwave call
+FLW_CONNECT_TIMEOUT = float(getenv("FLW_CONNECT_TIMEOUT", 3.05))
+FLW_READ_TIMEOUT = float(getenv("FLW_READ_TIMEOUT", 15))
+FLW_VERIFY_RETRIES = int(getenv("FLW_VERIFY_RETRIES", 2))
+# Refuse calls for FLW_CIRCUIT_RESET_TIMEOUT seconds after this many
+# consecutive gateway failures
+FLW_CIRCUIT_FAILURE_THRESHOLD = int(getenv("FLW_CIRCUIT_FAILURE_THRESHOLD", 5))
+FLW_CIRCUIT_RESET_TIMEOUT = float(getenv("FLW_CIRCUIT_RESET_TIMEOUT", 30))
@@ -11,6 +11,10 @@ ALLOWED_HOSTS = ["*"]
 # Use local file storage in development to avoid external dependencies
 DEFAULT_FILE_STORAGE = "django.core.files.storage.FileSystemStorage"
 
+# runserver is a single process, so its local memory cache is safe to
+# serve cached responses from
+RESPONSE_CACHE_ENABLED = getenv("RESPONSE_CACHE_ENABLED", "True") == "True"
+
 # Send emails to console in development
 EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
@@ -3,7 +3,7 @@ from django.urls import include, path
 from two_factor import urls as two_factor_urls
 from two_factor.admin import AdminSiteOTPRequired
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
-from .views import health_check
+from .views import cache_stats, export_csv, health_check, payment_gateway_stats
 
 admin.site.__class__ = AdminSiteOTPRequired
 
@@ -17,7 +17,10 @@ urlpatterns = [
     path('api/v1/', include('apps.transactions.urls')),
     path('api/v1/', include('apps.blogs.urls')),
     path('api/v1/', include('apps.jobs.urls')),
+    path('api/v1/exports/<slug:name>/', export_csv, name='csv-export'),
     path('health/', health_check, name='health'),
+    path('health/cache/', cache_stats, name='cache-stats'),
+    path('health/payments/', payment_gateway_stats, name='payment-gateway-stats'),
     path('schema/', SpectacularAPIView.as_view(), name='schema'),
     path('docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
 ]
@@ -0,0 +1,161 @@
+import hashlib
+from functools import partial, wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = "response-cache:version:{namespace}"
+RESPONSE_KEY = "response-cache:{namespace}:v{version}:{digest}"
+STATS_KEY = "response-cache:stats:{namespace}:{outcome}"
+
+_namespaces = set()
+
+
+def get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def get_version(namespace):
+    cache = get_cache()
+    key = VERSION_KEY.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, timeout=None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate every cached response in ``namespace`` at once"""
+    cache = get_cache()
+    key = VERSION_KEY.format(namespace=namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, timeout=None)
+
+
+def bump_version_on_commit(namespace):
+    """
+    ``bump_version`` once the current transaction commits, so a request
+    served before then cannot cache the old rows under the new version
+    """
+    transaction.on_commit(partial(bump_version, namespace))
+
+
+def _record(namespace, outcome):
+    cache = get_cache()
+    key = STATS_KEY.format(namespace=namespace, outcome=outcome)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def response_cache_stats():
+    """Hit/miss counters per namespace since the cache was last cleared"""
+    cache = get_cache()
+    stats = {}
+    for namespace in sorted(_namespaces):
+        hits = cache.get(STATS_KEY.format(namespace=namespace, outcome="hit"), 0)
+        misses = cache.get(STATS_KEY.format(namespace=namespace, outcome="miss"), 0)
+        lookups = hits + misses
+        stats[namespace] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0,
+            "version": get_version(namespace),
+        }
+    return stats
+
+
+def build_cache_key(namespace, request, kwargs):
+    """
+    Key on host, path, URL kwargs and the query string with its parameters
+    sorted, so ``?b=2&a=1`` and ``?a=1&b=2`` share an entry
+    """
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+    )
+    raw = "|".join(
+        [
+            request.get_host(),
+            request.path,
+            urlencode(sorted(kwargs.items())),
+            query,
+        ]
+    )
+    digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    return RESPONSE_KEY.format(
+        namespace=namespace, version=get_version(namespace), digest=digest
+    )
+
+
+def cache_public_response(namespace):
+    """
+    Cache successful GET responses for anonymous visitors.
+
+    Authenticated users always get a fresh response because listings vary by
+    user (favorites, own drafts). Entries are dropped by bumping the
+    namespace version, see ``invalidate_on_change``.
+    """
+    _namespaces.add(namespace)
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(self, request, *args, **kwargs):
+            if (
+                not settings.RESPONSE_CACHE_ENABLED
+                or request.method != "GET"
+                or request.user.is_authenticated
+            ):
+                return handler(self, request, *args, **kwargs)
+
+            cache = get_cache()
+            key = build_cache_key(namespace, request, kwargs)
+            cached = cache.get(key)
+            if cached is not None:
+                _record(namespace, "hit")
+                response = Response(cached, status=status.HTTP_200_OK)
+                response["X-Cache"] = "HIT"
+                return response
+
+            _record(namespace, "miss")
+            response = handler(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+            response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_on_change(model, *namespaces):
+    """Bump ``namespaces`` whenever saves or deletes of ``model`` rows commit"""
+
+    def receiver(sender, **kwargs):
+        for namespace in namespaces:
+            bump_version_on_commit(namespace)
+
+    uid = f"response-cache:{model._meta.label}"
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=uid)
+    for field in model._meta.local_many_to_many:
+        m2m_changed.connect(
+            receiver,
+            sender=field.remote_field.through,
+            weak=False,
+            dispatch_uid=f"{uid}:{field.name}",
+        )
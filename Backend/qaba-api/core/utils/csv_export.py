@@ -0,0 +1,169 @@
+"""
+Streaming CSV exports.
+
+Rows are read as tuples with ``values_list(...).iterator(chunk_size)`` and
+written to the response in blocks as they are produced, so memory use stays
+flat however many rows are selected.
+"""
+import csv
+import io
+from typing import NamedTuple
+
+from django.apps import apps
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+CHUNK_SIZE = 2000
+ROWS_PER_BLOCK = 500
+
+
+class CsvExport(NamedTuple):
+    model: str
+    filename: str
+    columns: tuple[str, ...]
+    date_field: str | None = None
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+
+EXPORTS = {
+    "transactions": CsvExport(
+        model="transactions.Transaction",
+        filename="transactions",
+        columns=(
+            "id",
+            "reference",
+            "tx_ref",
+            "flw_ref",
+            "user__email",
+            "property_obj__property_id",
+            "property_obj__property_name",
+            "payment_method",
+            "amount",
+            "currency",
+            "status",
+            "description",
+            "verified_by__email",
+            "verified_at",
+            "created_at",
+            "updated_at",
+        ),
+        date_field="created_at",
+    ),
+    "properties": CsvExport(
+        model="properties.Property",
+        filename="properties",
+        columns=(
+            "property_id",
+            "property_name",
+            "property_type",
+            "listing_type",
+            "listing_status",
+            "property_status",
+            "state",
+            "city",
+            "location",
+            "bedrooms",
+            "bathrooms",
+            "area_sqft",
+            "sale_price",
+            "rent_price",
+            "rent_frequency",
+            "service_charge",
+            "caution_fee",
+            "legal_fee",
+            "qaba_fee",
+            "agent_commission",
+            "total_price",
+            "listed_by__email",
+            "owner__email",
+            "is_verified",
+            "listed_date",
+        ),
+        date_field="listed_date",
+    ),
+    "users": CsvExport(
+        model="users.User",
+        filename="users",
+        columns=(
+            "id",
+            "email",
+            "first_name",
+            "last_name",
+            "phone_number",
+            "user_type",
+            "is_active",
+            "is_email_verified",
+            "date_joined",
+            "last_login",
+        ),
+        date_field="date_joined",
+    ),
+    "job-applications": CsvExport(
+        model="jobs.JobForm",
+        filename="job_applications",
+        columns=(
+            "id",
+            "job__title",
+            "first_name",
+            "last_name",
+            "email",
+            "phone_number",
+            "year_of_exp",
+            "degree",
+            "linkedin_url",
+            "location",
+            "referral",
+        ),
+    ),
+    "survey-meetings": CsvExport(
+        model="users.PropertySurveyMeeting",
+        filename="survey_meetings",
+        columns=(
+            "id",
+            "user__email",
+            "property_id",
+            "scheduled_date",
+            "scheduled_time",
+            "status",
+            "message",
+            "admin_notes",
+            "created_at",
+        ),
+        date_field="created_at",
+    ),
+}
+
+
+def iter_csv(queryset, columns, chunk_size=CHUNK_SIZE):
+    """Yield the CSV text for ``queryset`` in blocks of ``ROWS_PER_BLOCK`` rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    rows = queryset.values_list(*columns).iterator(chunk_size=chunk_size)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % ROWS_PER_BLOCK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_csv(name, queryset=None, chunk_size=CHUNK_SIZE):
+    """A ``StreamingHttpResponse`` for the export called ``name``"""
+    export = EXPORTS[name]
+    if queryset is None:
+        queryset = export.get_model()._default_manager.all()
+
+    stamp = timezone.now().strftime("%Y%m%d-%H%M%S")
+    response = StreamingHttpResponse(
+        iter_csv(queryset, export.columns, chunk_size), content_type="text/csv"
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{export.filename}-{stamp}.csv"'
+    )
+    return response
+
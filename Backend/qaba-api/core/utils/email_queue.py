@@ -0,0 +1,228 @@
+"""Durable outbound email queue backed by the ``OutboundEmail`` table."""
+import base64
+import logging
+import random
+import uuid
+from collections.abc import Iterable
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.users.models import OutboundEmail
+from core.utils import microsoft_graph_email
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(
+    *,
+    subject: str,
+    to: list[str],
+    html_body: str,
+    text_body: str = "",
+    from_email: str = "",
+    cc: list[str] | None = None,
+    bcc: list[str] | None = None,
+    attachments: Iterable | None = None,
+    idempotency_key: str | None = None,
+) -> OutboundEmail:
+    """
+    Store a rendered email for the worker to deliver.
+
+    When ``idempotency_key`` is given and an email with that key already
+    exists, the existing row is returned and nothing new is queued.
+    """
+    email, created = OutboundEmail.objects.get_or_create(
+        idempotency_key=idempotency_key or uuid.uuid4().hex,
+        defaults={
+            "subject": subject,
+            "to": list(to),
+            "cc": list(cc or []),
+            "bcc": list(bcc or []),
+            "from_email": from_email or "",
+            "html_body": html_body,
+            "text_body": text_body,
+            "attachments": _encode_attachments(attachments),
+            "max_attempts": settings.EMAIL_QUEUE_MAX_ATTEMPTS,
+        },
+    )
+    if not created:
+        logger.info(f"Email with idempotency key {email.idempotency_key} already queued")
+    return email
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """Exponential backoff with up to 10% jitter, capped at the configured max"""
+    seconds = min(
+        settings.EMAIL_QUEUE_BACKOFF_BASE * 2 ** max(attempts - 1, 0),
+        settings.EMAIL_QUEUE_BACKOFF_MAX,
+    )
+    return timedelta(seconds=seconds * (1 + random.uniform(0, 0.1)))
+
+
+def claim_batch(batch_size: int) -> list[OutboundEmail]:
+    """
+    Mark up to ``batch_size`` due emails as SENDING and return them.
+
+    Rows locked by another worker are skipped. A row left in SENDING by a
+    worker that died counts as a failed attempt once its lock times out, so
+    an email that keeps killing its worker backs off and is dead-lettered
+    like any other failure.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        abandoned = OutboundEmail.objects.select_for_update(skip_locked=True).filter(
+            status=OutboundEmail.Status.SENDING,
+            locked_at__lt=now - timedelta(seconds=settings.EMAIL_QUEUE_LOCK_TIMEOUT),
+        )
+        for email in abandoned:
+            record_outcome(email, "Delivery abandoned, the worker lock timed out")
+
+    with transaction.atomic():
+        ids = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        OutboundEmail.objects.filter(id__in=ids).update(
+            status=OutboundEmail.Status.SENDING, locked_at=now
+        )
+
+    return list(OutboundEmail.objects.filter(id__in=ids).order_by("next_attempt_at"))
+
+
+def deliver(email: OutboundEmail) -> str:
+    """Send one claimed email and record the outcome, returning the new status"""
+    try:
+        microsoft_graph_email.send_mail_via_graph(
+            timeout=getattr(settings, "EMAIL_TIMEOUT", 30), **_graph_message(email)
+        )
+    except Exception as e:
+        return record_outcome(email, str(e))
+    return record_outcome(email, None)
+
+
+def deliver_batch(emails: list[OutboundEmail]) -> list[str]:
+    """
+    Send claimed emails through Graph's ``$batch`` endpoint, up to 20 per
+    round-trip, and record each outcome individually
+    """
+    try:
+        errors = microsoft_graph_email.send_batch_via_graph(
+            [_graph_message(email) for email in emails],
+            timeout=getattr(settings, "EMAIL_TIMEOUT", 30),
+        )
+    except Exception as e:
+        errors = [str(e)] * len(emails)
+    return [
+        record_outcome(email, error)
+        for email, error in zip(emails, errors, strict=True)
+    ]
+
+
+def record_outcome(email: OutboundEmail, error: str | None) -> str:
+    """Store the result of one delivery attempt, returning the new status"""
+    email.attempts += 1
+    email.locked_at = None
+    if error:
+        email.last_error = error
+        if email.attempts >= email.max_attempts:
+            email.status = OutboundEmail.Status.DEAD
+            logger.error(
+                f"Email {email.id} dead-lettered after {email.attempts} attempts: {error}"
+            )
+        else:
+            email.status = OutboundEmail.Status.PENDING
+            email.next_attempt_at = timezone.now() + backoff_delay(email.attempts)
+            logger.warning(f"Email {email.id} attempt {email.attempts} failed: {error}")
+    else:
+        email.status = OutboundEmail.Status.SENT
+        email.sent_at = timezone.now()
+        email.last_error = ""
+        # Bodies can carry OTPs and reset links, so they are not kept once
+        # delivered. The row stays until pruned to keep its idempotency key.
+        email.html_body = ""
+        email.text_body = ""
+        email.attachments = []
+        logger.info(f"Email sent to {', '.join(email.to)}: {email.subject}")
+
+    email.save(
+        update_fields=[
+            "attempts",
+            "locked_at",
+            "status",
+            "last_error",
+            "next_attempt_at",
+            "sent_at",
+            "html_body",
+            "text_body",
+            "attachments",
+            "updated_at",
+        ]
+    )
+    return email.status
+
+
+def prune_queue() -> int:
+    """
+    Delete sent and dead-lettered emails older than
+    ``EMAIL_QUEUE_RETENTION_DAYS``, returning how many were removed
+    """
+    cutoff = timezone.now() - timedelta(days=settings.EMAIL_QUEUE_RETENTION_DAYS)
+    deleted, _ = OutboundEmail.objects.filter(
+        status__in=[OutboundEmail.Status.SENT, OutboundEmail.Status.DEAD],
+        updated_at__lt=cutoff,
+    ).delete()
+    return deleted
+
+
+def process_queue(batch_size: int = 50) -> dict[str, int]:
+    """Deliver one batch of due emails and count the outcomes"""
+    outcomes = {"sent": 0, "retried": 0, "dead": 0}
+    labels = {
+        OutboundEmail.Status.SENT: "sent",
+        OutboundEmail.Status.PENDING: "retried",
+        OutboundEmail.Status.DEAD: "dead",
+    }
+    emails = claim_batch(batch_size)
+    if len(emails) == 1:
+        statuses = [deliver(emails[0])]
+    else:
+        statuses = deliver_batch(emails) if emails else []
+    for status in statuses:
+        outcomes[labels[status]] += 1
+    return outcomes
+
+
+def _graph_message(email: OutboundEmail) -> dict:
+    return {
+        "subject": email.subject,
+        "body_html": email.html_body,
+        "body_text": email.text_body,
+        "to": email.to,
+        "from_email": email.from_email or None,
+        "cc": email.cc,
+        "bcc": email.bcc,
+        "attachments": _decode_attachments(email.attachments),
+    }
+
+
+def _encode_attachments(attachments: Iterable | None) -> list[list]:
+    encoded = []
+    for filename, content, mimetype in attachments or []:
+        if content is None:
+            continue
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        encoded.append([filename, base64.b64encode(content).decode("ascii"), mimetype])
+    return encoded
+
+
+def _decode_attachments(attachments: list[list]) -> list[tuple]:
+    return [
+        (filename, base64.b64decode(content), mimetype)
+        for filename, content, mimetype in attachments
+    ]
@@ -1,52 +1,242 @@
+import logging
+import threading
+import time
 import uuid
+from collections import deque
 
 import requests
-from core.settings.base import FLW_SECRET_KEY, PAYMENT_REDIRECT_URL
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+logger = logging.getLogger(__name__)
 
-def initialize_payment(user, amount, currency="NGN", description="", tx_ref=None):
-    """Initialize a payment with Flutterwave"""
+GATEWAY_UNAVAILABLE = "Payment gateway is temporarily unavailable, please try again shortly"
 
-    flw_secret_key = FLW_SECRET_KEY
 
-    if not flw_secret_key:
-        return {"success": False, "error": "Flutterwave secret key not configured"}
+class CircuitBreaker:
+    """
+    Fail fast while the gateway is degraded.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are refused for ``reset_timeout`` seconds. The first call after
+    that is let through as a trial: success closes the circuit, failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(
+                        f"Flutterwave circuit opened after {self.failures} failures"
+                    )
+                self.opened_at = time.monotonic()
+
+
+class LatencyStats:
+    """Call count, error count and latency percentiles for one endpoint"""
+
+    def __init__(self, window: int = 500):
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self.samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float, error: bool):
+        with self._lock:
+            self.calls += 1
+            self.errors += int(error)
+            self.samples.append(elapsed_ms)
+
+    def reject(self):
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            samples = sorted(self.samples)
+            calls, errors, rejected = self.calls, self.errors, self.rejected
+
+        def percentile(fraction):
+            if not samples:
+                return 0
+            index = min(int(round(fraction * (len(samples) - 1))), len(samples) - 1)
+            return round(samples[index], 2)
+
+        return {
+            "calls": calls,
+            "errors": errors,
+            "rejected": rejected,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(samples[-1], 2) if samples else 0,
+        }
+
+
+class FlutterwaveClient:
+    """
+    Flutterwave v3 API client.
+
+    One pooled keep-alive session is shared by all calls, every request has
+    explicit connect/read timeouts, verification (a GET, safe to repeat) is
+    retried on connection errors, 429 and 5xx responses, and a circuit
+    breaker refuses calls while the gateway keeps failing. Payment
+    initialization is never retried because Flutterwave may already have
+    created the payment.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        base_url: str = "https://api.flutterwave.com/v3",
+        connect_timeout: float = 3.05,
+        read_timeout: float = 15,
+        verify_retries: int = 2,
+        retry_backoff: float = 0.5,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        pool_maxsize: int = 10,
+    ):
+        self.secret_key = secret_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.stats: dict[str, LatencyStats] = {}
+        self._stats_lock = threading.Lock()
+        self.session = self._build_session(verify_retries, retry_backoff, pool_maxsize)
+
+    @staticmethod
+    def _build_session(verify_retries, retry_backoff, pool_maxsize):
+        retry = Retry(
+            total=verify_retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=2, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        return session
+
+    def _stats_for(self, endpoint: str) -> LatencyStats:
+        with self._stats_lock:
+            return self.stats.setdefault(endpoint, LatencyStats())
+
+    def _request(self, endpoint: str, method: str, path: str, **kwargs) -> dict:
+        """
+        Perform one call and return the decoded body with ``status_code``.
+
+        Raises ``requests.RequestException`` (or ``ValueError`` for a body
+        that is not JSON); connection failures and 5xx responses count
+        against the circuit breaker, 4xx responses do not.
+        """
+        stats = self._stats_for(endpoint)
+        if not self.breaker.allow():
+            stats.reject()
+            raise requests.ConnectionError(GATEWAY_UNAVAILABLE)
+
+        started = time.perf_counter()
+        failed = True
+        try:
+            response = self.session.request(
+                method,
+                f"{self.base_url}{path}",
+                headers={"Authorization": f"Bearer {self.secret_key}"},
+                timeout=self.timeout,
+                **kwargs,
+            )
+            failed = response.status_code >= 500
+            body = response.json()
+        except (requests.RequestException, ValueError):
+            self.breaker.record_failure()
+            raise
+        finally:
+            stats.record((time.perf_counter() - started) * 1000, failed)
+
+        if failed:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        body["status_code"] = response.status_code
+        return body
 
-    if not tx_ref:
-        tx_ref = f"QABA-{uuid.uuid4().hex[:10]}"
-
-    url = "https://api.flutterwave.com/v3/payments"
-
-    headers = {
-        "Authorization": f"Bearer {flw_secret_key}",
-        "Content-Type": "application/json",
-    }
-
-    redirect_url = PAYMENT_REDIRECT_URL
-
-    payload = {
-        "tx_ref": tx_ref,
-        "amount": str(amount),
-        "currency": currency,
-        "redirect_url": redirect_url,
-        "customer": {
-            "email": user.email,
-            "name": f"{user.first_name} {user.last_name}",
-            "phonenumber": user.phone_number
-            if hasattr(user, "phone_number") and user.phone_number
-            else "",
-        },
-        "customizations": {
-            "title": "QABA Payment",
-            "description": description or "Payment for QABA services",
-        },
-    }
-
-    try:
-        response = requests.post(url, headers=headers, json=payload)
-        response_data = response.json()
-
-        if response.status_code == 200 and response_data.get("status") == "success":
+    def initialize_payment(
+        self, user, amount, currency="NGN", description="", tx_ref=None
+    ) -> dict:
+        """Initialize a payment with Flutterwave"""
+        if not tx_ref:
+            tx_ref = f"QABA-{uuid.uuid4().hex[:10]}"
+
+        payload = {
+            "tx_ref": tx_ref,
+            "amount": str(amount),
+            "currency": currency,
+            "redirect_url": settings.PAYMENT_REDIRECT_URL,
+            "customer": {
+                "email": user.email,
+                "name": f"{user.first_name} {user.last_name}",
+                "phonenumber": user.phone_number
+                if hasattr(user, "phone_number") and user.phone_number
+                else "",
+            },
+            "customizations": {
+                "title": "QABA Payment",
+                "description": description or "Payment for QABA services",
+            },
+        }
+
+        try:
+            response_data = self._request("payments", "POST", "/payments", json=payload)
+        except Exception as e:
+            logger.error(f"Flutterwave payment initialization failed: {e}")
+            return {"success": False, "error": str(e)}
+
+        if response_data["status_code"] == 200 and response_data.get("status") == "success":
             return {
                 "success": True,
                 "payment_link": response_data.get("data", {}).get("link"),
@@ -59,30 +249,20 @@ def initialize_payment(user, amount, currency="NGN", description="", tx_ref=None
             "error": response_data.get("message", "Failed to initialize payment"),
         }
 
-    except Exception as e:
-        return {"success": False, "error": str(e)}
-
-
-def verify_payment(tx_ref):
-    """Verify a payment with Flutterwave"""
+    def verify_payment(self, tx_ref) -> dict:
+        """Verify a payment with Flutterwave"""
+        try:
+            response_data = self._request(
+                "verify",
+                "GET",
+                "/transactions/verify_by_reference",
+                params={"tx_ref": tx_ref},
+            )
+        except Exception as e:
+            logger.error(f"Flutterwave verification of {tx_ref} failed: {e}")
+            return {"success": False, "error": str(e)}
 
-    flw_secret_key = FLW_SECRET_KEY
-
-    if not flw_secret_key:
-        return {"success": False, "error": "Flutterwave secret key not configured"}
-
-    url = f"https://api.flutterwave.com/v3/transactions/verify_by_reference?tx_ref={tx_ref}"
-
-    headers = {
-        "Authorization": f"Bearer {flw_secret_key}",
-        "Content-Type": "application/json",
-    }
-
-    try:
-        response = requests.get(url, headers=headers)
-        response_data = response.json()
-
-        if response.status_code == 200 and response_data.get("status") == "success":
+        if response_data["status_code"] == 200 and response_data.get("status") == "success":
             return {
                 "success": True,
                 "data": response_data.get("data", {}),
@@ -94,5 +274,49 @@ def verify_payment(tx_ref):
             "error": response_data.get("message", "Failed to verify payment"),
         }
 
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    def metrics(self) -> dict:
+        """Circuit state and per-endpoint latency, for staff monitoring"""
+        with self._stats_lock:
+            endpoints = dict(self.stats)
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "endpoints": {name: stats.snapshot() for name, stats in endpoints.items()},
+        }
+
+
+_client: FlutterwaveClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> FlutterwaveClient:
+    """The process-wide client, built from settings on first use"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = FlutterwaveClient(
+                secret_key=settings.FLW_SECRET_KEY,
+                base_url=settings.FLW_API_ROOT,
+                connect_timeout=settings.FLW_CONNECT_TIMEOUT,
+                read_timeout=settings.FLW_READ_TIMEOUT,
+                verify_retries=settings.FLW_VERIFY_RETRIES,
+                failure_threshold=settings.FLW_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.FLW_CIRCUIT_RESET_TIMEOUT,
+            )
+        return _client
+
+
+def initialize_payment(user, amount, currency="NGN", description="", tx_ref=None):
+    """Initialize a payment with Flutterwave"""
+    if not settings.FLW_SECRET_KEY:
+        return {"success": False, "error": "Flutterwave secret key not configured"}
+    return get_client().initialize_payment(
+        user, amount, currency=currency, description=description, tx_ref=tx_ref
+    )
+
+
+def verify_payment(tx_ref):
+    """Verify a payment with Flutterwave"""
+    if not settings.FLW_SECRET_KEY:
+        return {"success": False, "error": "Flutterwave secret key not configured"}
+    return get_client().verify_payment(tx_ref)
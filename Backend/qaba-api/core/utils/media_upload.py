@@ -0,0 +1,208 @@
+"""
+Cloudinary uploads for model media fields.
+
+``CloudinaryField`` uploads a pending file synchronously inside ``save()``,
+so saving several media rows in a row costs the sum of their upload times.
+``upload_pending_files`` pushes every pending file of a batch of instances
+to Cloudinary on a bounded thread pool and swaps in the resulting resources,
+so the batch takes as long as its slowest asset and the later ``save()``
+calls are plain INSERTs. If the batch or those INSERTs fail, the assets
+already uploaded are removed again with ``destroy_resources``.
+
+``signed_upload_params`` lets clients skip the app servers entirely: it signs
+the same upload options for a server-chosen public ID so the browser can post
+the file straight to Cloudinary. ``checked_resource`` then re-reads what was
+actually stored before the asset is attached.
+"""
+import logging
+import time
+import uuid
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+import cloudinary
+import cloudinary.api
+import cloudinary.utils
+from cloudinary import uploader
+from cloudinary.exceptions import NotFound
+from cloudinary.models import CloudinaryField
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+
+logger = logging.getLogger(__name__)
+
+
+def upload_options(field: CloudinaryField, instance) -> dict:
+    """The options ``CloudinaryField.pre_save`` would upload with"""
+    options = {"type": field.type, "resource_type": field.resource_type}
+    options.update(
+        {
+            key: value(instance) if callable(value) else value
+            for key, value in field.options.items()
+        }
+    )
+    return options
+
+
+def upload_file(file: UploadedFile, **options) -> cloudinary.CloudinaryResource:
+    """Upload ``file`` from its start, in chunks when it is large"""
+    if hasattr(file, "seekable") and file.seekable():
+        file.seek(0)
+    return uploader.upload_resource(file, **options)
+
+
+def destroy_resources(resources: Iterable[cloudinary.CloudinaryResource]):
+    """Delete uploaded assets that will not be stored, logging failures"""
+    for resource in resources:
+        try:
+            uploader.destroy(
+                resource.public_id,
+                resource_type=resource.resource_type,
+                type=resource.type,
+            )
+        except Exception as e:
+            logger.error(f"Failed to delete orphaned upload {resource.public_id}: {e}")
+
+
+def pending_uploads(instances: Iterable) -> list[tuple]:
+    """``(instance, field, file)`` for every CloudinaryField holding a new file"""
+    pending = []
+    for instance in instances:
+        for field in instance._meta.concrete_fields:
+            if isinstance(field, CloudinaryField):
+                value = getattr(instance, field.attname)
+                if isinstance(value, UploadedFile):
+                    pending.append((instance, field, value))
+    return pending
+
+
+def upload_pending_files(
+    instances: Iterable, max_workers: int = None
+) -> list[cloudinary.CloudinaryResource]:
+    """
+    Upload the pending files of ``instances`` concurrently and replace them
+    with their Cloudinary resources. Returns the uploaded resources, for
+    ``destroy_resources`` if saving the instances fails.
+
+    The first failed upload is re-raised once the others have finished and
+    the uploads that succeeded have been deleted again; nothing is saved to
+    the database here.
+    """
+    pending = pending_uploads(instances)
+    if not pending:
+        return []
+
+    workers = min(max_workers or settings.MEDIA_UPLOAD_WORKERS, len(pending))
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(upload_file, file, **upload_options(field, instance))
+            for instance, field, file in pending
+        ]
+
+    errors = [future.exception() for future in futures if future.exception()]
+    if errors:
+        destroy_resources(
+            future.result() for future in futures if not future.exception()
+        )
+        raise errors[0]
+
+    resources = []
+    for (instance, field, _), future in zip(pending, futures, strict=True):
+        setattr(instance, field.attname, future.result())
+        resources.append(future.result())
+
+    logger.info(
+        f"Uploaded {len(pending)} files with {workers} workers in "
+        f"{time.perf_counter() - started:.2f}s"
+    )
+    return resources
+
+
+def signed_upload_params(model, field_name: str, **extra_options) -> dict:
+    """
+    Signed parameters for uploading one file for ``model.field_name``
+    directly to Cloudinary, with the field's folder, transformation and
+    format, any ``extra_options`` (such as ``allowed_formats``) and a fresh
+    public ID inside the folder.
+    """
+    field = model._meta.get_field(field_name)
+    options = upload_options(field, model())
+    options.update(extra_options)
+    resource_type = options.pop("resource_type")
+    folder = options.pop("folder", None)
+    public_id = f"{folder}/{uuid.uuid4().hex}" if folder else uuid.uuid4().hex
+
+    params = cloudinary.utils.sign_request(
+        cloudinary.utils.build_upload_params(public_id=public_id, **options), {}
+    )
+    cloud_name = cloudinary.config().cloud_name
+    return {
+        "upload_url": f"https://api.cloudinary.com/v1_1/{cloud_name}/{resource_type}/upload",
+        "public_id": public_id,
+        "resource_type": resource_type,
+        "fields": params,
+    }
+
+
+def verified_resource(
+    public_id: str, version, signature: str, resource_type: str, format: str = None
+) -> cloudinary.CloudinaryResource:
+    """
+    The resource a client uploaded directly, after checking the signature
+    Cloudinary returned with the upload response. Raises ``ValueError`` for
+    a forged or mismatched upload.
+    """
+    if not cloudinary.utils.verify_api_response_signature(
+        public_id, str(version), signature
+    ):
+        raise ValueError("Upload signature does not match")
+    return cloudinary.CloudinaryResource(
+        public_id,
+        version=str(version),
+        format=format,
+        type="upload",
+        resource_type=resource_type,
+    )
+
+
+def checked_resource(
+    resource: cloudinary.CloudinaryResource, allowed_formats, max_file_size: int
+) -> cloudinary.CloudinaryResource:
+    """
+    ``resource`` with the format Cloudinary stored, after checking that
+    format and the stored size against the limits of its kind. The upload
+    API has no size limit of its own, so this is where it is enforced. A
+    resource that breaks the limits is deleted and ``ValueError`` raised.
+
+    Raw files report no format; the signed ``allowed_formats`` already
+    checked their extension at upload time.
+    """
+    try:
+        info = cloudinary.api.resource(
+            resource.public_id, resource_type=resource.resource_type, type=resource.type
+        )
+    except NotFound:
+        raise ValueError("Uploaded file was not found")
+
+    format = (info.get("format") or "").lower() or None
+    if format and format not in allowed_formats:
+        problem = (
+            f"Unsupported file type: {format}. "
+            f"Allowed types: {', '.join(allowed_formats)}"
+        )
+    elif info.get("bytes", 0) > max_file_size:
+        problem = f"File exceeds the maximum size of {max_file_size // (1024 * 1024)}MB"
+    else:
+        return cloudinary.CloudinaryResource(
+            resource.public_id,
+            version=resource.version,
+            format=format or resource.format,
+            type=resource.type,
+            resource_type=resource.resource_type,
+        )
+
+    uploader.destroy(
+        resource.public_id, resource_type=resource.resource_type, type=resource.type
+    )
+    raise ValueError(problem)
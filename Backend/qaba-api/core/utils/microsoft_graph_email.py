@@ -1,16 +1,23 @@
 """Utilities for sending email via Microsoft Graph."""
 import base64
 import logging
-from typing import Iterable, List, Optional
+from collections.abc import Iterable
 
 import msal
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 _GRAPH_API_ROOT = "https://graph.microsoft.com/v1.0"
-_APPLICATION: Optional[msal.ConfidentialClientApplication] = None
+_APPLICATION: msal.ConfidentialClientApplication | None = None
+_SESSION: requests.Session | None = None
+_POOL_MAXSIZE = 10
+
+# Graph rejects JSON batches with more than 20 requests
+MAX_BATCH_SIZE = 20
 
 
 def _is_config_ready() -> bool:
@@ -62,7 +69,7 @@ def _acquire_token(scope: str) -> str:
     return token_result["access_token"]
 
 
-def _convert_recipients(addresses: Iterable[str]) -> List[dict]:
+def _convert_recipients(addresses: Iterable[str]) -> list[dict]:
     """Convert email addresses to Graph API recipient objects."""
     valid = [addr for addr in addresses or [] if addr]
     return [
@@ -75,9 +82,9 @@ def _convert_recipients(addresses: Iterable[str]) -> List[dict]:
     ]
 
 
-def _convert_attachments(attachments: Iterable) -> List[dict]:
+def _convert_attachments(attachments: Iterable) -> list[dict]:
     """Convert in-memory attachments to Graph file attachments."""
-    converted: List[dict] = []
+    converted: list[dict] = []
     for attachment in attachments or []:
         try:
             filename, content, mimetype = attachment
@@ -102,29 +109,52 @@ def _convert_attachments(attachments: Iterable) -> List[dict]:
     return converted
 
 
-def send_mail_via_graph(
+def _get_session() -> requests.Session:
+    """
+    Return the shared keep-alive session used for every Graph call.
+
+    Connections are pooled so consecutive sends reuse one TLS connection.
+    Throttling (429) and unavailability (503) responses are retried with
+    backoff, honouring Retry-After; other failures are left to the caller
+    because sendMail is not idempotent.
+    """
+    global _SESSION
+    if _SESSION is None:
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            status=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 503),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=_POOL_MAXSIZE, max_retries=retry
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _SESSION = session
+    return _SESSION
+
+
+def _api_root() -> str:
+    return getattr(settings, "MICROSOFT_GRAPH_API_ROOT", _GRAPH_API_ROOT).rstrip("/")
+
+
+def _build_message(
     *,
     subject: str,
     body_html: str,
     body_text: str,
     to: Iterable[str],
-    from_email: Optional[str] = None,
-    cc: Optional[Iterable[str]] = None,
-    bcc: Optional[Iterable[str]] = None,
-    attachments: Optional[Iterable] = None,
-    save_to_sent_items: bool = False,
-    timeout: Optional[int] = None,
-) -> None:
-    """Send an email using Microsoft Graph."""
-    if not _is_config_ready():
-        raise RuntimeError("Microsoft Graph email configuration is incomplete.")
-
-    access_token = _acquire_token(settings.MICROSOFT_GRAPH_SCOPE)
-
-    sender = (from_email or settings.MICROSOFT_SENDER_EMAIL).strip()
-    if not sender:
-        raise RuntimeError("A sender email address is required for Microsoft Graph.")
-
+    cc: Iterable[str] | None = None,
+    bcc: Iterable[str] | None = None,
+    attachments: Iterable | None = None,
+) -> dict:
+    """Build the Graph message resource for one email."""
     message = {
         "subject": subject,
         "body": {
@@ -150,6 +180,53 @@ def send_mail_via_graph(
     if attachments_payload:
         message["attachments"] = attachments_payload
 
+    return message
+
+
+def _sender(from_email: str | None) -> str:
+    sender = (from_email or settings.MICROSOFT_SENDER_EMAIL).strip()
+    if not sender:
+        raise RuntimeError("A sender email address is required for Microsoft Graph.")
+    return sender
+
+
+def _error_detail(response: requests.Response):
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+def send_mail_via_graph(
+    *,
+    subject: str,
+    body_html: str,
+    body_text: str,
+    to: Iterable[str],
+    from_email: str | None = None,
+    cc: Iterable[str] | None = None,
+    bcc: Iterable[str] | None = None,
+    attachments: Iterable | None = None,
+    save_to_sent_items: bool = False,
+    timeout: int | None = None,
+) -> None:
+    """Send an email using Microsoft Graph."""
+    if not _is_config_ready():
+        raise RuntimeError("Microsoft Graph email configuration is incomplete.")
+
+    access_token = _acquire_token(settings.MICROSOFT_GRAPH_SCOPE)
+    sender = _sender(from_email)
+
+    message = _build_message(
+        subject=subject,
+        body_html=body_html,
+        body_text=body_text,
+        to=to,
+        cc=cc,
+        bcc=bcc,
+        attachments=attachments,
+    )
+
     request_payload = {
         "message": message,
         "saveToSentItems": save_to_sent_items,
@@ -161,9 +238,9 @@ def send_mail_via_graph(
     }
 
     timeout_value = timeout or getattr(settings, "EMAIL_TIMEOUT", 30)
-    endpoint = f"{_GRAPH_API_ROOT}/users/{sender}/sendMail"
+    endpoint = f"{_api_root()}/users/{sender}/sendMail"
 
-    response = requests.post(
+    response = _get_session().post(
         endpoint,
         json=request_payload,
         headers=headers,
@@ -179,12 +256,102 @@ def send_mail_via_graph(
         )
         return
 
-    try:
-        detail = response.json()
-    except ValueError:
-        detail = response.text
-
     raise RuntimeError(
         "Microsoft Graph sendMail failed with status "
-        f"{response.status_code}: {detail}"
+        f"{response.status_code}: {_error_detail(response)}"
     )
+
+
+def send_batch_via_graph(
+    messages: list[dict],
+    *,
+    save_to_sent_items: bool = False,
+    timeout: int | None = None,
+) -> list[str | None]:
+    """
+    Send several emails through Graph's JSON ``$batch`` endpoint, up to
+    ``MAX_BATCH_SIZE`` per round-trip.
+
+    Each message is a dict of ``send_mail_via_graph`` keyword arguments.
+    Returns one entry per message in input order: ``None`` when Graph
+    accepted it, otherwise an error description. A message that cannot be
+    built or a batch request that fails outright is reported per message
+    rather than raised, so callers can retry just the failures.
+    """
+    if not _is_config_ready():
+        raise RuntimeError("Microsoft Graph email configuration is incomplete.")
+
+    access_token = _acquire_token(settings.MICROSOFT_GRAPH_SCOPE)
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Content-Type": "application/json",
+    }
+    timeout_value = timeout or getattr(settings, "EMAIL_TIMEOUT", 30)
+    endpoint = f"{_api_root()}/$batch"
+
+    results: list[str | None] = [None] * len(messages)
+    for offset in range(0, len(messages), MAX_BATCH_SIZE):
+        chunk = messages[offset : offset + MAX_BATCH_SIZE]
+        requests_payload = []
+        for index, message in enumerate(chunk, start=offset):
+            message = dict(message)
+            sender = message.pop("from_email", None)
+            try:
+                body = {
+                    "message": _build_message(**message),
+                    "saveToSentItems": save_to_sent_items,
+                }
+                url = f"/users/{_sender(sender)}/sendMail"
+            except (RuntimeError, ValueError) as exc:
+                results[index] = str(exc)
+                continue
+            requests_payload.append(
+                {
+                    "id": str(index),
+                    "method": "POST",
+                    "url": url,
+                    "headers": {"Content-Type": "application/json"},
+                    "body": body,
+                }
+            )
+
+        if not requests_payload:
+            continue
+
+        try:
+            response = _get_session().post(
+                endpoint,
+                json={"requests": requests_payload},
+                headers=headers,
+                timeout=timeout_value,
+            )
+        except requests.RequestException as exc:
+            for request in requests_payload:
+                results[int(request["id"])] = f"Microsoft Graph $batch failed: {exc}"
+            continue
+
+        if not 200 <= response.status_code < 300:
+            error = (
+                "Microsoft Graph $batch failed with status "
+                f"{response.status_code}: {_error_detail(response)}"
+            )
+            for request in requests_payload:
+                results[int(request["id"])] = error
+            continue
+
+        answered = set()
+        for item in response.json().get("responses", []):
+            index = int(item["id"])
+            answered.add(index)
+            status = item.get("status", 0)
+            if not 200 <= status < 300:
+                results[index] = (
+                    f"Microsoft Graph sendMail failed with status {status}: "
+                    f"{item.get('body')}"
+                )
+        for request in requests_payload:
+            index = int(request["id"])
+            if index not in answered:
+                results[index] = "Microsoft Graph $batch returned no response"
+
+    return results
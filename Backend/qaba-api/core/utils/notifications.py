@@ -0,0 +1,79 @@
+"""In-app notification fan-out and the cached admin recipient list."""
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from django.core.cache import cache
+
+from apps.users.models import Notification, User
+
+ADMIN_RECIPIENTS_CACHE_KEY = "notifications:admin-recipients"
+ADMIN_RECIPIENTS_TIMEOUT = 60 * 60
+
+# User fields that can move a user into or out of the admin list, or change
+# its entry
+ADMIN_RECIPIENT_FIELDS = {"user_type", "is_staff", "is_superuser", "is_active", "email"}
+
+
+class Recipient(NamedTuple):
+    id: int
+    email: str
+
+
+def get_admin_recipients() -> list[Recipient]:
+    """Admin users as ``(id, email)`` pairs, cached until a user changes"""
+    recipients = cache.get(ADMIN_RECIPIENTS_CACHE_KEY)
+    if recipients is None:
+        recipients = [
+            Recipient(*row)
+            for row in User.objects.filter(user_type=User.UserType.ADMIN)
+            .order_by("id")
+            .values_list("id", "email")
+        ]
+        cache.set(ADMIN_RECIPIENTS_CACHE_KEY, recipients, ADMIN_RECIPIENTS_TIMEOUT)
+    return recipients
+
+
+def get_admin_emails() -> list[str]:
+    return [recipient.email for recipient in get_admin_recipients() if recipient.email]
+
+
+def invalidate_admin_recipients(update_fields=None, **kwargs):
+    """
+    Signal receiver: drop the cached admin list when a user changes, except
+    for partial saves that leave the admin fields alone (``last_login`` on
+    every login, for instance)
+    """
+    if update_fields is not None and not ADMIN_RECIPIENT_FIELDS & set(update_fields):
+        return
+    cache.delete(ADMIN_RECIPIENTS_CACHE_KEY)
+
+
+def notify(recipients: Iterable, **fields) -> list[Notification]:
+    """
+    Create the same notification for every recipient with one INSERT.
+
+    ``recipients`` may hold users, ``Recipient`` pairs or user ids; ``fields``
+    are Notification fields such as ``title``, ``message`` and ``metadata``.
+    """
+    return bulk_notify(
+        Notification(user_id=_user_id(recipient), **fields)
+        for recipient in recipients
+    )
+
+
+def notify_admins(**fields) -> list[Notification]:
+    return notify(get_admin_recipients(), **fields)
+
+
+def bulk_notify(notifications: Iterable[Notification]) -> list[Notification]:
+    """Insert notifications that differ per recipient with one INSERT"""
+    notifications = list(notifications)
+    if not notifications:
+        return []
+    return Notification.objects.bulk_create(notifications)
+
+
+def _user_id(recipient):
+    if isinstance(recipient, Recipient):
+        return recipient.id
+    return getattr(recipient, "pk", recipient)
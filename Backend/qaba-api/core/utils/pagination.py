@@ -0,0 +1,134 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .response import APIResponse
+
+
+def paginated_envelope_schema(schema):
+    return {
+        "type": "object",
+        "properties": {
+            "success": {"type": "boolean"},
+            "message": {"type": "string"},
+            "data": schema,
+            "errors": {"type": "object", "nullable": True},
+            "pagination": {"type": "object"},
+        },
+    }
+
+
+class StandardResultsPagination(PageNumberPagination):
+    """
+    Page number pagination that keeps the APIResponse envelope, with the
+    results under ``data`` and the page details under ``pagination``
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_paginated_response(self, data):
+        return APIResponse.paginated(
+            data=data,
+            pagination={
+                "mode": "page",
+                "count": self.page.paginator.count,
+                "page": self.page.number,
+                "page_size": self.get_page_size(self.request),
+                "total_pages": self.page.paginator.num_pages,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+            },
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return paginated_envelope_schema(schema)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination on ``(-listed_date, id)``.
+
+    Each page filters on the last row of the previous one instead of using
+    OFFSET, so deep pages cost the same as the first one.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = StandardResultsPagination.page_size
+    max_page_size = StandardResultsPagination.max_page_size
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by("-listed_date", "id")
+        position = self.decode_cursor(request)
+        if position is not None:
+            listed_date, pk = position
+            queryset = queryset.filter(
+                Q(listed_date__lt=listed_date) | Q(listed_date=listed_date, id__gt=pk)
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            decoded = base64.urlsafe_b64decode(encoded.encode("ascii")).decode("ascii")
+            listed_date, pk = decoded.rsplit("|", 1)
+            return datetime.fromisoformat(listed_date), int(pk)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance):
+        raw = f"{instance.listed_date.isoformat()}|{instance.pk}"
+        return base64.urlsafe_b64encode(raw.encode("ascii")).decode("ascii")
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.page[-1])
+        )
+
+    def get_first_link(self):
+        url = self.request.build_absolute_uri()
+        return remove_query_param(url, self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return APIResponse.paginated(
+            data=data,
+            pagination={
+                "mode": "cursor",
+                "page_size": self.page_size,
+                "next": self.get_next_link(),
+                "first": self.get_first_link(),
+            },
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return paginated_envelope_schema(schema)
@@ -11,6 +11,19 @@ class APIResponse:
             status=status_code,
         )
 
+    @staticmethod
+    def paginated(data=None, pagination=None, message="Success"):
+        return Response(
+            {
+                "success": True,
+                "message": message,
+                "data": data,
+                "errors": None,
+                "pagination": pagination,
+            },
+            status=status.HTTP_200_OK,
+        )
+
     @staticmethod
     def error(message="Error", errors=None, status_code=status.HTTP_400_BAD_REQUEST):
         raise APIError(message=message, status_code=status_code)
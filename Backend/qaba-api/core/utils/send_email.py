@@ -23,9 +23,14 @@ def send_email(
     attachments: List = None,
     cc: List[str] = None,
     bcc: List[str] = None,
+    idempotency_key: str = None,
 ) -> Dict:
     """
     Send an email using a template.
+
+    With ``EMAIL_QUEUE_ENABLED`` the rendered email is stored in the outbound
+    queue and delivered by the ``process_email_queue`` worker; passing an
+    ``idempotency_key`` makes repeated calls queue it only once.
     """
     if context is None:
         context = {}
@@ -49,6 +54,27 @@ def send_email(
         from_email = settings.DEFAULT_FROM_EMAIL
 
     try:
+        # Render HTML content
+        html_content = render_to_string(f"email/{template_name}.html", context)
+        text_content = strip_tags(html_content)
+
+        if settings.EMAIL_QUEUE_ENABLED:
+            from core.utils.email_queue import enqueue_email
+
+            email = enqueue_email(
+                subject=subject,
+                to=recipients,
+                html_body=html_content,
+                text_body=text_content,
+                from_email=from_email,
+                cc=cc,
+                bcc=bcc,
+                attachments=attachments,
+                idempotency_key=idempotency_key,
+            )
+            logger.info(f"Email queued for {', '.join(recipients)}: {subject}")
+            return {"success": True, "queued": True, "email_id": email.id}
+
         if not microsoft_graph_email.is_configured():
             raise RuntimeError(
                 "Microsoft Graph email configuration is incomplete. "
@@ -56,10 +82,6 @@ def send_email(
                 "and MICROSOFT_SENDER_EMAIL are set."
             )
 
-        # Render HTML content
-        html_content = render_to_string(f"email/{template_name}.html", context)
-        text_content = strip_tags(html_content)
-
         microsoft_graph_email.send_mail_via_graph(
             subject=subject,
             body_html=html_content,
@@ -131,6 +153,7 @@ def send_welcome_email(user):
         recipients=user.email,
         template_name="welcome",
         context=context,
+        idempotency_key=f"welcome:{user.pk}",
     )
 
 
@@ -269,17 +292,14 @@ def send_survey_meeting_notification(meeting, recipient_type="client"):
         template_name = "survey_meeting_client"
     else:
         subject = f"New Property Survey Meeting Request - {meeting.property_address}"
-        from apps.users.models import User
+        from core.utils.notifications import get_admin_emails
 
-        admin_users = User.objects.filter(
-            user_type__in=[User.UserType.ADMIN]
-        )
-        recipients = [user.email for user in admin_users if user.email]
+        recipients = get_admin_emails()
 
         if meeting.agent_assigned and meeting.agent_assigned.email:
             recipients.append(meeting.agent_assigned.email)
 
-        recipients = recipients.append(settings.DEFAULT_FROM_EMAIL)
+        recipients.append(settings.DEFAULT_FROM_EMAIL)
         template_name = "survey_meeting_admin"
 
     scheduled_datetime = timezone.datetime.combine(
@@ -304,6 +324,7 @@ def send_survey_meeting_notification(meeting, recipient_type="client"):
         recipients=recipients,
         template_name=template_name,
         context=context,
+        idempotency_key=f"survey-meeting:{meeting.pk}:{recipient_type}",
     )
 
 
@@ -351,7 +372,7 @@ def send_offline_payment_notification(transaction):
     """
     Send email notification to user and all admins when an offline payment is made.
     """
-    from apps.users.models import User
+    from core.utils.notifications import get_admin_emails
 
     property_obj = transaction.property_obj
     user = transaction.user
@@ -372,11 +393,11 @@ def send_offline_payment_notification(transaction):
         recipients=user.email,
         template_name="offline_payment_notification",
         context=user_context,
+        idempotency_key=f"offline-payment:{transaction.pk}:user",
     )
 
     # Email to admins
-    admin_users = User.objects.filter(user_type=User.UserType.ADMIN)
-    admin_emails = [admin.email for admin in admin_users if admin.email]
+    admin_emails = get_admin_emails()
     if admin_emails:
         admin_context = {
             "user": user,
@@ -393,4 +414,5 @@ def send_offline_payment_notification(transaction):
             recipients=admin_emails,
             template_name="offline_payment_notification",
             context=admin_context,
+            idempotency_key=f"offline-payment:{transaction.pk}:admins",
         )
@@ -0,0 +1,75 @@
+"""
+Unique slugs and identifiers without a query per candidate.
+
+``unique_slug`` reads every slug already taken under a base in one prefix
+query (a range scan on the slug's index) and picks the next ``-N`` suffix.
+A concurrent writer can still take the same value between that read and
+the INSERT, so ``save_unique`` runs the save in a savepoint and, when the
+unique constraint fires on a generated field, regenerates it and tries
+again.
+"""
+import re
+from collections.abc import Callable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+SAVE_ATTEMPTS = 5
+
+# Room left after a base slug for "-" and a counter
+SUFFIX_LENGTH = 11
+
+
+def unique_slug(queryset, base_slug: str, field: str = "slug", max_length=None) -> str:
+    """
+    ``base_slug`` if it is free in ``queryset``, otherwise ``base_slug-N``
+    with ``N`` one past the highest suffix in use.
+    """
+    if max_length:
+        base_slug = base_slug[: max_length - SUFFIX_LENGTH].rstrip("-")
+
+    taken = queryset.filter(
+        Q(**{field: base_slug}) | Q(**{f"{field}__startswith": f"{base_slug}-"})
+    ).values_list(field, flat=True)
+
+    suffix = re.compile(rf"^{re.escape(base_slug)}-(\d+)$")
+    base_taken = False
+    highest = 0
+    for slug in taken:
+        if slug == base_slug:
+            base_taken = True
+        elif match := suffix.match(slug):
+            highest = max(highest, int(match.group(1)))
+
+    if not base_taken:
+        return base_slug
+    return f"{base_slug}-{highest + 1}"
+
+
+def save_unique(instance, save: Callable, generators: dict[str, Callable]):
+    """
+    Run ``save()`` in a savepoint. If it breaks a unique constraint on one
+    of the ``generators`` fields because another writer just took the value,
+    set a fresh value from the generator and retry, up to ``SAVE_ATTEMPTS``.
+    Any other integrity error is re-raised.
+    """
+    if not generators:
+        return save()
+
+    manager = type(instance)._default_manager
+    for attempt in range(1, SAVE_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            collided = [
+                field
+                for field in generators
+                if manager.exclude(pk=instance.pk)
+                .filter(**{field: getattr(instance, field)})
+                .exists()
+            ]
+            if not collided or attempt == SAVE_ATTEMPTS:
+                raise
+            for field in collided:
+                setattr(instance, field, generators[field]())
@@ -1,6 +1,67 @@
 from django.http import JsonResponse
+from django.utils.dateparse import parse_date
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+
+from core.utils import flutterwave
+from core.utils.cache import response_cache_stats
+from core.utils.csv_export import EXPORTS, stream_csv
+from core.utils.response import APIResponse
 
 
 def health_check(request):
     """Return a simple response for external health probes."""
     return JsonResponse({"status": "ok"})
+
+
+@extend_schema(tags=["Monitoring"])
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def cache_stats(request):
+    """Response cache hit/miss counters per namespace, for staff monitoring."""
+    return APIResponse.success(
+        data=response_cache_stats(), message="Cache statistics retrieved successfully"
+    )
+
+
+@extend_schema(tags=["Monitoring"])
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def payment_gateway_stats(request):
+    """Flutterwave circuit state and per-endpoint latency, for staff monitoring."""
+    return APIResponse.success(
+        data=flutterwave.get_client().metrics(),
+        message="Payment gateway statistics retrieved successfully",
+    )
+
+
+@extend_schema(tags=["Exports"])
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def export_csv(request, name):
+    """
+    Stream a CSV export (transactions, properties, users, job-applications,
+    survey-meetings). ``from`` and ``to`` (YYYY-MM-DD) limit dated exports.
+    """
+    export = EXPORTS.get(name)
+    if export is None:
+        return APIResponse.not_found(message=f"Unknown export '{name}'")
+
+    queryset = export.get_model()._default_manager.all()
+    for param, lookup in (("from", "gte"), ("to", "lte")):
+        value = request.query_params.get(param)
+        if not value:
+            continue
+        try:
+            day = parse_date(value)
+        except ValueError:
+            # Well formed but impossible, like 2024-02-30
+            day = None
+        if day is None or export.date_field is None:
+            return APIResponse.bad_request(
+                message=f"Invalid '{param}' filter for the {name} export"
+            )
+        queryset = queryset.filter(**{f"{export.date_field}__date__{lookup}": day})
+
+    return stream_csv(name, queryset)